@@ -0,0 +1,131 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+from artalekey.core.logger import performance_logger
+from artalekey.core.timing import AdaptivePollingPolicy
+from artalekey.core.window_detector import WindowDetector, WindowInfo
+
+class AsyncWindowDetector:
+    """WindowDetector 的 asyncio 封装 - 阻塞调用在有界线程池中执行，不阻塞事件循环
+
+    同一操作同时只有一个调用在执行，并发的相同请求等待同一个结果；
+    超过超时时间的调用返回与同步接口失败时相同的值（None / 空列表），
+    仍在执行的调用完成前后续请求继续合并到它上面，线程池不会被卡住的调用占满。
+    """
+
+    def __init__(self, detector: Optional[WindowDetector] = None, max_workers: int = 2,
+                 timeout: float = 1.0):
+        self._detector = detector or WindowDetector()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                            thread_name_prefix="AsyncWindowDetector")
+        self._timeout = timeout
+        self._inflight: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self._closed = False
+
+        # 统计信息
+        self._calls = 0
+        self._coalesced = 0
+        self._timeouts = 0
+
+    @property
+    def detector(self) -> WindowDetector:
+        return self._detector
+
+    async def _call(self, name: str, func: Callable, default, timeout: Optional[float]):
+        """在线程池中执行阻塞调用，合并同一事件循环中的并发请求"""
+        if self._closed:
+            raise RuntimeError("AsyncWindowDetector is closed")
+        loop = asyncio.get_running_loop()
+        self._calls += 1
+        entry = self._inflight.get(name)
+        if entry is not None and entry[0] is loop and not entry[1].done():
+            future = entry[1]
+            self._coalesced += 1
+        else:
+            future = loop.run_in_executor(self._executor, func)
+            self._inflight[name] = (loop, future)
+            future.add_done_callback(lambda done: self._clear_inflight(name, done))
+
+        timeout = self._timeout if timeout is None else timeout
+        try:
+            # shield: 一个调用方超时或被取消不影响其他等待同一结果的调用方
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            performance_logger.increment(f"async_detector.{name}.timeout")
+            performance_logger.warning(f"Window detector {name} timed out after {timeout:.2f}s")
+            return default
+
+    def _clear_inflight(self, name: str, future: asyncio.Future):
+        entry = self._inflight.get(name)
+        if entry is not None and entry[1] is future:
+            del self._inflight[name]
+        if not future.cancelled():
+            future.exception()  # 取出异常，避免没有等待者时的未处理警告
+
+    async def get_active_window(self, timeout: Optional[float] = None) -> Optional[WindowInfo]:
+        """获取当前活动窗口信息，超时返回None"""
+        return await self._call('get_active_window', self._detector.get_active_window,
+                                None, timeout)
+
+    async def get_running_applications(self, timeout: Optional[float] = None) -> List[str]:
+        """获取当前运行的应用程序列表，超时返回空列表"""
+        result = await self._call('get_running_applications',
+                                  self._detector.get_running_applications, None, timeout)
+        return list(result) if result is not None else []
+
+    async def iter_focus_changes(self, min_interval: float = 0.1, max_interval: float = 2.0,
+                                 timeout: Optional[float] = None) -> AsyncIterator[WindowInfo]:
+        """活动窗口变化时产出新的窗口信息 - 轮询间隔与监控线程一样按活动自适应"""
+        policy = AdaptivePollingPolicy(min_interval=min_interval, max_interval=max_interval)
+        previous: Optional[WindowInfo] = None
+        while not self._closed:
+            window = await self.get_active_window(timeout)
+            changed = window is not None and window is not previous and (
+                previous is None or not previous.same_as(
+                    window.window_id, window.title, window.process_name, window.process_id))
+            policy.record_poll(changed)
+            if changed:
+                previous = window
+                yield window
+            await asyncio.sleep(policy.interval)
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取调用统计"""
+        return {
+            'calls': self._calls,
+            'coalesced': self._coalesced,
+            'timeouts': self._timeouts,
+            'inflight': len(self._inflight),
+        }
+
+    def _shutdown_executor(self) -> bool:
+        """停止接受新调用，不等待仍在执行的调用，返回是否为首次关闭"""
+        if self._closed:
+            return False
+        self._closed = True
+        self._executor.shutdown(wait=False)
+        return True
+
+    def close(self):
+        """同步关闭线程池和检测器 - 检测器关闭时可能等待仍在执行的调用"""
+        if self._shutdown_executor():
+            self._detector.close()
+
+    async def aclose(self, timeout: Optional[float] = None):
+        """异步关闭 - 检测器的关闭在默认线程池中执行，卡住的调用不会阻塞事件循环"""
+        if not self._shutdown_executor():
+            return
+        loop = asyncio.get_running_loop()
+        timeout = self._timeout if timeout is None else timeout
+        try:
+            await asyncio.wait_for(loop.run_in_executor(None, self._detector.close), timeout)
+        except asyncio.TimeoutError:
+            # 关闭会在卡住的调用结束后由后台线程完成
+            performance_logger.warning(f"Window detector close timed out after {timeout:.2f}s")
+
+    async def __aenter__(self) -> 'AsyncWindowDetector':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
@@ -0,0 +1,94 @@
+import threading
+from typing import Any, Callable, Dict, Optional
+
+class KeyEventRing:
+    """单生产者单消费者环形缓冲区 - 槽位预先分配
+
+    生产者（pynput监听线程）只写入槽位并推进写指针，不获取任何匹配锁；
+    队列满时丢弃新事件并计数，不会阻塞系统输入钩子。
+    依赖GIL保证单个索引赋值的原子性，只适用于一个生产者和一个消费者。
+    """
+
+    def __init__(self, capacity: int = 1024):
+        size = 1
+        while size < max(2, capacity):
+            size <<= 1
+        self._capacity = size
+        self._mask = size - 1
+        self._slots = [None] * size
+        self._head = 0  # 消费者读指针
+        self._tail = 0  # 生产者写指针
+        self._wake = threading.Event()
+        self._closed = False
+
+        # 统计信息
+        self.pushed = 0
+        self.consumed = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def depth(self) -> int:
+        """当前队列深度"""
+        return self._tail - self._head
+
+    def push(self, item: Any) -> bool:
+        """写入一个事件，队列已满时丢弃并返回False"""
+        tail = self._tail
+        depth = tail - self._head
+        if depth >= self._capacity:
+            self.dropped += 1
+            return False
+        self._slots[tail & self._mask] = item
+        self._tail = tail + 1
+        self.pushed += 1
+        if depth >= self.max_depth:
+            self.max_depth = depth + 1
+        self._wake.set()
+        return True
+
+    def drain(self, handler: Callable[[Any], None]) -> int:
+        """按顺序处理所有已写入的事件，返回处理数量"""
+        start = head = self._head
+        tail = self._tail
+        slots, mask = self._slots, self._mask
+        while head != tail:
+            index = head & mask
+            item = slots[index]
+            slots[index] = None
+            head += 1
+            self._head = head  # 逐个推进，处理慢时生产者也能及时看到空位
+            handler(item)
+        count = head - start
+        self.consumed += count
+        return count
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """等待新事件 - 先清除唤醒标志再检查队列，避免丢失唤醒"""
+        self._wake.clear()
+        if self._tail != self._head or self._closed:
+            return True
+        return self._wake.wait(timeout)
+
+    def close(self):
+        """关闭队列并唤醒消费者"""
+        self._closed = True
+        self._wake.set()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取队列统计"""
+        return {
+            'capacity': self._capacity,
+            'depth': self.depth(),
+            'max_depth': self.max_depth,
+            'pushed': self.pushed,
+            'consumed': self.consumed,
+            'dropped': self.dropped,
+        }
@@ -0,0 +1,166 @@
+import os
+import selectors
+import subprocess
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+from artalekey.core.logger import performance_logger
+
+class HelperProcess:
+    """常驻辅助进程 - 启动一次，通过管道按行收发请求/响应
+
+    用于需要外部工具的检测后端（如macOS下的osascript），避免每次检测都启动新进程。
+    每个请求写入一行并等待一行响应；超时视为辅助进程卡住，由看门狗结束进程，
+    下次请求时自动重启。restart_window秒内重启超过max_restarts次时暂停重启，
+    冷却期间 available 为False，调用方可以退回一次性调用。
+    """
+
+    def __init__(self, argv: List[str], timeout: float = 1.0, max_restarts: int = 5,
+                 restart_window: float = 60.0, name: str = "helper"):
+        self._argv = list(argv)
+        self._timeout = timeout
+        self._max_restarts = max(1, max_restarts)
+        self._restart_window = restart_window
+        self._name = name
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen] = None
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._buffer = b''
+        self._starts = deque()  # 最近的启动时间，用于限制重启频率
+        self._closed = False
+
+        # 统计信息
+        self._requests = 0
+        self._timeouts = 0
+        self._failures = 0
+        self._restarts = 0
+
+    @property
+    def available(self) -> bool:
+        """辅助进程是否可用（未关闭且不在重启冷却期）"""
+        if self._closed:
+            return False
+        if self._process is not None and self._process.poll() is None:
+            return True
+        return not self._restart_limited(time.monotonic())
+
+    def _restart_limited(self, now: float) -> bool:
+        starts = self._starts
+        while starts and now - starts[0] > self._restart_window:
+            starts.popleft()
+        return len(starts) > self._max_restarts  # 首次启动不计入重启次数
+
+    def _ensure_started(self) -> bool:
+        """辅助进程未运行时启动（调用方持有锁）"""
+        process = self._process
+        if process is not None and process.poll() is None:
+            return True
+        if process is not None:
+            self._kill()
+        now = time.monotonic()
+        if self._restart_limited(now):
+            return False
+        try:
+            process = subprocess.Popen(
+                self._argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL, bufsize=0,
+            )
+        except OSError as e:
+            performance_logger.warning(f"Failed to start {self._name}: {e}")
+            self._starts.append(now)
+            return False
+        if self._starts:
+            self._restarts += 1
+            performance_logger.warning(f"Restarted {self._name} (pid {process.pid})")
+        self._starts.append(now)
+        self._process = process
+        self._buffer = b''
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(process.stdout, selectors.EVENT_READ)
+        return True
+
+    def _kill(self):
+        """结束辅助进程并释放管道（调用方持有锁）"""
+        process, self._process = self._process, None
+        selector, self._selector = self._selector, None
+        if selector is not None:
+            selector.close()
+        if process is None:
+            return
+        try:
+            if process.poll() is None:
+                process.kill()
+            process.wait(0.5)
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+        for stream in (process.stdin, process.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+    def request(self, line: str, timeout: Optional[float] = None) -> Optional[str]:
+        """发送一行请求并返回一行响应（不含换行），失败或超时返回None"""
+        timeout = self._timeout if timeout is None else timeout
+        with self._lock:
+            if self._closed or not self._ensure_started():
+                return None
+            self._requests += 1
+            process = self._process
+            try:
+                process.stdin.write(line.encode('utf-8') + b'\n')
+            except OSError:
+                # 进程已退出，下次请求时重启
+                self._failures += 1
+                self._kill()
+                return None
+
+            try:
+                return self._read_line(process, time.monotonic() + timeout)
+            except TimeoutError:
+                # 看门狗：超时未响应，结束卡住的进程
+                self._timeouts += 1
+                performance_logger.warning(f"{self._name} did not respond within {timeout:.2f}s")
+            except EOFError:
+                self._failures += 1
+            self._kill()
+            return None
+
+    def _read_line(self, process: subprocess.Popen, deadline: float) -> str:
+        """读取一行响应，超过截止时间抛出TimeoutError，进程退出抛出EOFError"""
+        fd = process.stdout.fileno()
+        while b'\n' not in self._buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._selector.select(remaining):
+                raise TimeoutError
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise EOFError  # 进程已退出
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b'\n', 1)
+        return line.decode('utf-8', 'replace').rstrip('\r')
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取请求统计"""
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'timeouts': self._timeouts,
+                'failures': self._failures,
+                'restarts': self._restarts,
+                'running': int(self._process is not None and self._process.poll() is None),
+            }
+
+    def close(self):
+        """关闭辅助进程 - 先关闭标准输入让进程自行退出，超时再强制结束"""
+        with self._lock:
+            self._closed = True
+            process = self._process
+            if process is not None:
+                try:
+                    process.stdin.close()
+                    process.wait(0.5)
+                except (OSError, subprocess.TimeoutExpired):
+                    pass
+            self._kill()
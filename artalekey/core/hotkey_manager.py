@@ -1,10 +1,15 @@
-from typing import Optional, Callable
+from typing import Optional, Callable, List
 from pynput import keyboard
-from pynput.keyboard import Key, Controller, KeyCode
+from pynput.keyboard import Key, KeyCode
 from PyQt6.QtCore import QThread, pyqtSignal, QObject
 import time
 import threading
 from enum import Enum
+from artalekey.core.event_queue import KeyEventRing
+from artalekey.core.hotkey_matcher import Binding, HotkeyMatcher
+from artalekey.core.key_backends import KeyBackend, create_backend
+from artalekey.core.key_sequence import CompiledSequence, SequenceError, compile_sequence
+from artalekey.core.timing import CatchUpPolicy, DeadlineScheduler, SleepWaiter, HybridWaiter
 
 class KeyState(Enum):
     """按键状态枚举"""
@@ -13,9 +18,10 @@ class KeyState(Enum):
     LONG_PRESSED = 2
 
 class KeyboardManager:
-    """键盘管理器单例 - 优化了资源管理"""
+    """键盘管理器单例 - 持有启动时选定的按键输出后端"""
     _instance: Optional['KeyboardManager'] = None
-    _controller: Optional[Controller] = None
+    _backend: Optional[KeyBackend] = None
+    _backend_name: Optional[str] = None  # None表示读取环境变量或使用默认后端
     _lock = threading.RLock()  # 使用递归锁提高性能
 
     def __new__(cls):
@@ -23,12 +29,29 @@ class KeyboardManager:
             with cls._lock:
                 if cls._instance is None:  # 双重检查锁定
                     cls._instance = super().__new__(cls)
-                    cls._controller = Controller()
+                    if cls._backend is None:
+                        cls._backend = create_backend(cls._backend_name)
         return cls._instance
 
+    @classmethod
+    def use_backend(cls, backend):
+        """切换输出后端 - 可传入后端名称或KeyBackend实例，只影响之后创建的模拟器"""
+        with cls._lock:
+            if isinstance(backend, KeyBackend):
+                cls._backend = backend
+            else:
+                cls._backend_name = backend
+                # 尚未初始化时延迟到首次创建单例再选择
+                cls._backend = create_backend(backend) if cls._instance is not None else None
+
+    @property
+    def backend(self) -> KeyBackend:
+        return self._backend
+
     @property
-    def controller(self) -> Controller:
-        return self._controller
+    def controller(self) -> KeyBackend:
+        """兼容旧接口 - 返回当前后端"""
+        return self._backend
 
 class KeySimulator(QThread):
     """优化的按键模拟器 - 减少锁竞争和CPU使用"""
@@ -37,216 +60,457 @@ class KeySimulator(QThread):
     simulation_started = pyqtSignal()
     simulation_stopped = pyqtSignal()
     
-    def __init__(self):
+    def __init__(self, backend: Optional[KeyBackend] = None):
         super().__init__()
-        self.keyboard = KeyboardManager().controller
+        # 未指定后端时使用KeyboardManager在启动时选定的后端
+        self.keyboard = backend or KeyboardManager().backend
         self._running = False
         self._interval = 40  # 毫秒
         self._should_stop = threading.Event()
         self._lock = threading.RLock()
-        # 预分配按键状态，避免重复创建
-        self._keys_pressed = set()
+        # 调度模式: 'relative' 每轮相对当前时刻计时, 'deadline' 对齐绝对时间线
+        self._scheduler_mode = 'relative'
+        self._catch_up_policy = CatchUpPolicy.SKIP
+        self._scheduler: Optional[DeadlineScheduler] = None
+        # 高精度计时: 睡眠+忙等待混合，允许10ms以下的间隔
+        self._high_precision = False
+        self._guard_ms = 2.0
+        self._cpu_budget = 0.4
+        self._waiter = None
+        # 按键序列: None表示默认的左右交替模式，运行时按(序列, 间隔)缓存编译结果
+        self._sequence: Optional[str] = None
+        self._compiled: Optional[CompiledSequence] = None
+        self._compiled_key = None
         
     def set_interval(self, interval_ms: int):
         """设置按键间隔 - 优化了类型和范围检查"""
-        interval_ms = max(10, min(1000, interval_ms))  # 限制范围
+        min_interval = 1 if self._high_precision else 10
+        interval_ms = max(min_interval, min(1000, interval_ms))  # 限制范围
         with self._lock:
             self._interval = interval_ms
 
+    def set_high_precision(self, enabled: bool, guard_ms: float = 2.0,
+                           cpu_budget: float = 0.4):
+        """启用高精度计时引擎（隐含deadline调度）
+
+        guard_ms: 截止时间前开始忙等待的保护窗口
+        cpu_budget: 忙等待时间占每次等待时长的最大比例
+        """
+        with self._lock:
+            self._high_precision = enabled
+            self._guard_ms = guard_ms
+            self._cpu_budget = cpu_budget
+            if not enabled and self._interval < 10:
+                self._interval = 10
+
+    def set_sequence(self, source: Optional[str]):
+        """设置按键序列 - None恢复默认模式，语法错误时抛出SequenceError"""
+        if source:
+            compile_sequence(source, self._interval, resolve_key)  # 提前校验语法和按键
+        with self._lock:
+            self._sequence = source or None
+
+    def set_scheduler_mode(self, mode: str):
+        """设置调度模式 - 'relative' 或 'deadline'"""
+        if mode not in ('relative', 'deadline'):
+            raise ValueError(f"Unknown scheduler mode: {mode}")
+        with self._lock:
+            self._scheduler_mode = mode
+
+    def set_catch_up_policy(self, policy: CatchUpPolicy):
+        """设置deadline模式下落后时的处理策略"""
+        with self._lock:
+            self._catch_up_policy = CatchUpPolicy(policy)
+
+    def get_timing_stats(self) -> dict:
+        """获取最近一次运行的调度统计"""
+        scheduler = self._scheduler
+        return scheduler.get_stats() if scheduler else {}
+
+    def get_waiter_stats(self) -> dict:
+        """获取最近一次高精度运行的忙等待统计"""
+        waiter = self._waiter
+        return waiter.get_stats() if isinstance(waiter, HybridWaiter) else {}
+
+    def get_lateness_history(self) -> list:
+        """获取最近各周期的延迟（毫秒）"""
+        scheduler = self._scheduler
+        return scheduler.get_lateness_history() if scheduler else []
+
     def stop(self):
-        """优化的停止方法 - 使用事件机制"""
+        """优化的停止方法 - 只发出停止信号，按键由工作线程退出循环后释放"""
         with self._lock:
             if self._running:
                 self._should_stop.set()
-                self._release_all_keys()
 
-    def _release_all_keys(self):
-        """安全释放所有按键"""
-        try:
-            for key in list(self._keys_pressed):
+    def _release_keys(self, keys):
+        """安全释放按键 - 单个按键释放失败不影响其余按键"""
+        for key in keys:
+            try:
                 self.keyboard.release(key)
-            self._keys_pressed.clear()
-        except Exception:
-            pass  # 忽略释放过程中的异常
+            except Exception:
+                pass  # 忽略释放过程中的异常
+
+    def activate(self):
+        """开始一次模拟 - 普通模拟器每次激活都启动一个新线程"""
+        self.start()
+
+    def shutdown(self):
+        """停止模拟并等待线程结束"""
+        self.stop()
+        self.wait(1000)
+
+    def is_simulating(self) -> bool:
+        """当前是否有模拟在运行"""
+        return self._running
 
     def run(self):
         """优化的运行循环 - 减少CPU使用和提高响应性"""
+        self._run_session()
+
+    def _session_cancelled(self) -> bool:
+        """会话开始前是否已被取消，由子类覆盖"""
+        return False
+
+    def _run_session(self):
+        """执行一次完整的模拟会话：按下序列按键、循环直到停止、释放按键"""
+        with self._lock:
+            if self._running or self._session_cancelled():
+                return
+            self._running = True
+            self._should_stop.clear()
+        
+        compiled = None
         try:
-            with self._lock:
-                if self._running:
-                    return
-                self._running = True
-                self._should_stop.clear()
-            
             self.simulation_started.emit()
             
-            # 按下空格键开始
-            self.keyboard.press(Key.space)
-            self._keys_pressed.add(Key.space)
+            compiled = self._get_compiled_sequence()
+            # 预解析本次要用到的按键，避免在循环中解析
+            self.keyboard.prepare(compiled.keys)
             
-            interval_sec = self._interval / 1000.0
-            
-            while not self._should_stop.is_set():
-                start_time = time.perf_counter()
-                
-                # 左键循环
-                if self._should_stop.wait(0):
-                    break
-                self.keyboard.press(Key.left)
-                self._keys_pressed.add(Key.left)
-                
-                if self._should_stop.wait(interval_sec):
-                    break
-                self.keyboard.release(Key.left)
-                self._keys_pressed.discard(Key.left)
-                
-                # 右键循环
-                if self._should_stop.wait(0):
-                    break
-                self.keyboard.press(Key.right)
-                self._keys_pressed.add(Key.right)
-                
-                if self._should_stop.wait(interval_sec):
-                    break
-                self.keyboard.release(Key.right)
-                self._keys_pressed.discard(Key.right)
-                
-                # 动态调整睡眠时间以保持精确的间隔
-                elapsed = time.perf_counter() - start_time
-                remaining = interval_sec - elapsed
-                if remaining > 0:
-                    if self._should_stop.wait(remaining):
-                        break
+            relative = not (self._scheduler_mode == 'deadline' or self._high_precision)
+            self._run_sequence(compiled, relative)
                         
         except Exception as e:
             print(f"KeySimulator error: {e}")
         finally:
-            self._release_all_keys()
+            # 在工作线程上释放序列用到的全部按键：此时已不会再有按下事件，
+            # 停止信号与正在发送的按键交错时也不会留下按住的键
+            if compiled is not None:
+                self._release_keys(compiled.keys)
             with self._lock:
                 self._running = False
             self.simulation_stopped.emit()
 
+    def _get_compiled_sequence(self) -> CompiledSequence:
+        """获取当前序列和间隔对应的编译结果，未变化时复用缓存"""
+        with self._lock:
+            cache_key = (self._sequence, self._interval)
+            if self._compiled_key != cache_key:
+                self._compiled = compile_sequence(self._sequence, self._interval, resolve_key)
+                self._compiled_key = cache_key
+            return self._compiled
+
+    def _run_sequence(self, compiled: CompiledSequence, relative: bool):
+        """执行编译后的序列 - 每帧对齐到时间线上的截止时间
+
+        relative为True时每个周期结束后以当前时刻重新起算（旧的相对计时行为），
+        否则沿绝对时间线推进，落后时按补发策略处理。
+        """
+        scheduler = DeadlineScheduler(compiled.period_ns, self._catch_up_policy)
+        self._scheduler = scheduler
+        if self._high_precision:
+            waiter = HybridWaiter(self._should_stop, self._guard_ms, self._cpu_budget)
+        else:
+            waiter = SleepWaiter(self._should_stop)
+        self._waiter = waiter
+        wait_until = waiter.wait_until
+        send = self.keyboard.send
+        clock = time.perf_counter_ns
+        record_lateness = scheduler.record_lateness
+        deadline_at = scheduler.deadline
+        
+        # 只执行一次的前导部分（hold按键等）
+        scheduler.reset()
+        for offset_ns, events in compiled.prologue:
+            if wait_until(deadline_at(offset_ns)):
+                return
+            send(events)
+        scheduler.reset(deadline_at(compiled.prologue_ns))
+        
+        frames = compiled.frames
+        while True:
+            for offset_ns, events in frames:
+                deadline = deadline_at(offset_ns)
+                if wait_until(deadline):
+                    return
+                record_lateness(clock() - deadline)
+                send(events)
+            scheduler.next_cycle()
+            if relative:
+                scheduler.reset()
+
+class PersistentKeySimulator(KeySimulator):
+    """常驻按键模拟器 - 线程只创建一次，两次激活之间挂起等待
+
+    activate() 只设置激活标志并唤醒工作线程，不创建线程、不获取模拟器锁，
+    因此激活到第一次按键的延迟不再包含线程创建时间。
+    """
+    
+    def __init__(self, backend: Optional[KeyBackend] = None):
+        super().__init__(backend)
+        self._armed = False      # 激活标志，激活时只做赋值
+        self._shutdown = False
+        self._wake = threading.Event()
+        
+    def activate(self):
+        """激活模拟 - 首次调用时启动工作线程"""
+        self._armed = True
+        self._wake.set()
+        if not self.isRunning() and not self._shutdown:
+            self.start()
+            
+    def stop(self):
+        """停止当前会话，工作线程继续挂起等待下一次激活"""
+        with self._lock:
+            self._armed = False
+            if self._running:
+                self._should_stop.set()
+                
+    def shutdown(self):
+        """结束工作线程"""
+        self._shutdown = True
+        self.stop()
+        self._wake.set()
+        self.wait(1000)
+        
+    def _session_cancelled(self) -> bool:
+        # 与stop()在同一把锁下检查，避免激活后立即停止时会话仍然启动
+        return not self._armed
+        
+    def run(self):
+        """工作线程主循环 - 在事件上挂起，被激活时执行一次会话"""
+        while not self._shutdown:
+            self._wake.wait()
+            self._wake.clear()
+            if self._shutdown:
+                break
+            if self._armed:
+                self._run_session()
+
+def normalize_key(key) -> Optional[str]:
+    """把pynput按键归一化为按键id - 字符键为小写字符，特殊键为名称（如 'up'）"""
+    if isinstance(key, KeyCode):
+        if key.char:
+            return key.char.lower()
+        if key.vk is not None:
+            return f"vk{key.vk}"
+        return None
+    return getattr(key, 'name', None)
+
+def resolve_key(name: str):
+    """把序列中的按键名称解析为pynput按键"""
+    if len(name) == 1:
+        return KeyCode.from_char(name)
+    try:
+        return Key[name]
+    except KeyError:
+        raise SequenceError(f"Unknown key: {name!r}") from None
+
 class HotkeyListener(QThread):
     """优化的全局热键监听器 - 使用事件驱动而非轮询"""
     
+    # 默认绑定: 触发键 + ↑ 长按
+    DEFAULT_BINDING = 'default'
+    
     # 添加信号用于按键事件
     key_combination_detected = pyqtSignal()
     key_combination_released = pyqtSignal()
+    binding_activated = pyqtSignal(str)  # 任意绑定触发，参数为绑定id
+    binding_released = pyqtSignal(str)   # 任意绑定释放
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, dispatch_mode: str = 'direct', queue_size: int = 1024):
         super().__init__(parent)
         self.parent = parent
         self._running = True
-        self._key_states = {}  # 缓存按键状态
         self._hold_time = 500  # 毫秒
+        self._trigger_key = 'w'
+        self._extra_bindings: List[Binding] = []
         self._lock = threading.RLock()
         
-        # 使用threading.Timer来处理长按检测，避免Qt线程问题
-        self._long_press_timer = None
+        # 所有绑定编译为按按键索引的状态机，长按超时由全局时间轮触发
+        self._matcher = HotkeyMatcher(self._on_binding_activated, self._on_binding_released)
+        self._rebuild_bindings()
+        
+        # 分发模式: 'direct' 在pynput线程上直接匹配; 'queue' 回调只写入环形缓冲区，
+        # 由独立的消费线程匹配并发送信号，避免拖慢系统输入钩子
+        if dispatch_mode not in ('direct', 'queue'):
+            raise ValueError(f"Unknown dispatch mode: {dispatch_mode}")
+        self._dispatch_mode = dispatch_mode
+        self._event_ring = KeyEventRing(queue_size) if dispatch_mode == 'queue' else None
+        self._consumer_thread: Optional[threading.Thread] = None
+        self._listener: Optional[keyboard.Listener] = None
+        self._listener_lock = threading.Lock()
         
-        # 优化：预定义需要监听的按键
-        self._monitored_keys = {'w', Key.up}
+        # 键盘活动回调（如通知窗口监控器加快轮询），按最小间隔节流
+        self._activity_callback: Optional[Callable[[], None]] = None
+        self._activity_interval_ns = 0
+        self._last_activity_ns = 0
+        
+    def set_activity_callback(self, callback: Optional[Callable[[], None]],
+                              min_interval_ms: int = 250):
+        """设置任意按键按下时的活动回调，min_interval_ms内最多调用一次"""
+        self._activity_interval_ns = max(0, min_interval_ms) * 1_000_000
+        self._last_activity_ns = 0
+        self._activity_callback = callback
+        
+    def _notify_activity(self):
+        """节流后调用活动回调 - direct模式在pynput线程上、queue模式在消费线程上执行"""
+        callback = self._activity_callback
+        if callback is None:
+            return
+        now = time.perf_counter_ns()
+        if now - self._last_activity_ns < self._activity_interval_ns:
+            return
+        self._last_activity_ns = now
+        try:
+            callback()
+        except Exception as e:
+            print(f"HotkeyListener activity callback error: {e}")
         
     def set_hold_time(self, time_ms: int):
         """设置长按触发时间"""
         time_ms = max(50, min(5000, time_ms))  # 限制范围
         with self._lock:
             self._hold_time = time_ms
+            self._rebuild_bindings()
     
-    def _start_long_press_timer(self):
-        """启动长按计时器"""
-        self._cancel_long_press_timer()
-        self._long_press_timer = threading.Timer(
-            self._hold_time / 1000.0, 
-            self._on_long_press_timeout
-        )
-        self._long_press_timer.start()
+    def set_trigger_key(self, key: str):
+        """设置主触发键（与↑键组合）"""
+        key = (key or 'w').lower()
+        with self._lock:
+            if key != self._trigger_key:
+                self._trigger_key = key
+                self._rebuild_bindings()
     
-    def _cancel_long_press_timer(self):
-        """取消长按计时器"""
-        if self._long_press_timer and self._long_press_timer.is_alive():
-            self._long_press_timer.cancel()
-        self._long_press_timer = None
-        
-    def _on_long_press_timeout(self):
-        """长按超时处理"""
+    def set_bindings(self, bindings: List[Binding]):
+        """设置额外的绑定（组合、长按或顺序），默认绑定始终保留"""
         with self._lock:
-            if self._is_combination_pressed() and self._running:
-                self.key_combination_detected.emit()
-                
-    def _is_combination_pressed(self) -> bool:
-        """检查组合键是否被按下"""
-        w_state = self._key_states.get('w', KeyState.RELEASED)
-        up_state = self._key_states.get(Key.up, KeyState.RELEASED)
-        return w_state != KeyState.RELEASED and up_state != KeyState.RELEASED
+            self._extra_bindings = list(bindings)
+            self._rebuild_bindings()
+    
+    def _rebuild_bindings(self):
+        """重新编译所有绑定"""
+        default = Binding(
+            self.DEFAULT_BINDING, (self._trigger_key, 'up'),
+            kind=Binding.HOLD, hold_ms=self._hold_time
+        )
+        self._matcher.set_bindings([default] + self._extra_bindings)
+        
+    def _on_binding_activated(self, binding_id: str):
+        """绑定触发"""
+        if not self._running:
+            return
+        if binding_id == self.DEFAULT_BINDING:
+            self.key_combination_detected.emit()
+        self.binding_activated.emit(binding_id)
+        
+    def _on_binding_released(self, binding_id: str):
+        """绑定释放"""
+        if binding_id == self.DEFAULT_BINDING:
+            self.key_combination_released.emit()
+        self.binding_released.emit(binding_id)
+        
+    def get_dispatch_stats(self) -> dict:
+        """获取分发队列统计（队列深度、丢弃数等），direct模式下为空"""
+        return self._event_ring.get_stats() if self._event_ring else {}
         
     def run(self):
-        """优化的监听循环"""
+        """监听线程 - 阻塞在pynput监听器上，空闲时不产生任何唤醒"""
+        if self._event_ring is not None:
+            self._consumer_thread = threading.Thread(
+                target=self._consume_events, name="HotkeyDispatch", daemon=True
+            )
+            self._consumer_thread.start()
         try:
-            with keyboard.Listener(
+            listener = keyboard.Listener(
                 on_press=self._on_press,
                 on_release=self._on_release,
                 suppress=False  # 不抑制按键，减少系统负担
-            ) as listener:
-                while self._running:
-                    self.msleep(50)  # 使用Qt的msleep，更高效
-                listener.stop()
+            )
+            with self._listener_lock:
+                if not self._running:
+                    return  # 启动前已被停止
+                self._listener = listener
+                listener.start()
+            listener.join()  # 直到stop()调用listener.stop()才返回
         except Exception as e:
             print(f"HotkeyListener error: {e}")
+        finally:
+            with self._listener_lock:
+                self._listener = None
+            if self._event_ring is not None:
+                self._event_ring.close()
+                self._consumer_thread.join(1.0)
+            
+    def _consume_events(self):
+        """消费线程 - 从环形缓冲区取出事件进行匹配"""
+        ring = self._event_ring
+        handle = self._handle_queued_event
+        while True:
+            ring.wait()
+            ring.drain(handle)
+            if ring.closed:
+                break
+                
+    def _handle_queued_event(self, event):
+        """处理一个 (时间戳ns, 按键id, 是否按下) 事件"""
+        timestamp_ns, key_id, is_down = event
+        if is_down:
+            self._notify_activity()
+            if key_id is not None:
+                self._matcher.key_down(key_id, timestamp_ns)
+        else:
+            self._matcher.key_up(key_id, timestamp_ns)
             
     def _on_press(self, key):
         """优化的按键按下处理"""
         try:
-            key_id = None
-            if isinstance(key, KeyCode) and hasattr(key, 'char') and key.char:
-                if key.char in {'w'}:  # 只处理我们关心的字符键
-                    key_id = key.char
-            elif key == Key.up:
-                key_id = key
-                
-            if key_id is None:
-                return
-                
-            with self._lock:
-                current_state = self._key_states.get(key_id, KeyState.RELEASED)
-                if current_state == KeyState.RELEASED:
-                    self._key_states[key_id] = KeyState.PRESSED
-                    
-                    # 检查是否需要开始长按计时
-                    if self._is_combination_pressed():
-                        self._start_long_press_timer()
-                        
+            key_id = normalize_key(key)
         except (AttributeError, TypeError):
-            pass  # 忽略特殊按键
+            key_id = None  # 忽略特殊按键，但仍算作键盘活动
+        if self._event_ring is not None:
+            # 回调只入队，活动回调和匹配都在消费线程上执行；
+            # 设置了活动回调时未绑定的按键也入队（按键id可能为None）
+            if self._activity_callback is not None or self._matcher.is_monitored(key_id):
+                self._event_ring.push((time.perf_counter_ns(), key_id, True))
+            return
+        self._notify_activity()
+        if key_id is not None:
+            self._matcher.key_down(key_id)
             
     def _on_release(self, key):
         """优化的按键释放处理"""
         try:
-            key_id = None
-            if isinstance(key, KeyCode) and hasattr(key, 'char') and key.char:
-                if key.char in {'w'}:
-                    key_id = key.char
-            elif key == Key.up:
-                key_id = key
-                
+            key_id = normalize_key(key)
             if key_id is None:
                 return
-                
-            with self._lock:
-                if key_id in self._key_states:
-                    self._key_states[key_id] = KeyState.RELEASED
-                    
-                    # 停止长按计时器
-                    self._cancel_long_press_timer()
-                    
-                    # 发送释放信号
-                    self.key_combination_released.emit()
-                    
+            if self._event_ring is not None:
+                if self._matcher.is_monitored(key_id):
+                    self._event_ring.push((time.perf_counter_ns(), key_id, False))
+            else:
+                self._matcher.key_up(key_id)
         except (AttributeError, TypeError):
             pass
             
     def stop(self):
-        """安全停止监听器"""
-        self._running = False
-        self._cancel_long_press_timer()
-        self.wait(1000)  # 最多等待1秒 
\ No newline at end of file
+        """安全停止监听器 - 直接停止pynput监听器，线程立即退出"""
+        with self._listener_lock:
+            self._running = False
+            if self._listener is not None:
+                try:
+                    self._listener.stop()
+                except Exception as e:
+                    print(f"HotkeyListener stop error: {e}")
+        self._matcher.reset()
+        self.wait(1000)  # 最多等待1秒
\ No newline at end of file
@@ -0,0 +1,199 @@
+import time
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from artalekey.core.timer_wheel import TimerWheel, timer_wheel
+
+class Binding:
+    """热键绑定定义 - 按键使用归一化后的按键id（如 'w'、'up'）
+
+    kind:
+        chord     所有按键同时按下即触发
+        hold      所有按键同时按下并保持 hold_ms 毫秒后触发
+        sequence  按顺序依次按下，相邻两键间隔不超过 timeout_ms
+    """
+
+    CHORD = 'chord'
+    HOLD = 'hold'
+    SEQUENCE = 'sequence'
+
+    __slots__ = ('binding_id', 'keys', 'kind', 'hold_ms', 'timeout_ms')
+
+    def __init__(self, binding_id: str, keys: Iterable[str], kind: str = CHORD,
+                 hold_ms: int = 0, timeout_ms: int = 1000):
+        if kind not in (self.CHORD, self.HOLD, self.SEQUENCE):
+            raise ValueError(f"Unknown binding kind: {kind}")
+        keys = tuple(key.lower() for key in keys)
+        if not keys:
+            raise ValueError("Binding requires at least one key")
+        self.binding_id = binding_id
+        # 组合键与顺序无关，去重；序列保留顺序和重复
+        self.keys = keys if kind == self.SEQUENCE else tuple(dict.fromkeys(keys))
+        self.kind = kind
+        self.hold_ms = hold_ms
+        self.timeout_ms = timeout_ms
+
+    def __repr__(self):
+        return f"Binding({self.binding_id!r}, {self.keys}, kind={self.kind!r})"
+
+def _failure_table(keys: Tuple[str, ...]) -> Tuple[int, ...]:
+    """KMP失配表 - 第i项为 keys[:i+1] 的最长真前缀兼后缀长度"""
+    failure = [0] * len(keys)
+    length = 0
+    for i in range(1, len(keys)):
+        while length and keys[i] != keys[length]:
+            length = failure[length - 1]
+        if keys[i] == keys[length]:
+            length += 1
+        failure[i] = length
+    return tuple(failure)
+
+class _BindingState:
+    """单个绑定的运行时状态"""
+
+    __slots__ = ('binding', 'size', 'down_count', 'complete', 'active',
+                 'timer', 'progress', 'failure', 'last_ns', 'timeout_ns')
+
+    def __init__(self, binding: Binding):
+        self.binding = binding
+        self.size = len(binding.keys)
+        self.down_count = 0
+        self.complete = False   # 组合键全部按下
+        self.active = False     # 已触发，等待释放
+        self.timer = None
+        self.progress = 0       # 序列匹配进度
+        self.failure = _failure_table(binding.keys) if binding.kind == Binding.SEQUENCE else ()
+        self.last_ns = 0
+        self.timeout_ns = binding.timeout_ms * 1_000_000
+
+class HotkeyMatcher:
+    """热键匹配状态机 - 所有绑定按按键id建立索引
+
+    每个按键事件只访问包含该按键的绑定，处理开销与绑定总数无关。
+    按键自动重复产生的重复按下会被忽略。保持类绑定的超时由时间轮触发。
+    """
+
+    def __init__(self, on_activated: Callable[[str], None],
+                 on_released: Optional[Callable[[str], None]] = None,
+                 wheel: Optional[TimerWheel] = None):
+        self._on_activated = on_activated
+        self._on_released = on_released or (lambda binding_id: None)
+        self._wheel = wheel or timer_wheel
+        self._lock = threading.RLock()
+        self._index: Dict[str, Tuple[_BindingState, ...]] = {}
+        self._states: List[_BindingState] = []
+        self._down = set()
+
+    def set_bindings(self, bindings: Iterable[Binding]):
+        """编译绑定为按键索引，替换之前的全部绑定"""
+        with self._lock:
+            self._cancel_timers()
+            states = [_BindingState(binding) for binding in bindings]
+            index: Dict[str, List[_BindingState]] = {}
+            for state in states:
+                for key in dict.fromkeys(state.binding.keys):
+                    index.setdefault(key, []).append(state)
+            self._states = states
+            self._index = {key: tuple(value) for key, value in index.items()}
+            # 重新统计当前已按下的按键，保持状态一致
+            for key in self._down:
+                for state in self._index.get(key, ()):
+                    if state.binding.kind != Binding.SEQUENCE:
+                        state.down_count += 1
+                        state.complete = state.down_count == state.size
+
+    def get_bindings(self) -> List[Binding]:
+        with self._lock:
+            return [state.binding for state in self._states]
+
+    def is_monitored(self, key_id: str) -> bool:
+        """按键是否属于某个绑定"""
+        return key_id in self._index
+
+    def key_down(self, key_id: str, timestamp_ns: Optional[int] = None):
+        """处理按键按下"""
+        states = self._index.get(key_id)
+        if states is None:
+            return
+        with self._lock:
+            if key_id in self._down:
+                return  # 自动重复
+            self._down.add(key_id)
+            now = timestamp_ns if timestamp_ns is not None else time.perf_counter_ns()
+            for state in states:
+                kind = state.binding.kind
+                if kind == Binding.SEQUENCE:
+                    self._advance_sequence(state, key_id, now)
+                    continue
+                state.down_count += 1
+                if state.down_count == state.size:
+                    state.complete = True
+                    if kind == Binding.CHORD:
+                        state.active = True
+                        self._on_activated(state.binding.binding_id)
+                    else:
+                        state.timer = self._wheel.schedule(
+                            state.binding.hold_ms / 1000.0, self._on_hold_timeout, state
+                        )
+
+    def key_up(self, key_id: str, timestamp_ns: Optional[int] = None):
+        """处理按键释放"""
+        states = self._index.get(key_id)
+        if states is None:
+            return
+        with self._lock:
+            if key_id not in self._down:
+                return
+            self._down.discard(key_id)
+            for state in states:
+                if state.binding.kind == Binding.SEQUENCE:
+                    continue
+                state.down_count -= 1
+                if state.complete:
+                    state.complete = False
+                    state.active = False
+                    if state.timer is not None:
+                        state.timer.cancel()
+                        state.timer = None
+                    self._on_released(state.binding.binding_id)
+
+    def reset(self):
+        """清除所有按键状态"""
+        with self._lock:
+            self._cancel_timers()
+            self._down.clear()
+            for state in self._states:
+                state.down_count = 0
+                state.complete = False
+                state.active = False
+                state.progress = 0
+
+    def _advance_sequence(self, state: _BindingState, key_id: str, now: int):
+        """推进顺序绑定的匹配进度 - 失配时按失配表回退到仍然匹配的最长前缀"""
+        keys = state.binding.keys
+        progress = state.progress
+        if progress and now - state.last_ns > state.timeout_ns:
+            progress = 0
+        while progress and keys[progress] != key_id:
+            progress = state.failure[progress - 1]
+        if keys[progress] == key_id:
+            progress += 1
+        state.last_ns = now
+        if progress == state.size:
+            progress = 0
+            self._on_activated(state.binding.binding_id)
+        state.progress = progress
+
+    def _on_hold_timeout(self, state: _BindingState):
+        """保持时间到达（在时间轮线程上执行）"""
+        with self._lock:
+            if state.timer is None or not state.complete:
+                return
+            state.timer = None
+            state.active = True
+            self._on_activated(state.binding.binding_id)
+
+    def _cancel_timers(self):
+        for state in self._states:
+            if state.timer is not None:
+                state.timer.cancel()
+                state.timer = None
@@ -0,0 +1,311 @@
+import os
+import sys
+import time
+import struct
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+from artalekey.core.logger import performance_logger
+
+class KeyBackend:
+    """按键输出后端接口 - KeySimulator只通过这里发送按键"""
+
+    name = "base"
+
+    def press(self, key: Any):
+        """按下按键"""
+        raise NotImplementedError
+
+    def release(self, key: Any):
+        """释放按键"""
+        raise NotImplementedError
+
+    def send(self, events: Iterable[Tuple[bool, Any]]):
+        """批量发送 (是否按下, 按键) 事件"""
+        press, release = self.press, self.release
+        for is_press, key in events:
+            if is_press:
+                press(key)
+            else:
+                release(key)
+
+    def prepare(self, keys: Iterable[Any]):
+        """预解析将要使用的按键，默认无需处理"""
+        pass
+
+    def close(self):
+        """释放后端资源"""
+        pass
+
+class PynputBackend(KeyBackend):
+    """基于pynput Controller的默认后端"""
+
+    name = "pynput"
+
+    def __init__(self):
+        from pynput.keyboard import Controller
+        self.controller = Controller()
+        # 直接绑定到Controller的方法，省去一层Python调用
+        self.press = self.controller.press
+        self.release = self.controller.release
+
+class RecordingBackend(KeyBackend):
+    """内存记录后端 - 不产生真实按键，为每个事件记录时间戳
+
+    用于在无显示环境下测量模拟器的吞吐量和抖动。
+    events 中每项为 (perf_counter_ns时间戳, 是否按下, 按键)。
+    """
+
+    name = "recording"
+
+    def __init__(self):
+        self.events: List[Tuple[int, bool, Any]] = []
+        self._append = self.events.append
+        self._clock = time.perf_counter_ns
+
+    def press(self, key: Any):
+        self._append((self._clock(), True, key))
+
+    def release(self, key: Any):
+        self._append((self._clock(), False, key))
+
+    def send(self, events: Iterable[Tuple[bool, Any]]):
+        append, clock = self._append, self._clock
+        for is_press, key in events:
+            append((clock(), is_press, key))
+
+    def clear(self):
+        """清空已记录的事件"""
+        self.events.clear()
+
+    def get_press_intervals(self, key: Any = None) -> List[float]:
+        """获取相邻两次按下之间的间隔（毫秒），可按键过滤"""
+        timestamps = [
+            ts for ts, is_press, k in self.events
+            if is_press and (key is None or k == key)
+        ]
+        return [(b - a) / 1e6 for a, b in zip(timestamps, timestamps[1:])]
+
+def key_name(key: Any) -> str:
+    """把pynput按键或字符串归一化为按键名称，如 Key.left -> 'left'"""
+    if isinstance(key, str):
+        return key
+    name = getattr(key, 'name', None)  # pynput Key枚举
+    if name:
+        return name
+    char = getattr(key, 'char', None)  # pynput KeyCode字符键
+    if char:
+        return char
+    raise ValueError(f"Unsupported key: {key!r}")
+
+# pynput按键名称 -> X keysym名称（字母数字键的keysym与字符相同）
+_X_KEYSYM_NAMES = {
+    'space': 'space', 'left': 'Left', 'right': 'Right', 'up': 'Up', 'down': 'Down',
+    'enter': 'Return', 'esc': 'Escape', 'tab': 'Tab', 'backspace': 'BackSpace',
+    'shift': 'Shift_L', 'shift_r': 'Shift_R', 'ctrl': 'Control_L', 'ctrl_r': 'Control_R',
+    'alt': 'Alt_L', 'alt_r': 'Alt_R',
+}
+
+class XTestBackend(KeyBackend):
+    """Linux XTest后端 - 复用一个持久X连接，按键码预解析后缓存
+
+    批量发送时所有请求只flush一次，按下/释放成对事件合并为一次写出。
+    """
+
+    name = "xtest"
+
+    def __init__(self, display_name: Optional[str] = None):
+        from Xlib import X, XK, display
+        from Xlib.ext import xtest
+
+        self._display = display.Display(display_name)
+        if not self._display.has_extension('XTEST'):
+            self._display.close()
+            raise RuntimeError("XTEST extension not available")
+
+        self._XK = XK
+        self._fake_input = xtest.fake_input
+        self._key_press = X.KeyPress
+        self._key_release = X.KeyRelease
+        self._keycodes: Dict[Any, int] = {}
+
+    def _resolve(self, key: Any) -> int:
+        """解析按键对应的X keycode"""
+        name = key_name(key)
+        keysym = self._XK.string_to_keysym(_X_KEYSYM_NAMES.get(name, name))
+        keycode = self._display.keysym_to_keycode(keysym) if keysym else 0
+        if not keycode:
+            raise ValueError(f"No X keycode for key: {key!r}")
+        self._keycodes[key] = keycode
+        return keycode
+
+    def prepare(self, keys: Iterable[Any]):
+        for key in keys:
+            if key not in self._keycodes:
+                self._resolve(key)
+
+    def press(self, key: Any):
+        keycode = self._keycodes.get(key) or self._resolve(key)
+        self._fake_input(self._display, self._key_press, keycode)
+        self._display.flush()
+
+    def release(self, key: Any):
+        keycode = self._keycodes.get(key) or self._resolve(key)
+        self._fake_input(self._display, self._key_release, keycode)
+        self._display.flush()
+
+    def send(self, events: Iterable[Tuple[bool, Any]]):
+        keycodes = self._keycodes
+        for is_press, key in events:
+            keycode = keycodes.get(key) or self._resolve(key)
+            event_type = self._key_press if is_press else self._key_release
+            self._fake_input(self._display, event_type, keycode)
+        self._display.flush()
+
+    def close(self):
+        try:
+            self._display.close()
+        except Exception:
+            pass
+
+# Linux evdev按键码 (linux/input-event-codes.h)
+_EVDEV_CODES = {
+    'esc': 1, 'backspace': 14, 'tab': 15, 'enter': 28, 'ctrl': 29, 'shift': 42,
+    'shift_r': 54, 'alt': 56, 'space': 57, 'ctrl_r': 97, 'alt_r': 100,
+    'up': 103, 'left': 105, 'right': 106, 'down': 108,
+}
+_EVDEV_CODES.update({c: 2 + i for i, c in enumerate('123456789')})
+_EVDEV_CODES['0'] = 11
+_EVDEV_CODES.update({c: 16 + i for i, c in enumerate('qwertyuiop')})
+_EVDEV_CODES.update({c: 30 + i for i, c in enumerate('asdfghjkl')})
+_EVDEV_CODES.update({c: 44 + i for i, c in enumerate('zxcvbnm')})
+
+# uinput ioctl与事件常量
+_UI_SET_EVBIT = 0x40045564
+_UI_SET_KEYBIT = 0x40045565
+_UI_DEV_SETUP = 0x405c5503
+_UI_DEV_CREATE = 0x5501
+_UI_DEV_DESTROY = 0x5502
+_EV_SYN = 0x00
+_EV_KEY = 0x01
+_SYN_REPORT = 0
+_BUS_VIRTUAL = 0x06
+_INPUT_EVENT = struct.Struct('llHHi')
+
+class UInputBackend(KeyBackend):
+    """Linux uinput后端 - 创建虚拟键盘设备，需要 /dev/uinput 写权限
+
+    每个事件预先打包成字节串，批量发送时一次write写出全部事件。
+    """
+
+    name = "uinput"
+
+    def __init__(self, device_path: str = "/dev/uinput"):
+        import fcntl
+
+        fd = os.open(device_path, os.O_WRONLY | os.O_NONBLOCK)
+        try:
+            fcntl.ioctl(fd, _UI_SET_EVBIT, _EV_KEY)
+            for code in sorted(set(_EVDEV_CODES.values())):
+                fcntl.ioctl(fd, _UI_SET_KEYBIT, code)
+            setup = struct.pack('HHHH80sI', _BUS_VIRTUAL, 0x1, 0x1, 1,
+                                b'artalekey-virtual-keyboard', 0)
+            fcntl.ioctl(fd, _UI_DEV_SETUP, setup)
+            fcntl.ioctl(fd, _UI_DEV_CREATE)
+        except Exception:
+            os.close(fd)
+            raise
+
+        self._fcntl = fcntl
+        self._fd = fd
+        self._packets: Dict[Tuple[Any, bool], bytes] = {}
+        self._syn = _INPUT_EVENT.pack(0, 0, _EV_SYN, _SYN_REPORT, 0)
+        time.sleep(0.1)  # 等待系统识别新设备，避免丢失最初的事件
+
+    def _packet(self, key: Any, is_press: bool) -> bytes:
+        """获取按键事件的预打包字节（内核会填充时间戳）"""
+        packet = self._packets.get((key, is_press))
+        if packet is None:
+            code = _EVDEV_CODES.get(key_name(key))
+            if code is None:
+                raise ValueError(f"No evdev keycode for key: {key!r}")
+            packet = _INPUT_EVENT.pack(0, 0, _EV_KEY, code, 1 if is_press else 0)
+            self._packets[(key, is_press)] = packet
+        return packet
+
+    def prepare(self, keys: Iterable[Any]):
+        for key in keys:
+            self._packet(key, True)
+            self._packet(key, False)
+
+    def press(self, key: Any):
+        os.write(self._fd, self._packet(key, True) + self._syn)
+
+    def release(self, key: Any):
+        os.write(self._fd, self._packet(key, False) + self._syn)
+
+    def send(self, events: Iterable[Tuple[bool, Any]]):
+        syn = self._syn
+        packets = [self._packet(key, is_press) + syn for is_press, key in events]
+        os.write(self._fd, b''.join(packets))
+
+    def close(self):
+        try:
+            self._fcntl.ioctl(self._fd, _UI_DEV_DESTROY)
+            os.close(self._fd)
+        except OSError:
+            pass
+
+# 可用后端注册表
+_BACKENDS: Dict[str, Type[KeyBackend]] = {
+    PynputBackend.name: PynputBackend,
+    RecordingBackend.name: RecordingBackend,
+    XTestBackend.name: XTestBackend,
+    UInputBackend.name: UInputBackend,
+}
+
+FALLBACK_BACKEND = "pynput"
+DEFAULT_BACKEND = FALLBACK_BACKEND  # 原生后端需要显式选择（环境变量或 KeyboardManager.use_backend）
+BACKEND_ENV_VAR = "ARTALEKEY_KEY_BACKEND"
+
+def register_backend(name: str, backend_cls: Type[KeyBackend]):
+    """注册自定义按键后端"""
+    _BACKENDS[name] = backend_cls
+
+def available_backends() -> List[str]:
+    """获取已注册的后端名称"""
+    return sorted(_BACKENDS)
+
+def _auto_candidates() -> List[str]:
+    """auto模式（需显式选择）下按优先级排列的后端 - Linux优先使用原生后端"""
+    candidates = []
+    if sys.platform.startswith('linux'):
+        if os.environ.get('DISPLAY'):
+            candidates.append(XTestBackend.name)
+        if os.access('/dev/uinput', os.W_OK):
+            candidates.append(UInputBackend.name)
+    candidates.append(FALLBACK_BACKEND)
+    return candidates
+
+def create_backend(name: Optional[str] = None) -> KeyBackend:
+    """创建按键后端 - 未指定时读取环境变量，创建失败时回退到pynput"""
+    name = name or os.environ.get(BACKEND_ENV_VAR) or DEFAULT_BACKEND
+    if name == "auto":
+        candidates = _auto_candidates()
+    else:
+        candidates = [name] if name == FALLBACK_BACKEND else [name, FALLBACK_BACKEND]
+
+    for candidate in candidates:
+        backend_cls = _BACKENDS.get(candidate)
+        if backend_cls is None:
+            performance_logger.warning(f"Unknown key backend '{candidate}'")
+            continue
+        try:
+            backend = backend_cls()
+        except Exception as e:
+            if candidate == FALLBACK_BACKEND:
+                raise
+            performance_logger.warning(f"Key backend '{candidate}' unavailable: {e}")
+            continue
+        performance_logger.info(f"Key output backend: {backend.name}")
+        return backend
+
+    raise RuntimeError("No key output backend available")
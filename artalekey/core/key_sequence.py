@@ -0,0 +1,190 @@
+import re
+from functools import lru_cache
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+# 默认移动模式：按住空格，左右键交替按下/释放
+DEFAULT_SEQUENCE = """
+hold space
+repeat {
+    press left
+    wait
+    release left
+    press right
+    wait
+    release right
+}
+"""
+
+_COMMENT_RE = re.compile(r'#[^\n]*')
+_TOKEN_RE = re.compile(r'[{};]|[^\s{};]+')
+_WAIT_MS_RE = re.compile(r'^(\d+(?:\.\d+)?)ms$')
+
+class SequenceError(ValueError):
+    """按键序列语法或语义错误"""
+    pass
+
+class CompiledSequence:
+    """编译后的按键序列 - 运行循环只遍历扁平的元组，不再解释语法
+
+    steps: (动作, 按键, 周期内偏移ns) 的扁平元组，动作 1=按下 0=释放
+    frames: 按相同偏移分组后的 (偏移ns, ((是否按下, 按键), ...))，同一时刻的事件批量发送
+    prologue: 进入循环前只执行一次的帧（包含hold按键）
+    """
+
+    __slots__ = ('steps', 'frames', 'prologue', 'prologue_ns', 'period_ns', 'hold_keys', 'keys')
+
+    def __init__(self, steps, frames, prologue, prologue_ns, period_ns, hold_keys, keys):
+        self.steps = steps
+        self.frames = frames
+        self.prologue = prologue
+        self.prologue_ns = prologue_ns
+        self.period_ns = period_ns
+        self.hold_keys = hold_keys
+        self.keys = keys
+
+@lru_cache(maxsize=32)
+def parse_sequence(source: str) -> tuple:
+    """解析序列文本为操作元组，结果按源文本缓存
+
+    语法（语句之间用换行、空格或分号分隔，# 开始注释）:
+        press KEY / release KEY   按下/释放按键
+        hold KEY                  开始时按下并一直保持到停止
+        wait [N | Nms]            等待N个间隔（默认1个）或N毫秒
+        repeat N { ... }          重复N次（编译时展开）
+        repeat { ... }            无限循环体，只能出现一次且位于最外层
+    """
+    tokens = _TOKEN_RE.findall(_COMMENT_RE.sub('', source))
+    ops, pos = _parse_block(tokens, 0, nested=False)
+    if pos != len(tokens):
+        raise SequenceError(f"Unexpected token: {tokens[pos]!r}")
+    return ops
+
+def _parse_block(tokens: List[str], pos: int, nested: bool) -> Tuple[tuple, int]:
+    """解析语句块，nested为True时遇到 } 结束"""
+    ops = []
+    while pos < len(tokens):
+        token = tokens[pos].lower()
+        if token == ';':
+            pos += 1
+        elif token == '}':
+            if not nested:
+                raise SequenceError("Unmatched '}'")
+            return tuple(ops), pos + 1
+        elif token in ('press', 'release', 'hold'):
+            if pos + 1 >= len(tokens) or tokens[pos + 1] in ('{', '}', ';'):
+                raise SequenceError(f"'{token}' requires a key")
+            ops.append((token, tokens[pos + 1].lower()))
+            pos += 2
+        elif token == 'wait':
+            amount, unit = 1.0, 'interval'
+            if pos + 1 < len(tokens):
+                arg = tokens[pos + 1].lower()
+                ms_match = _WAIT_MS_RE.match(arg)
+                if ms_match:
+                    amount, unit = float(ms_match.group(1)), 'ms'
+                    pos += 1
+                elif re.match(r'^\d+(?:\.\d+)?$', arg):
+                    amount = float(arg)
+                    pos += 1
+            ops.append(('wait', amount, unit))
+            pos += 1
+        elif token == 'repeat':
+            pos += 1
+            count = None
+            if pos < len(tokens) and tokens[pos].isdigit():
+                count = int(tokens[pos])
+                pos += 1
+            if pos >= len(tokens) or tokens[pos] != '{':
+                raise SequenceError("'repeat' requires a '{ ... }' block")
+            body, pos = _parse_block(tokens, pos + 1, nested=True)
+            ops.append(('repeat', count, body))
+        else:
+            raise SequenceError(f"Unknown statement: {tokens[pos]!r}")
+
+    if nested:
+        raise SequenceError("Missing '}'")
+    return tuple(ops), pos
+
+def _flatten(ops: Iterable[tuple], start_ns: int, interval_ns: int,
+             resolve: Callable[[str], Any], out: list) -> int:
+    """把操作展开为 (偏移ns, 是否按下, 按键) 并追加到out，返回结束时刻"""
+    t = start_ns
+    for op in ops:
+        kind = op[0]
+        if kind == 'press':
+            out.append((t, True, resolve(op[1])))
+        elif kind == 'release':
+            out.append((t, False, resolve(op[1])))
+        elif kind == 'wait':
+            amount, unit = op[1], op[2]
+            t += int(amount * (1_000_000 if unit == 'ms' else interval_ns))
+        elif kind == 'repeat':
+            if op[1] is None:
+                raise SequenceError("Infinite 'repeat' is only allowed at top level")
+            for _ in range(op[1]):
+                t = _flatten(op[2], t, interval_ns, resolve, out)
+        elif kind == 'hold':
+            raise SequenceError("'hold' is only allowed at top level")
+    return t
+
+def _group_frames(events: List[tuple]) -> tuple:
+    """把相同偏移的事件合并为一帧"""
+    frames = []
+    for offset, is_press, key in events:
+        if frames and frames[-1][0] == offset:
+            frames[-1][1].append((is_press, key))
+        else:
+            frames.append((offset, [(is_press, key)]))
+    return tuple((offset, tuple(batch)) for offset, batch in frames)
+
+def compile_sequence(source: Optional[str], interval_ms: float,
+                     resolve: Optional[Callable[[str], Any]] = None) -> CompiledSequence:
+    """编译按键序列 - 把等待换算成基于间隔的绝对偏移
+
+    resolve 把按键名称转换为后端使用的按键对象，默认保留名称字符串。
+    """
+    ops = parse_sequence(source or DEFAULT_SEQUENCE)
+    resolve = resolve or (lambda name: name)
+    interval_ns = int(interval_ms * 1_000_000)
+
+    hold_keys = []
+    prologue_ops = []
+    loop_ops = None
+    for op in ops:
+        if op[0] == 'hold':
+            hold_keys.append(resolve(op[1]))
+        elif op[0] == 'repeat' and op[1] is None:
+            if loop_ops is not None:
+                raise SequenceError("Only one infinite 'repeat' block is allowed")
+            loop_ops = op[2]
+        elif loop_ops is not None:
+            raise SequenceError("Statements after the infinite 'repeat' block never run")
+        else:
+            prologue_ops.append(op)
+    if loop_ops is None:
+        # 没有显式的无限循环时，整个序列作为循环体
+        loop_ops, prologue_ops = tuple(prologue_ops), []
+
+    prologue_events = [(0, True, key) for key in hold_keys]
+    prologue_ns = _flatten(prologue_ops, 0, interval_ns, resolve, prologue_events)
+
+    loop_events: list = []
+    period_ns = _flatten(loop_ops, 0, interval_ns, resolve, loop_events)
+    if period_ns <= 0:
+        raise SequenceError("The repeated part of a sequence must contain a wait")
+    if not loop_events:
+        raise SequenceError("The repeated part of a sequence has no key events")
+
+    keys = tuple(dict.fromkeys(
+        [key for _, _, key in prologue_events] + [key for _, _, key in loop_events]
+    ))
+    steps = tuple((1 if is_press else 0, key, offset) for offset, is_press, key in loop_events)
+    return CompiledSequence(
+        steps=steps,
+        frames=_group_frames(loop_events),
+        prologue=_group_frames(prologue_events),
+        prologue_ns=prologue_ns,
+        period_ns=period_ns,
+        hold_keys=tuple(hold_keys),
+        keys=keys,
+    )
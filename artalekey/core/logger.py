@@ -1,8 +1,9 @@
 import logging
 import os
 import time
+import threading
 from functools import wraps
-from typing import Any, Callable
+from typing import Any, Callable, Dict
 from PyQt6.QtCore import QObject, pyqtSignal
 
 class PerformanceLogger:
@@ -35,6 +36,10 @@ class PerformanceLogger:
             
             self.logger.addHandler(console_handler)
             self.logger.addHandler(file_handler)
+        
+        # 计数器（缓存命中率等），只在内存中累计
+        self._counters: Dict[str, int] = {}
+        self._counter_lock = threading.Lock()
     
     def measure_time(self, func_name: str = None):
         """性能测量装饰器"""
@@ -79,6 +84,23 @@ class PerformanceLogger:
         except ImportError:
             self.logger.debug("psutil not available for memory monitoring")
     
+    def increment(self, name: str, amount: int = 1):
+        """累加计数器"""
+        with self._counter_lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+    
+    def get_counters(self, prefix: str = "") -> Dict[str, int]:
+        """获取计数器快照，可按名称前缀过滤"""
+        with self._counter_lock:
+            return {name: value for name, value in self._counters.items()
+                    if name.startswith(prefix)}
+    
+    def reset_counters(self, prefix: str = ""):
+        """清零计数器"""
+        with self._counter_lock:
+            for name in [name for name in self._counters if name.startswith(prefix)]:
+                del self._counters[name]
+    
     def info(self, message: str):
         """信息日志"""
         self.logger.info(message)
@@ -0,0 +1,172 @@
+import os
+import sys
+import threading
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+def _list_proc_pids() -> Iterable[int]:
+    """列出/proc下的所有PID"""
+    return [int(entry) for entry in os.listdir('/proc') if entry.isdigit()]
+
+def _read_proc_name(pid: int) -> Optional[str]:
+    """读取/proc/<pid>/comm，名称被截断（15字节）时交给psutil补全"""
+    try:
+        with open(f'/proc/{pid}/comm', 'rb') as f:
+            name = f.read().rstrip(b'\n').decode('utf-8', 'replace')
+    except OSError:
+        return None
+    if len(name) >= 15:
+        return _read_psutil_name(pid) or name
+    return name
+
+def _read_proc_identity(pid: int) -> Optional[Tuple[int, bytes]]:
+    """读取/proc/<pid>/stat中的 (启动时间, comm)，进程已退出时返回None
+
+    PID被复用时启动时间不同，进程exec时comm改变，两者都会让名称重新读取。
+    """
+    try:
+        with open(f'/proc/{pid}/stat', 'rb') as f:
+            stat = f.read()
+        # 进程名可能包含空格和括号，从最后一个')'之后开始计数，第22个字段为starttime
+        end = stat.rindex(b')')
+        return int(stat[end + 2:].split()[19]), stat[stat.index(b'(') + 1:end]
+    except (OSError, IndexError, ValueError):
+        return None
+
+def _list_psutil_pids() -> Iterable[int]:
+    import psutil
+    return psutil.pids()
+
+def _read_psutil_name(pid: int) -> Optional[str]:
+    import psutil
+    try:
+        return psutil.Process(pid).name()
+    except psutil.Error:
+        return None
+
+def _read_psutil_identity(pid: int) -> Optional[Tuple[float, str]]:
+    import psutil
+    try:
+        process = psutil.Process(pid)
+        return process.create_time(), process.name()
+    except psutil.Error:
+        return None
+
+class ProcessIndex:
+    """增量进程索引 - 维护 PID→名称 映射和去重排序后的名称快照
+
+    每次刷新对每个PID读取一次进程标识（Linux下为/proc/<pid>/stat中的启动时间和comm），
+    标识与上次相同时沿用已有名称，新出现的PID、被复用的PID和exec后的进程才重新读取名称；
+    消失的PID按引用计数移除。名称集合变化时用二分插入/删除维护有序列表，
+    没有变化时直接返回缓存快照。list_pids / read_name / read_identity 可以注入，
+    便于在大进程表上测试；只注入 read_name 时以名称本身作为标识。
+    """
+
+    def __init__(self, list_pids: Optional[Callable[[], Iterable[int]]] = None,
+                 read_name: Optional[Callable[[int], Optional[str]]] = None,
+                 read_identity: Optional[Callable[[int], Optional[Hashable]]] = None):
+        if read_identity is None and read_name is not None:
+            read_identity = read_name
+        if list_pids is None or read_name is None or read_identity is None:
+            use_proc = sys.platform.startswith('linux') and os.path.isdir('/proc')
+            list_pids = list_pids or (_list_proc_pids if use_proc else _list_psutil_pids)
+            read_name = read_name or (_read_proc_name if use_proc else _read_psutil_name)
+            read_identity = read_identity or (
+                _read_proc_identity if use_proc else _read_psutil_identity)
+        self._list_pids = list_pids
+        self._read_name = read_name
+        self._read_identity = read_identity
+        self._lock = threading.Lock()
+        self._names: Dict[int, Optional[str]] = {}   # PID -> 名称（读取失败为None）
+        self._identities: Dict[int, Hashable] = {}   # PID -> 读取名称时的进程标识
+        self._refcounts: Dict[str, int] = {}         # 名称 -> 进程数
+        self._sorted: List[str] = []
+        self._snapshot: Tuple[str, ...] = ()
+
+        # 统计信息
+        self._scans = 0
+        self._reads = 0
+        self._added = 0
+        self._removed = 0
+        self._replaced = 0
+
+    def refresh(self) -> bool:
+        """重新扫描PID集合，返回名称集合是否发生变化"""
+        pids = set(self._list_pids())
+        with self._lock:
+            self._scans += 1
+            names = self._names
+            identities = self._identities
+            removed = names.keys() - pids
+            changed = False
+
+            for pid in removed:
+                changed |= self._forget(pid)
+            for pid in pids:
+                identity = self._read_identity(pid)
+                known = pid in names
+                if known and identities[pid] == identity:
+                    continue
+                if known:
+                    # PID被复用或进程exec：旧名称作废
+                    changed |= self._forget(pid)
+                    self._replaced += 1
+                if identity is None:
+                    continue  # 枚举后已退出
+                name = self._read_name(pid)
+                self._reads += 1
+                names[pid] = name
+                identities[pid] = identity
+                self._added += not known
+                if name:
+                    changed |= self._retain_name(name)
+
+            self._removed += len(removed)
+            if changed:
+                self._snapshot = tuple(self._sorted)
+            return changed
+
+    def _forget(self, pid: int) -> bool:
+        """移除PID的记录，返回名称集合是否变化"""
+        del self._identities[pid]
+        name = self._names.pop(pid)
+        return self._release_name(name) if name else False
+
+    def _retain_name(self, name: str) -> bool:
+        count = self._refcounts.get(name, 0)
+        self._refcounts[name] = count + 1
+        if count == 0:
+            insort(self._sorted, name)
+            return True
+        return False
+
+    def _release_name(self, name: str) -> bool:
+        count = self._refcounts[name] - 1
+        if count:
+            self._refcounts[name] = count
+            return False
+        del self._refcounts[name]
+        del self._sorted[bisect_left(self._sorted, name)]
+        return True
+
+    def snapshot(self) -> Tuple[str, ...]:
+        """去重排序后的进程名称（不可变，名称未变化时返回同一对象）"""
+        return self._snapshot
+
+    def get_names(self) -> Dict[int, Optional[str]]:
+        """PID→名称 映射的副本"""
+        with self._lock:
+            return dict(self._names)
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取索引统计"""
+        with self._lock:
+            return {
+                'processes': len(self._names),
+                'names': len(self._sorted),
+                'scans': self._scans,
+                'reads': self._reads,
+                'added': self._added,
+                'removed': self._removed,
+                'replaced': self._replaced,
+            }
@@ -0,0 +1,218 @@
+import re
+from bisect import bisect_left, bisect_right
+from itertools import compress
+from typing import Dict, Iterable, List, Optional, Pattern, Set, Tuple
+
+# 拼接小写名称时使用的分隔符，模糊匹配不会跨过它
+_SEPARATOR = '\0'
+
+def _trigrams(text: str) -> Set[str]:
+    """文本中所有长度为3的片段"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def _prefix_end(prefix: str) -> str:
+    """大于所有以prefix开头的字符串的最小上界"""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+def _fuzzy_pattern(query: str, max_gap: Optional[int]) -> Pattern:
+    """按顺序匹配查询中每个字符的正则，相邻字符之间最多间隔 max_gap 个字符（None不限）"""
+    gap = f'[^{_SEPARATOR}]' + ('*?' if max_gap is None else f'{{0,{max_gap}}}?')
+    return re.compile(gap.join(map(re.escape, query)))
+
+class AppSearchIndex:
+    """应用名称搜索索引 - 名称预先小写化并保持有序，三个字符以上的查询使用三字符片段倒排索引
+
+    名称列表变化时只对新增/消失的名称更新索引，有序列表用二分插入/删除维护。
+    逐键输入时查询以上一次查询开头，只在上一次的匹配中筛选；无法沿用时，
+    短查询扫描预先小写化的名称，更长的查询通过片段集合求交得到候选。
+    结果按 完全匹配 > 前缀 > 子串 排序，没有任何子串匹配时才补充最多
+    FUZZY_LIMIT 个模糊匹配（按顺序包含所有字符），在拼接后的名称上按间隔由小到大逐层查找。
+    """
+
+    # 模糊匹配最多返回的数量
+    FUZZY_LIMIT = 20
+    # 模糊匹配逐层放宽的相邻字符最大间隔，None表示不限
+    FUZZY_GAPS = (1, 3, 8, None)
+    # 一次变化超过这个数量时整体重新排序，比逐个二分插入快
+    REBUILD_THRESHOLD = 256
+
+    def __init__(self, names: Iterable[str] = ()):
+        self._lower: Dict[str, str] = {}          # 名称 -> 小写名称
+        self._trigrams: Dict[str, Set[str]] = {}  # 三字符片段 -> 名称集合
+        self._keys: List[Tuple[str, str]] = []    # 有序的 (小写名称, 名称)
+        self._sorted: List[str] = []              # 与 _keys 对应的名称
+        self._sorted_lower: List[str] = []        # 与 _keys 对应的小写名称
+        self._text: Optional[str] = None          # 拼接的小写名称，按需重建
+        # 上一次查询: (查询, 匹配的名称, 对应的小写名称)，名称变化时清空
+        self._last: Optional[Tuple[str, List[str], List[str]]] = None
+        self.set_names(names)
+
+    def __len__(self) -> int:
+        return len(self._lower)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._lower
+
+    def names(self) -> List[str]:
+        """按名称排序（不区分大小写）的全部名称"""
+        return self._sorted
+
+    def set_names(self, names: Iterable[str]) -> bool:
+        """把索引更新为给定的名称集合，只处理差异，返回是否有变化"""
+        names = set(names)
+        current = self._lower.keys()
+        removed = current - names
+        added = names - current
+        if len(removed) + len(added) > self.REBUILD_THRESHOLD:
+            for name in removed:
+                self._unindex(name)
+            for name in added:
+                self._index(name)
+            self._rebuild_order()
+        else:
+            for name in removed:
+                self.remove(name)
+            for name in added:
+                self.add(name)
+        return bool(removed or added)
+
+    def add(self, name: str):
+        """添加名称"""
+        if name in self._lower:
+            return
+        lower = self._index(name)
+        key = (lower, name)
+        i = bisect_left(self._keys, key)
+        self._keys.insert(i, key)
+        self._sorted.insert(i, name)
+        self._sorted_lower.insert(i, lower)
+        self._changed()
+
+    def remove(self, name: str):
+        """移除名称"""
+        lower = self._unindex(name)
+        if lower is None:
+            return
+        i = bisect_left(self._keys, (lower, name))
+        del self._keys[i]
+        del self._sorted[i]
+        del self._sorted_lower[i]
+        self._changed()
+
+    def _changed(self):
+        """名称变化后丢弃查询缓存和拼接文本"""
+        self._text = None
+        self._last = None
+
+    def _index(self, name: str) -> str:
+        """把名称加入倒排索引，返回小写名称"""
+        lower = name.lower()
+        self._lower[name] = lower
+        index = self._trigrams
+        for key in _trigrams(lower):
+            bucket = index.get(key)
+            if bucket is None:
+                index[key] = {name}
+            else:
+                bucket.add(name)
+        return lower
+
+    def _unindex(self, name: str) -> Optional[str]:
+        """把名称移出倒排索引，返回小写名称（不存在时返回None）"""
+        lower = self._lower.pop(name, None)
+        if lower is None:
+            return None
+        index = self._trigrams
+        for key in _trigrams(lower):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.discard(name)
+                if not bucket:
+                    del index[key]
+        return lower
+
+    def _rebuild_order(self):
+        self._keys = sorted((lower, name) for name, lower in self._lower.items())
+        self._sorted = [name for _, name in self._keys]
+        self._sorted_lower = [lower for lower, _ in self._keys]
+        self._changed()
+
+    def _intersect(self, keys: Iterable[str]) -> Set[str]:
+        """包含所有片段的名称集合，从最小的集合开始求交"""
+        buckets = []
+        for key in keys:
+            bucket = self._trigrams.get(key)
+            if not bucket:
+                return set()
+            buckets.append(bucket)
+        buckets.sort(key=len)
+        result = set(buckets[0])
+        for bucket in buckets[1:]:
+            result &= bucket
+            if not result:
+                break
+        return result
+
+    def _substring_matches(self, query: str) -> Tuple[List[str], List[str]]:
+        """包含查询的名称及其小写名称，按名称顺序排列"""
+        last = self._last
+        if last is not None and query.startswith(last[0]):
+            names, texts = last[1], last[2]  # 逐键输入：只在上一次的匹配中筛选
+        elif len(query) < 3:
+            names, texts = self._sorted, self._sorted_lower
+        else:
+            lower = self._lower
+            keys = sorted((lower[name], name) for name in self._intersect(_trigrams(query)))
+            return [name for _, name in keys], [text for text, _ in keys]
+        mask = [query in text for text in texts]
+        return list(compress(names, mask)), list(compress(texts, mask))
+
+    def _joined_text(self) -> str:
+        """按名称顺序拼接的小写名称"""
+        text = self._text
+        if text is None:
+            text = self._text = _SEPARATOR.join(self._sorted_lower)
+        return text
+
+    def _fuzzy_matches(self, query: str) -> List[str]:
+        """按顺序包含所有查询字符的名称，相邻字符间隔越小越靠前，同一层按名称顺序"""
+        text = self._joined_text()
+        texts = self._sorted_lower
+        found: Dict[int, None] = {}
+        for max_gap in self.FUZZY_GAPS:
+            for match in _fuzzy_pattern(query, max_gap).finditer(text):
+                # 匹配所在的名称，小写后相同的名称一起加入
+                start = text.rfind(_SEPARATOR, 0, match.start()) + 1
+                end = text.find(_SEPARATOR, match.end())
+                line = text[start:end] if end >= 0 else text[start:]
+                lo = bisect_left(texts, line)
+                for i in range(lo, bisect_right(texts, line, lo)):
+                    found.setdefault(i)
+                if len(found) >= self.FUZZY_LIMIT:
+                    break
+            if len(found) >= self.FUZZY_LIMIT:
+                break
+        names = self._sorted
+        return [names[i] for i in found][:self.FUZZY_LIMIT]
+
+    def search(self, query: str, limit: Optional[int] = None, fuzzy: bool = True) -> List[str]:
+        """按相关度排序的匹配名称，空查询返回全部名称"""
+        query = query.strip().lower()
+        if not query:
+            names = self._sorted
+            return names[:limit] if limit is not None else list(names)
+
+        names, texts = self._substring_matches(query)
+        self._last = (query, names, texts)
+
+        # 以查询开头的名称在有序的匹配中是连续区间，完全匹配位于区间开头
+        lo = bisect_left(texts, query)
+        hi = bisect_left(texts, _prefix_end(query), lo)
+        results = names[lo:hi]
+        if limit is None or len(results) < limit:
+            results += names[:lo] + names[hi:]
+
+        if fuzzy and not results:
+            results = self._fuzzy_matches(query)
+
+        return results[:limit] if limit is not None else results
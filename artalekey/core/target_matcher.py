@@ -0,0 +1,89 @@
+import re
+from fnmatch import translate
+from typing import Dict, FrozenSet, Iterable, Optional, Pattern, Tuple
+from artalekey.core.logger import performance_logger
+
+GLOB_CHARS = frozenset('*?[')
+REGEX_PREFIX = 're:'
+# 开头的全局内联标志，如 (?i)、(?s)；合并为一个正则时必须改写为局部标志
+_LEADING_FLAGS = re.compile(r'^\(\?([aiLmsux]+)\)')
+
+def _wrap_regex(source: str) -> str:
+    """把用户正则包装为可以用 | 合并的分组，开头的内联标志改写为局部标志"""
+    match = _LEADING_FLAGS.match(source)
+    if match:
+        return f'(?{match.group(1)}:{source[match.end():]})'
+    return f'(?:{source})'
+
+def base_name(name: str) -> str:
+    """去掉 .exe/.app 扩展名后的小写名称"""
+    return name.lower().replace('.exe', '').replace('.app', '')
+
+class TargetMatcher:
+    """预编译的目标进程匹配器 - 创建后不可修改，目标变化时整体替换
+
+    支持的写法:
+        MapleStory Worlds     名称完全匹配（不区分大小写，忽略 .exe/.app）
+        Maple*                通配符，匹配整个名称
+        re:^maple.*worlds$    正则表达式，在名称中搜索（不区分大小写）
+    所有通配符和正则合并为一个正则；每个进程名的结果会被缓存，
+    轮询时同一个进程只需一次字典查找。
+    """
+
+    MEMO_SIZE = 1024
+
+    __slots__ = ('patterns', '_bases', '_regex', '_regexes', '_memo')
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        self.patterns: Tuple[str, ...] = tuple(
+            dict.fromkeys(p.strip() for p in patterns if p and p.strip()))
+        bases = set()
+        parts = []
+        for pattern in self.patterns:
+            if pattern.lower().startswith(REGEX_PREFIX):
+                source = pattern[len(REGEX_PREFIX):]
+                part = _wrap_regex(source)
+                try:
+                    re.compile(part, re.IGNORECASE)  # 检查实际参与合并的写法
+                except re.error as e:
+                    performance_logger.warning(f"Invalid target regex {source!r}: {e}")
+                    continue
+                parts.append(part)
+            elif GLOB_CHARS.intersection(pattern):
+                parts.append('^' + translate(pattern.lower()))
+            else:
+                bases.add(base_name(pattern))
+        self._bases: FrozenSet[str] = frozenset(bases)
+        self._regex = None
+        self._regexes: Tuple[Pattern, ...] = ()
+        if parts:
+            try:
+                self._regex = re.compile('|'.join(parts), re.IGNORECASE)
+            except re.error as e:
+                # 单独有效但无法合并（如分组名重复）时逐个匹配
+                performance_logger.warning(f"Target regexes matched separately: {e}")
+                self._regexes = tuple(re.compile(part, re.IGNORECASE) for part in parts)
+        self._memo: Dict[str, bool] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self._bases or self._regex or self._regexes)
+
+    def matches(self, process_name: Optional[str]) -> bool:
+        """进程名是否匹配任一目标"""
+        if not process_name:
+            return False
+        result = self._memo.get(process_name)
+        if result is None:
+            result = self._match(process_name)
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo.clear()
+            self._memo[process_name] = result
+        return result
+
+    def _match(self, process_name: str) -> bool:
+        if base_name(process_name) in self._bases:
+            return True
+        lower = process_name.lower()
+        if self._regex is not None:
+            return self._regex.search(lower) is not None
+        return any(regex.search(lower) for regex in self._regexes)
@@ -0,0 +1,149 @@
+import time
+import threading
+from typing import Callable, Dict, Optional
+from artalekey.core.logger import performance_logger
+
+class TimerHandle:
+    """时间轮定时器句柄"""
+
+    __slots__ = ('callback', 'args', 'slot', 'rounds', 'cancelled', '_wheel')
+
+    def __init__(self, wheel: 'TimerWheel', callback: Callable, args: tuple):
+        self.callback = callback
+        self.args = args
+        self.slot: Optional[int] = None
+        self.rounds = 0
+        self.cancelled = False
+        self._wheel = wheel
+
+    def cancel(self):
+        """取消定时器 - O(1)"""
+        self._wheel.cancel(self)
+
+class TimerWheel:
+    """哈希时间轮 - 用单个调度线程服务所有长按/保持超时
+
+    替代每次按下都新建一个 threading.Timer 线程的做法。
+    定时器按到期tick散列到槽位中，添加和取消都是O(1)的集合操作；
+    没有待触发的定时器时调度线程无限期挂起，空闲时不会被唤醒。
+    回调在调度线程上执行，应当尽快返回。
+    """
+
+    def __init__(self, tick_ms: float = 5.0, slots: int = 512):
+        self._tick_ns = int(tick_ms * 1_000_000)
+        self._slot_count = slots
+        self._slots = [set() for _ in range(slots)]
+        self._cond = threading.Condition()
+        self._origin_ns = time.perf_counter_ns()
+        self._current_tick = 0  # 已处理到的tick
+        self._pending = 0
+        self._thread: Optional[threading.Thread] = None
+
+        # 统计信息
+        self._scheduled = 0
+        self._cancelled = 0
+        self._fired = 0
+        self._wakeups = 0
+        self._threads_started = 0
+
+    def _now_tick(self) -> int:
+        return (time.perf_counter_ns() - self._origin_ns) // self._tick_ns
+
+    def schedule(self, delay_sec: float, callback: Callable, *args) -> TimerHandle:
+        """在delay_sec秒后于调度线程上调用callback(*args)"""
+        handle = TimerHandle(self, callback, args)
+        delay_ns = max(0, int(delay_sec * 1e9))
+
+        with self._cond:
+            if self._thread is None:
+                self._start_thread()
+            if self._pending == 0:
+                # 空闲期间没有推进tick，直接快进到当前时刻
+                self._current_tick = self._now_tick()
+
+            elapsed_ns = time.perf_counter_ns() - self._origin_ns
+            target_tick = -(-(elapsed_ns + delay_ns) // self._tick_ns)  # 向上取整
+            target_tick = max(self._current_tick + 1, target_tick)
+            handle.slot = target_tick % self._slot_count
+            handle.rounds = (target_tick - self._current_tick - 1) // self._slot_count
+            self._slots[handle.slot].add(handle)
+            self._pending += 1
+            self._scheduled += 1
+            self._cond.notify()
+
+        return handle
+
+    def cancel(self, handle: TimerHandle):
+        """取消定时器"""
+        with self._cond:
+            if handle.cancelled:
+                return
+            handle.cancelled = True
+            if handle.slot is not None and handle in self._slots[handle.slot]:
+                self._slots[handle.slot].discard(handle)
+                self._pending -= 1
+                self._cancelled += 1
+            handle.slot = None
+
+    def _start_thread(self):
+        self._thread = threading.Thread(target=self._run, name="TimerWheel", daemon=True)
+        self._threads_started += 1
+        self._thread.start()
+
+    def _run(self):
+        """调度线程主循环"""
+        cond = self._cond
+        while True:
+            with cond:
+                while self._pending == 0:
+                    cond.wait()  # 无定时器时无限期挂起
+
+                next_tick_ns = self._origin_ns + (self._current_tick + 1) * self._tick_ns
+                remaining = next_tick_ns - time.perf_counter_ns()
+                if remaining > 0:
+                    cond.wait(remaining / 1e9)
+                    self._wakeups += 1
+                    continue
+
+                due = []
+                now_tick = self._now_tick()
+                while self._current_tick < now_tick and self._pending:
+                    self._current_tick += 1
+                    bucket = self._slots[self._current_tick % self._slot_count]
+                    if not bucket:
+                        continue
+                    for handle in list(bucket):
+                        if handle.rounds > 0:
+                            handle.rounds -= 1
+                        else:
+                            bucket.discard(handle)
+                            handle.slot = None
+                            due.append(handle)
+                            self._pending -= 1
+                if not self._pending:
+                    self._current_tick = now_tick
+
+            for handle in due:
+                if handle.cancelled:
+                    continue
+                handle.cancelled = True  # 标记为已完成，之后的cancel为空操作
+                self._fired += 1
+                try:
+                    handle.callback(*handle.args)
+                except Exception as e:
+                    performance_logger.error(f"Timer callback error: {e}")
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取调度统计"""
+        with self._cond:
+            return {
+                'pending': self._pending,
+                'scheduled': self._scheduled,
+                'cancelled': self._cancelled,
+                'fired': self._fired,
+                'wakeups': self._wakeups,
+                'threads_started': self._threads_started,
+            }
+
+# 全局时间轮实例
+timer_wheel = TimerWheel()
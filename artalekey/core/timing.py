@@ -0,0 +1,306 @@
+import time
+import threading
+from collections import deque
+from enum import Enum
+from typing import Optional, Dict, List, Tuple
+
+class CatchUpPolicy(Enum):
+    """落后于时间线时的处理策略"""
+    SKIP = "skip"          # 跳过已错过的周期，对齐到下一个节拍
+    CATCH_UP = "catch_up"  # 连续补发落后的周期，直到追上时间线
+
+class SleepWaiter:
+    """基于Event.wait的等待器 - 等待到绝对截止时间"""
+
+    def __init__(self, stop_event: threading.Event):
+        self._stop_event = stop_event
+
+    def wait_until(self, deadline_ns: int) -> bool:
+        """等待到截止时间，返回True表示收到停止信号"""
+        remaining = deadline_ns - time.perf_counter_ns()
+        if remaining <= 0:
+            return self._stop_event.is_set()
+        return self._stop_event.wait(remaining / 1e9)
+
+class HybridWaiter:
+    """高精度等待器 - 先粗睡眠到截止时间前的保护窗口，再忙等待到截止时间
+
+    CPU预算按每次等待计算：忙等待窗口不超过本次等待时长的 cpu_budget 比例
+    （也不超过 guard_ms），短间隔下每次等待仍以忙等待结束，
+    而持续运行时忙等待占用的CPU不会超过预算。
+    """
+
+    def __init__(self, stop_event: threading.Event, guard_ms: float = 2.0,
+                 cpu_budget: float = 0.4):
+        self._stop_event = stop_event
+        self._guard_ns = int(max(0.0, guard_ms) * 1_000_000)
+        self._cpu_budget = max(0.0, min(1.0, cpu_budget))  # 忙等待占每次等待时长的最大比例
+        self._started_ns = time.perf_counter_ns()
+        self._spin_ns = 0
+        self._spins = 0
+        self._budget_limited = 0
+        self._overslept = 0
+
+    def reset(self):
+        """重置忙等待统计"""
+        self._started_ns = time.perf_counter_ns()
+        self._spin_ns = 0
+        self._spins = 0
+        self._budget_limited = 0
+        self._overslept = 0
+
+    def wait_until(self, deadline_ns: int) -> bool:
+        """等待到截止时间，返回True表示收到停止信号"""
+        now = time.perf_counter_ns()
+        remaining = deadline_ns - now
+        if remaining <= 0:
+            return self._stop_event.is_set()
+
+        # 本次等待的忙等待窗口 - 受保护窗口和CPU预算共同限制
+        guard_ns = int(remaining * self._cpu_budget)
+        if guard_ns < self._guard_ns:
+            self._budget_limited += 1
+        else:
+            guard_ns = self._guard_ns
+
+        # 粗睡眠阶段 - 醒来时留出忙等待窗口吸收系统唤醒延迟
+        if remaining > guard_ns:
+            if self._stop_event.wait((remaining - guard_ns) / 1e9):
+                return True
+            now = time.perf_counter_ns()
+            if now >= deadline_ns:
+                self._overslept += 1
+                return self._stop_event.is_set()
+
+        # 忙等待阶段
+        clock = time.perf_counter_ns
+        is_set = self._stop_event.is_set
+        self._spins += 1
+        while clock() < deadline_ns:
+            if is_set():
+                self._spin_ns += clock() - now
+                return True
+        self._spin_ns += clock() - now
+        return False
+
+    def get_stats(self) -> Dict[str, float]:
+        """获取忙等待统计"""
+        elapsed = time.perf_counter_ns() - self._started_ns
+        return {
+            'spins': self._spins,
+            'spin_ms': self._spin_ns / 1e6,
+            'spin_ratio': (self._spin_ns / elapsed) if elapsed > 0 else 0.0,
+            'budget_limited': self._budget_limited,
+            'overslept': self._overslept,
+        }
+
+class DeadlineScheduler:
+    """绝对时间线调度器 - 每个事件都对齐到单调时钟上的固定截止时间，避免误差累积"""
+
+    def __init__(self, period_ns: int, policy: CatchUpPolicy = CatchUpPolicy.SKIP,
+                 max_catch_up: int = 3, history_size: int = 256, skip_tolerance: float = 0.25):
+        self._period_ns = max(1, int(period_ns))
+        self._policy = policy
+        self._max_catch_up = max(0, max_catch_up)  # 补发模式下最多落后的周期数
+        # 跳过模式下容忍的延迟（周期的比例），以内视为计时抖动照常触发
+        self._skip_tolerance_ns = int(self._period_ns * max(0.0, min(1.0, skip_tolerance)))
+        self._cycle_start_ns = 0
+        self._cycle_lateness_ns = 0
+        self._lock = threading.Lock()
+
+        # 统计信息 - 每周期只在周期结束时更新一次
+        self._lateness_history = deque(maxlen=history_size)
+        self._cycles = 0
+        self._skipped_cycles = 0
+        self._total_lateness_ns = 0
+        self._max_lateness_ns = 0
+
+    @property
+    def period_ns(self) -> int:
+        return self._period_ns
+
+    @property
+    def cycle_start_ns(self) -> int:
+        return self._cycle_start_ns
+
+    def reset(self, start_ns: Optional[int] = None):
+        """以给定时刻（默认当前时刻）作为时间线起点"""
+        self._cycle_start_ns = time.perf_counter_ns() if start_ns is None else start_ns
+        self._cycle_lateness_ns = 0
+
+    def deadline(self, offset_ns: int) -> int:
+        """当前周期内某个偏移量对应的绝对截止时间"""
+        return self._cycle_start_ns + offset_ns
+
+    def record_lateness(self, lateness_ns: int):
+        """记录一次事件的延迟（实际触发时刻 - 截止时间）"""
+        if lateness_ns > self._cycle_lateness_ns:
+            self._cycle_lateness_ns = lateness_ns
+
+    def next_cycle(self, now_ns: Optional[int] = None):
+        """结束当前周期并根据策略推进到下一个周期"""
+        if now_ns is None:
+            now_ns = time.perf_counter_ns()
+
+        lateness = self._cycle_lateness_ns
+        next_start = self._cycle_start_ns + self._period_ns
+        behind = now_ns - next_start
+        skipped = 0
+
+        if behind > 0:
+            missed = behind // self._period_ns
+            if self._policy == CatchUpPolicy.SKIP:
+                # 超出容差时对齐到不早于当前时刻的下一个节拍，而不是在节拍之间立即触发
+                if behind > self._skip_tolerance_ns:
+                    skipped = -(-behind // self._period_ns)
+            elif missed > self._max_catch_up:
+                # 落后太多时补发已无意义，重新对齐时间线
+                skipped = missed - self._max_catch_up
+            next_start += skipped * self._period_ns
+
+        with self._lock:
+            self._cycles += 1
+            self._skipped_cycles += skipped
+            self._total_lateness_ns += lateness
+            if lateness > self._max_lateness_ns:
+                self._max_lateness_ns = lateness
+            self._lateness_history.append(lateness)
+
+        self._cycle_start_ns = next_start
+        self._cycle_lateness_ns = 0
+
+    def get_lateness_history(self) -> List[float]:
+        """获取最近各周期的最大延迟（毫秒）"""
+        with self._lock:
+            return [lateness / 1e6 for lateness in self._lateness_history]
+
+    def get_stats(self) -> Dict[str, float]:
+        """获取调度统计信息"""
+        with self._lock:
+            cycles = self._cycles
+            return {
+                'cycles': cycles,
+                'skipped_cycles': self._skipped_cycles,
+                'period_ms': self._period_ns / 1e6,
+                'mean_lateness_ms': (self._total_lateness_ns / cycles / 1e6) if cycles else 0.0,
+                'max_lateness_ms': self._max_lateness_ns / 1e6,
+                'last_lateness_ms': ((self._lateness_history[-1] / 1e6)
+                                     if self._lateness_history else 0.0),
+            }
+
+class AdaptivePollingPolicy:
+    """自适应轮询间隔 - 检测到变化或有键盘活动后快速轮询，稳定期间按倍数退避到最长间隔
+
+    wait() 基于Event.wait，notify_activity() 会把正在退避的等待立即唤醒并恢复最短间隔。
+    统计每分钟唤醒次数和检测延迟上限（检测到变化的那次轮询与上一次轮询的间隔），
+    用于调整CPU占用与响应速度之间的取舍。
+    """
+
+    def __init__(self, min_interval: float = 0.1, max_interval: float = 2.0,
+                 backoff: float = 1.5, fast_polls: int = 5):
+        self._lock = threading.Lock()
+        self._event = threading.Event()
+        self._min_interval = max(0.01, min_interval)
+        self._max_interval = max(self._min_interval, max_interval)
+        self._backoff = max(1.0, backoff)
+        self._fast_polls = max(0, fast_polls)   # 变化后保持最短间隔的轮询次数
+        self._interval = self._min_interval
+        self._fast_remaining = self._fast_polls
+
+        # 统计信息
+        self._started = time.monotonic()
+        self._last_poll: Optional[float] = None
+        self._poll_times = deque(maxlen=4096)      # 最近的轮询时间，用于计算每分钟唤醒次数
+        self._latencies = deque(maxlen=100)        # 最近的检测延迟上限（秒）
+        self._polls = 0
+        self._changes = 0
+        self._activity = 0
+        self._early_wakeups = 0
+
+    @property
+    def interval(self) -> float:
+        """下一次等待的间隔（秒）"""
+        return self._interval
+
+    def set_limits(self, min_interval: float, max_interval: float):
+        """设置最短/最长间隔（秒）"""
+        min_interval = max(0.01, min_interval)
+        with self._lock:
+            self._min_interval = min_interval
+            self._max_interval = max(min_interval, max_interval)
+            self._interval = min(max(self._interval, min_interval), self._max_interval)
+
+    def get_limits(self) -> Tuple[float, float]:
+        """(最短间隔, 最长间隔)"""
+        return self._min_interval, self._max_interval
+
+    def record_poll(self, changed: bool, now: Optional[float] = None):
+        """记录一次轮询结果，计算下一次间隔"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._polls += 1
+            self._poll_times.append(now)
+            if changed:
+                self._changes += 1
+                if self._last_poll is not None:
+                    self._latencies.append(now - self._last_poll)
+                self._interval = self._min_interval
+                self._fast_remaining = self._fast_polls
+            elif self._fast_remaining > 0:
+                self._fast_remaining -= 1
+            else:
+                self._interval = min(self._max_interval, self._interval * self._backoff)
+            self._last_poll = now
+
+    def notify_activity(self):
+        """有用户活动 - 恢复最短间隔，正在退避的等待立即醒来"""
+        with self._lock:
+            self._activity += 1
+            backed_off = self._interval > self._min_interval
+            self._interval = self._min_interval
+            self._fast_remaining = self._fast_polls
+        if backed_off:
+            self._event.set()
+
+    def wake(self):
+        """立即唤醒等待（用于停止）"""
+        self._event.set()
+
+    def wait(self) -> bool:
+        """等待当前间隔，返回True表示被提前唤醒"""
+        woken = self._event.wait(self._interval)
+        if woken:
+            self._event.clear()
+            with self._lock:
+                self._early_wakeups += 1
+        return woken
+
+    def reset(self, now: Optional[float] = None):
+        """恢复最短间隔并清空统计"""
+        with self._lock:
+            self._interval = self._min_interval
+            self._fast_remaining = self._fast_polls
+            self._started = time.monotonic() if now is None else now
+            self._last_poll = None
+            self._poll_times.clear()
+            self._latencies.clear()
+            self._polls = self._changes = self._activity = self._early_wakeups = 0
+        self._event.clear()
+
+    def get_stats(self, now: Optional[float] = None) -> Dict[str, float]:
+        """获取轮询统计信息"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            window = min(60.0, now - self._started)
+            recent = sum(1 for t in self._poll_times if now - t <= 60.0)
+            latencies = self._latencies
+            return {
+                'polls': self._polls,
+                'changes': self._changes,
+                'activity': self._activity,
+                'early_wakeups': self._early_wakeups,
+                'interval_ms': self._interval * 1000,
+                'wakeups_per_minute': recent * 60.0 / window if window > 0 else 0.0,
+                'mean_latency_ms': (sum(latencies) / len(latencies) * 1000) if latencies else 0.0,
+                'max_latency_ms': max(latencies) * 1000 if latencies else 0.0,
+            }
@@ -3,18 +3,44 @@ import sys
 import time
 import threading
 from typing import Optional, Dict, List, Callable
-from collections import deque
+from collections import OrderedDict
 from PyQt6.QtCore import QThread, pyqtSignal
+from artalekey.core.helper_process import HelperProcess
 from artalekey.core.logger import performance_logger
+from artalekey.core.process_index import ProcessIndex
+from artalekey.core.target_matcher import TargetMatcher
+from artalekey.core.timing import AdaptivePollingPolicy
+from artalekey.core.window_history import HISTORY_PATH, WindowHistory
 
 class WindowInfo:
-    """窗口信息类"""
+    """窗口信息类 - 不可变，进程名被驻留并预先计算小写键
+
+    检测器在窗口没有变化时复用同一个实例，监控循环稳定时不再分配新对象。
+    """
+    
+    __slots__ = ('window_id', 'title', 'process_name', 'process_id', 'key', '_hash')
+    
     def __init__(self, window_id: int, title: str, process_name: str, process_id: int):
-        self.window_id = window_id
-        self.title = title
-        self.process_name = process_name
-        self.process_id = process_id
-        self.last_active_time = time.time()  # 添加最后活跃时间
+        process_name = sys.intern(str(process_name))  # str子类（如pyobjc_unicode）无法直接驻留
+        key = sys.intern(str(process_name.lower()))
+        setattr_ = object.__setattr__
+        setattr_(self, 'window_id', window_id)
+        setattr_(self, 'title', title)
+        setattr_(self, 'process_name', process_name)
+        setattr_(self, 'process_id', process_id)
+        setattr_(self, 'key', key)  # 小写进程名，用于比较和去重
+        setattr_(self, '_hash', hash(key))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("WindowInfo is immutable")
+    
+    def __delattr__(self, name):
+        raise AttributeError("WindowInfo is immutable")
+    
+    def same_as(self, window_id: int, title: str, process_name: str, process_id: int) -> bool:
+        """所有字段是否与给定值相同"""
+        return (self.window_id == window_id and self.process_id == process_id
+                and self.title == title and self.process_name == process_name)
     
     def __str__(self):
         return f"{self.process_name} - {self.title}"
@@ -26,17 +52,78 @@ class WindowInfo:
         """比较两个窗口信息是否相同（基于进程名）"""
         if not isinstance(other, WindowInfo):
             return False
-        return self.process_name.lower() == other.process_name.lower()
+        return self.key == other.key
     
     def __hash__(self):
         """用于在集合中使用"""
-        return hash(self.process_name.lower())
+        return self._hash
+
+class FocusSnapshot:
+    """焦点状态快照 - 不可变，监控线程整体替换引用，读取方无需加锁
+
+    version 每次窗口或目标状态变化时递增，timestamp 为发布时间（monotonic）。
+    """
+    
+    __slots__ = ('version', 'window', 'is_target', 'timestamp')
+    
+    def __init__(self, version: int = 0, window: Optional[WindowInfo] = None,
+                 is_target: bool = False, timestamp: Optional[float] = None):
+        setattr_ = object.__setattr__
+        setattr_(self, 'version', version)
+        setattr_(self, 'window', window)
+        setattr_(self, 'is_target', is_target)
+        setattr_(self, 'timestamp', time.monotonic() if timestamp is None else timestamp)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("FocusSnapshot is immutable")
+    
+    def __repr__(self):
+        return (f"FocusSnapshot(version={self.version}, window={self.window!r}, "
+                f"is_target={self.is_target})")
+
+# macOS备用方案的常驻JXA脚本：每收到一行 "frontmost" 回复一行 "进程名\t进程ID"，失败时回复空行
+MACOS_HELPER_SCRIPT = r'''
+ObjC.import('Foundation');
+var events = Application('System Events');
+var input = $.NSFileHandle.fileHandleWithStandardInput;
+var output = $.NSFileHandle.fileHandleWithStandardOutput;
+function reply(text) {
+    output.writeData($(text + '\n').dataUsingEncoding($.NSUTF8StringEncoding));
+}
+var buffer = '';
+while (true) {
+    var data = input.availableData;
+    if (data.length == 0) break;
+    buffer += $.NSString.alloc.initWithDataEncoding(data, $.NSUTF8StringEncoding).js;
+    var lines = buffer.split('\n');
+    buffer = lines.pop();
+    lines.forEach(function (line) {
+        if (line != 'frontmost') { reply(''); return; }
+        try {
+            var proc = events.applicationProcesses.whose({frontmost: true})[0];
+            reply(proc.name() + '\t' + proc.unixId());
+        } catch (e) {
+            reply('');
+        }
+    });
+}
+'''
 
 class WindowDetector:
     """跨平台窗口检测器"""
     
+    PROCESS_NAME_CACHE_SIZE = 256
+    
     def __init__(self):
         self.platform = sys.platform
+        # 进程名缓存: (pid, 进程启动时间) -> 名称，启动时间不同说明PID已被复用
+        self._name_cache: 'OrderedDict[tuple, str]' = OrderedDict()
+        self._name_lock = threading.Lock()
+        self._last_window_key: Optional[tuple] = None  # 上次检测的 (窗口id, pid)
+        self._last_process_name = "Unknown"
+        self._last_window: Optional[WindowInfo] = None
+        self._process_index = ProcessIndex()
+        self._macos_helper: Optional[HelperProcess] = None  # macOS备用方案的常驻osascript进程
         self._setup_platform_specific()
     
     def _setup_platform_specific(self):
@@ -72,6 +159,11 @@ class WindowDetector:
     
     def _setup_linux(self):
         """设置Linux检测"""
+        # 检测器生命周期内复用同一个X连接，原子只在连接时获取一次
+        self._display = None
+        self._root = None
+        self._atoms: Dict[str, int] = {}
+        self._x_lock = threading.Lock()
         try:
             import Xlib
             from Xlib import display
@@ -81,6 +173,110 @@ class WindowDetector:
             self._has_xlib = False
             performance_logger.warning("Xlib not available")
     
+    def _connect_x(self):
+        """建立X连接并缓存常用原子"""
+        from Xlib import display
+        
+        d = display.Display()
+        self._atoms = {
+            name: d.intern_atom(name)
+            for name in ('_NET_ACTIVE_WINDOW', '_NET_WM_NAME', '_NET_WM_PID')
+        }
+        self._root = d.screen().root
+        self._display = d
+        performance_logger.info("Linux X display connected")
+    
+    def _disconnect_x(self):
+        """关闭X连接，下次检测时重新连接"""
+        d, self._display, self._root = self._display, None, None
+        if d is not None:
+            try:
+                d.close()
+            except Exception:
+                pass
+    
+    def supports_fast_query(self) -> bool:
+        """是否可以在1毫秒量级内同步读取活动窗口（不需要启动子进程）"""
+        if self.platform == "darwin":
+            return self._has_appkit
+        if self.platform == "win32":
+            return self._has_win32
+        return self._has_xlib and bool(os.environ.get('DISPLAY'))
+    
+    def close(self):
+        """释放平台相关资源"""
+        if self._macos_helper is not None:
+            self._macos_helper.close()
+            self._macos_helper = None
+        if self.platform not in ("darwin", "win32"):
+            with self._x_lock:
+                self._disconnect_x()
+    
+    def get_process_name(self, process_id: int, window_id: int = 0) -> str:
+        """获取进程名称 - 带缓存
+        
+        同一窗口和PID连续出现时直接复用上次结果，不读取/proc；
+        否则按 (pid, 启动时间) 查询有界LRU缓存，未命中才读取进程名。
+        """
+        window_key = (window_id, process_id)
+        if window_id and window_key == self._last_window_key:
+            performance_logger.increment("process_name_cache.fast_hit")
+            return self._last_process_name
+        
+        import psutil
+        try:
+            cache_key = (process_id, self._process_start_time(process_id))
+        except (OSError, IndexError, ValueError, psutil.Error):
+            return "Unknown"
+        
+        with self._name_lock:
+            name = self._name_cache.get(cache_key)
+            if name is not None:
+                self._name_cache.move_to_end(cache_key)
+        
+        if name is None:
+            performance_logger.increment("process_name_cache.miss")
+            try:
+                name = psutil.Process(process_id).name()
+            except psutil.Error:
+                return "Unknown"
+            with self._name_lock:
+                self._name_cache[cache_key] = name
+                while len(self._name_cache) > self.PROCESS_NAME_CACHE_SIZE:
+                    self._name_cache.popitem(last=False)
+        else:
+            performance_logger.increment("process_name_cache.hit")
+        
+        self._last_window_key = window_key
+        self._last_process_name = name
+        return name
+    
+    def _process_start_time(self, process_id: int):
+        """进程启动时间 - Linux下直接读取/proc/<pid>/stat，比构造psutil.Process快得多"""
+        if self.platform.startswith("linux"):
+            with open(f"/proc/{process_id}/stat", "rb") as f:
+                stat = f.read()
+            # 进程名可能包含空格和括号，从最后一个')'之后开始计数，第22个字段为starttime
+            return int(stat[stat.rindex(b')') + 2:].split()[19])
+        import psutil
+        return psutil.Process(process_id).create_time()
+    
+    def _window_info(self, window_id: int, title: str, process_name: str,
+                     process_id: int) -> WindowInfo:
+        """创建窗口信息，与上次检测结果完全相同时直接复用上次的实例"""
+        last = self._last_window
+        if last is not None and last.same_as(window_id, title, process_name, process_id):
+            return last
+        window = WindowInfo(window_id, title, process_name, process_id)
+        self._last_window = window
+        return window
+    
+    def clear_process_name_cache(self):
+        """清空进程名缓存"""
+        with self._name_lock:
+            self._name_cache.clear()
+            self._last_window_key = None
+    
     @performance_logger.measure_time("get_active_window")
     def get_active_window(self) -> Optional[WindowInfo]:
         """获取当前活动窗口信息"""
@@ -114,7 +310,7 @@ class WindowDetector:
                 # 尝试获取窗口标题（简化实现）
                 window_title = process_name  # 在macOS上获取具体窗口标题比较复杂
                 
-                return WindowInfo(
+                return self._window_info(
                     window_id=0,  # macOS窗口ID获取复杂，暂时使用0
                     title=window_title,
                     process_name=process_name,
@@ -125,7 +321,25 @@ class WindowDetector:
             return self._get_active_window_macos_fallback()
     
     def _get_active_window_macos_fallback(self) -> Optional[WindowInfo]:
-        """macOS备用检测方法"""
+        """macOS备用检测方法 - 优先使用常驻的osascript进程，不可用时每次启动一次"""
+        helper = self._macos_helper
+        if helper is None:
+            helper = self._macos_helper = HelperProcess(
+                ['osascript', '-l', 'JavaScript', '-e', MACOS_HELPER_SCRIPT],
+                timeout=1.0, name="osascript helper",
+            )
+        if helper.available:
+            response = helper.request('frontmost')
+            if not response:
+                return None
+            process_name, _, process_id = response.partition('\t')
+            return self._window_info(
+                window_id=0,
+                title=process_name,
+                process_name=process_name,
+                process_id=int(process_id) if process_id.isdigit() else 0
+            )
+        
         try:
             import subprocess
             # 使用 AppleScript 获取前台应用
@@ -140,7 +354,7 @@ class WindowDetector:
             
             if result.returncode == 0:
                 process_name = result.stdout.strip()
-                return WindowInfo(
+                return self._window_info(
                     window_id=0,
                     title=process_name,
                     process_name=process_name,
@@ -170,14 +384,9 @@ class WindowDetector:
                 _, process_id = win32process.GetWindowThreadProcessId(hwnd)
                 
                 # 获取进程名称
-                import psutil
-                try:
-                    process = psutil.Process(process_id)
-                    process_name = process.name()
-                except:
-                    process_name = "Unknown"
+                process_name = self.get_process_name(process_id, hwnd)
                 
-                return WindowInfo(
+                return self._window_info(
                     window_id=hwnd,
                     title=window_title,
                     process_name=process_name,
@@ -189,73 +398,72 @@ class WindowDetector:
         return None
     
     def _get_active_window_linux(self) -> Optional[WindowInfo]:
-        """Linux活动窗口检测"""
+        """Linux活动窗口检测 - 使用持久连接，每次只读取几个属性"""
         if not self._has_xlib:
             return None
         
-        try:
-            from Xlib import display, X
-            
-            d = display.Display()
-            root = d.screen().root
-            
-            # 获取活动窗口
-            active_window = root.get_full_property(
-                d.intern_atom('_NET_ACTIVE_WINDOW'), X.AnyPropertyType
-            )
-            
-            if active_window and active_window.value:
-                window_id = active_window.value[0]
-                window = d.create_resource_object('window', window_id)
-                
-                # 获取窗口标题
-                window_title = window.get_full_property(
-                    d.intern_atom('_NET_WM_NAME'), X.AnyPropertyType
-                )
-                title = window_title.value.decode('utf-8') if window_title else "Unknown"
-                
-                # 获取进程ID
-                pid_property = window.get_full_property(
-                    d.intern_atom('_NET_WM_PID'), X.AnyPropertyType
-                )
-                
-                if pid_property:
-                    process_id = pid_property.value[0]
-                    
-                    # 获取进程名称
-                    import psutil
-                    try:
-                        process = psutil.Process(process_id)
-                        process_name = process.name()
-                    except:
-                        process_name = "Unknown"
-                    
-                    return WindowInfo(
-                        window_id=window_id,
-                        title=title,
-                        process_name=process_name,
-                        process_id=process_id
-                    )
-        except Exception as e:
-            performance_logger.error(f"Linux window detection error: {e}")
+        from Xlib.error import XError
+        
+        with self._x_lock:
+            # 连接失效时重连一次再重试
+            for attempt in range(2):
+                try:
+                    if self._display is None:
+                        self._connect_x()
+                    return self._read_active_window_x()
+                except XError:
+                    # 协议错误（如窗口刚被销毁）不影响连接本身
+                    return None
+                except Exception as e:
+                    self._disconnect_x()
+                    if attempt:
+                        performance_logger.error(f"Linux window detection error: {e}")
         
         return None
     
+    def _read_active_window_x(self) -> Optional[WindowInfo]:
+        """通过当前X连接读取活动窗口"""
+        from Xlib import X
+        
+        d, atoms = self._display, self._atoms
+        
+        # 获取活动窗口
+        active_window = self._root.get_full_property(
+            atoms['_NET_ACTIVE_WINDOW'], X.AnyPropertyType
+        )
+        if not active_window or not active_window.value:
+            return None
+        
+        window_id = active_window.value[0]
+        if not window_id:
+            return None
+        window = d.create_resource_object('window', window_id)
+        
+        # 获取窗口标题
+        window_title = window.get_full_property(atoms['_NET_WM_NAME'], X.AnyPropertyType)
+        title = window_title.value.decode('utf-8', 'replace') if window_title else "Unknown"
+        
+        # 获取进程ID
+        pid_property = window.get_full_property(atoms['_NET_WM_PID'], X.AnyPropertyType)
+        if not pid_property:
+            return None
+        process_id = pid_property.value[0]
+        
+        # 获取进程名称
+        process_name = self.get_process_name(process_id, window_id)
+        
+        return self._window_info(
+            window_id=window_id,
+            title=title,
+            process_name=process_name,
+            process_id=process_id
+        )
+    
     def get_running_applications(self) -> List[str]:
-        """获取当前运行的应用程序列表"""
+        """获取当前运行的应用程序列表 - 增量扫描，只读取新出现的进程"""
         try:
-            import psutil
-            processes = []
-            
-            for proc in psutil.process_iter(['name']):
-                try:
-                    process_name = proc.info['name']
-                    if process_name and process_name not in processes:
-                        processes.append(process_name)
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-            
-            return sorted(processes)
+            self._process_index.refresh()
+            return list(self._process_index.snapshot())
         except Exception as e:
             performance_logger.error(f"Failed to get running applications: {e}")
             return []
@@ -269,19 +477,39 @@ class ActiveWindowMonitor(QThread):
     target_window_deactivated = pyqtSignal()   # 目标窗口失活
     window_history_updated = pyqtSignal(list)  # 窗口历史记录更新
     
-    def __init__(self, parent=None):
+    HISTORY_SAVE_INTERVAL = 30.0  # 历史记录最多每30秒写一次文件
+    
+    def __init__(self, parent=None, history_size: int = 50, history_path: Optional[str] = None):
         super().__init__(parent)
         self.detector = WindowDetector()
         self._running = False
-        self._target_processes = set()  # 目标进程名称集合
+        # 小写名称 -> 原始写法（保留正则中 \D 等转义的大小写）
+        self._target_processes: Dict[str, str] = {}
+        self._target_matcher = TargetMatcher()  # 目标变化时整体替换
         self._current_window = None
-        self._is_target_active = False
-        self._check_interval = 0.5  # 检查间隔（秒）
+        # 焦点状态快照：只在监控线程中整体替换，热键路径无锁读取
+        self._snapshot = FocusSnapshot()
+        # 触发时的同步复查使用独立的检测器（独立的X连接），不与监控线程竞争
+        self._verify_on_trigger = True
+        self._verify_detector: Optional[WindowDetector] = None
+        # 轮询模式的间隔：窗口变化或键盘活动后0.1秒，稳定时逐步退避到2秒
+        self._polling = AdaptivePollingPolicy(min_interval=0.1, max_interval=2.0)
+        self._event_driven = True  # Linux X11下优先使用PropertyNotify事件
+        self._mode = 'polling'
+        self._wake_fd: Optional[int] = None
         self._lock = threading.RLock()
         
-        # 新增：窗口历史记录
-        self._window_history = deque(maxlen=20)  # 最多保存20个历史记录
-        self._history_dict = {}  # 用于快速查找和更新
+        # 按需运行：各使用方的引用计数，全部释放后暂停监控线程
+        self._demand: Dict[str, int] = {}
+        self._demand_lock = threading.Lock()
+        self._shut_down = False  # shutdown() 之后不再按需启动
+        
+        # 窗口历史记录（LRU），设置了路径时持久化
+        self._history = WindowHistory(
+            history_size, history_path,
+            window_factory=lambda name, title: WindowInfo(0, title, name, 0),
+        )
+        self._history.load()
         self._excluded_apps = {  # 排除的应用（通常是系统应用或当前应用）
             'artalekey', 'python', 'python3', 'terminal', 'iterm2', 
             'finder', 'dock', 'spotlight', 'systemuiserver'
@@ -290,19 +518,22 @@ class ActiveWindowMonitor(QThread):
     def set_target_processes(self, process_names: List[str]):
         """设置目标进程名称列表"""
         with self._lock:
-            self._target_processes = {name.lower() for name in process_names}
-            performance_logger.info(f"Target processes set: {self._target_processes}")
+            self._target_processes = {name.lower(): name for name in process_names}
+            self._rebuild_target_matcher()
+            performance_logger.info(f"Target processes set: {set(self._target_processes)}")
     
     def add_target_process(self, process_name: str):
         """添加目标进程"""
         with self._lock:
-            self._target_processes.add(process_name.lower())
+            self._target_processes[process_name.lower()] = process_name
+            self._rebuild_target_matcher()
             performance_logger.info(f"Added target process: {process_name}")
     
     def remove_target_process(self, process_name: str):
         """移除目标进程"""
         with self._lock:
-            self._target_processes.discard(process_name.lower())
+            self._target_processes.pop(process_name.lower(), None)
+            self._rebuild_target_matcher()
             performance_logger.info(f"Removed target process: {process_name}")
     
     def get_target_processes(self) -> List[str]:
@@ -310,14 +541,64 @@ class ActiveWindowMonitor(QThread):
         with self._lock:
             return list(self._target_processes)
     
-    def set_check_interval(self, interval: float):
-        """设置检查间隔"""
-        self._check_interval = max(0.1, min(5.0, interval))
+    def _rebuild_target_matcher(self):
+        """把目标列表编译为新的匹配器，轮询线程读取的始终是完整的对象"""
+        self._target_matcher = TargetMatcher(self._target_processes.values())
+    
+    def set_check_interval(self, interval: float, max_interval: Optional[float] = None):
+        """设置轮询的最短检查间隔，以及稳定时退避到的最长间隔"""
+        interval = max(0.1, min(5.0, interval))
+        if max_interval is None:
+            max_interval = max(interval, self._polling.get_limits()[1])
+        self._polling.set_limits(interval, max(interval, min(30.0, max_interval)))
+    
+    def notify_activity(self):
+        """有键盘等用户活动 - 轮询模式下立即恢复快速检测"""
+        if self._mode == 'polling':
+            self._polling.notify_activity()
+    
+    def get_polling_stats(self) -> Dict[str, float]:
+        """轮询统计（每分钟唤醒次数、检测延迟上限等）"""
+        return self._polling.get_stats()
     
     def is_target_window_active(self) -> bool:
-        """检查目标窗口是否处于活动状态"""
-        with self._lock:
-            return self._is_target_active
+        """检查目标窗口是否处于活动状态 - 读取快照，不加锁"""
+        return self._snapshot.is_target
+    
+    def focus_snapshot(self) -> FocusSnapshot:
+        """当前焦点状态快照（无锁读取）"""
+        return self._snapshot
+    
+    def set_verify_on_trigger(self, enabled: bool):
+        """设置触发前是否同步复查活动窗口"""
+        self._verify_on_trigger = enabled
+    
+    def verify_target_active(self) -> bool:
+        """触发前确认目标窗口处于活动状态
+        
+        平台支持快速查询时立即重新读取活动窗口，避免快照在轮询间隔内已经过期；
+        不支持或读取失败时退回快照的结果。
+        """
+        snapshot = self._snapshot
+        if not self._verify_on_trigger:
+            return snapshot.is_target
+        detector = self._verify_detector
+        if detector is None:
+            detector = self._verify_detector = WindowDetector()
+        if not detector.supports_fast_query():
+            return snapshot.is_target
+        
+        window = detector.get_active_window()
+        if window is None:
+            return snapshot.is_target
+        is_target = self._target_matcher.matches(window.process_name)
+        previous_key = snapshot.window.key if snapshot.window else None
+        if window.key != previous_key or is_target != snapshot.is_target:
+            # 快照已过期 - 让轮询立即更新
+            performance_logger.increment("focus_verify.stale")
+            self.notify_activity()
+        performance_logger.increment("focus_verify.checks")
+        return is_target
     
     def get_current_window(self) -> Optional[WindowInfo]:
         """获取当前窗口信息"""
@@ -327,28 +608,22 @@ class ActiveWindowMonitor(QThread):
     def get_window_history(self) -> List[WindowInfo]:
         """获取窗口历史记录（按时间倒序）"""
         with self._lock:
-            # 返回按最后活跃时间排序的历史记录
-            return sorted(
-                list(self._window_history), 
-                key=lambda w: w.last_active_time, 
-                reverse=True
-            )
+            return self._history.windows()
     
     def get_recent_apps(self, limit: int = 10) -> List[str]:
         """获取最近使用的应用程序名称列表"""
-        history = self.get_window_history()
-        recent_apps = []
-        seen = set()
-        
-        for window in history:
-            app_name = window.process_name
-            if app_name.lower() not in seen and app_name.lower() not in self._excluded_apps:
-                recent_apps.append(app_name)
-                seen.add(app_name.lower())
-                if len(recent_apps) >= limit:
-                    break
-        
-        return recent_apps
+        with self._lock:
+            return self._history.recent(limit, self._excluded_apps)
+    
+    def set_history_size(self, size: int):
+        """设置历史记录最大数量"""
+        with self._lock:
+            self._history.set_max_size(size)
+    
+    def save_history(self):
+        """立即保存历史记录"""
+        with self._lock:
+            self._history.save()
     
     def add_to_excluded_apps(self, app_name: str):
         """添加要排除的应用"""
@@ -357,102 +632,256 @@ class ActiveWindowMonitor(QThread):
     
     def _add_to_history(self, window: WindowInfo):
         """添加窗口到历史记录"""
-        if not window or window.process_name.lower() in self._excluded_apps:
+        if not window or window.key in self._excluded_apps:
             return
         
         with self._lock:
-            # 更新时间戳
-            window.last_active_time = time.time()
-            
-            # 如果已存在，更新时间并移到前面
-            if window.process_name.lower() in self._history_dict:
-                # 移除旧记录
-                old_window = self._history_dict[window.process_name.lower()]
-                try:
-                    self._window_history.remove(old_window)
-                except ValueError:
-                    pass
-            
-            # 添加新记录
-            self._history_dict[window.process_name.lower()] = window
-            self._window_history.append(window)
-            
-            # 发送历史更新信号
-            self.window_history_updated.emit(self.get_recent_apps())
+            # 更新时间戳并移到最近位置 - O(1)
+            self._history.touch(window)
+            recent_apps = self._history.recent(10, self._excluded_apps)
+            self._history.save(self.HISTORY_SAVE_INTERVAL)
+        
+        # 发送历史更新信号（不持有锁）
+        self.window_history_updated.emit(recent_apps)
+    
+    def set_event_driven(self, enabled: bool):
+        """设置是否优先使用事件驱动模式（仅Linux X11，下次启动时生效）"""
+        self._event_driven = enabled
+    
+    def get_mode(self) -> str:
+        """当前监控模式: 'events' 或 'polling'"""
+        return self._mode
+    
+    def acquire(self, consumer: str):
+        """登记一个需要窗口监控的使用方，第一个使用方出现时启动监控"""
+        with self._demand_lock:
+            self._demand[consumer] = self._demand.get(consumer, 0) + 1
+            self._apply_demand()
+    
+    def release(self, consumer: str):
+        """释放一次使用，没有任何使用方时暂停监控"""
+        with self._demand_lock:
+            count = self._demand.get(consumer, 0) - 1
+            if count > 0:
+                self._demand[consumer] = count
+            else:
+                self._demand.pop(consumer, None)
+            self._apply_demand()
+    
+    def set_demand(self, consumer: str, needed: bool):
+        """按状态登记/释放使用方（幂等，重复设置同一状态不改变计数）"""
+        with self._demand_lock:
+            if needed:
+                self._demand.setdefault(consumer, 1)
+            else:
+                self._demand.pop(consumer, None)
+            self._apply_demand()
+    
+    def get_demand(self) -> Dict[str, int]:
+        """当前各使用方的引用计数"""
+        with self._demand_lock:
+            return dict(self._demand)
+    
+    def shutdown(self):
+        """应用退出时停止监控 - 清空所有使用方，之后的登记不会再启动线程"""
+        with self._demand_lock:
+            self._shut_down = True
+            self._demand.clear()
+            self.stop()
+    
+    def _apply_demand(self):
+        """根据引用计数启动或暂停监控线程（调用方持有 _demand_lock）"""
+        if self._shut_down:
+            return
+        if self._demand:
+            if not self.isRunning():
+                performance_logger.info(f"Window monitor resumed for: {sorted(self._demand)}")
+                self.start()
+        elif self.isRunning():
+            performance_logger.info("Window monitor suspended, no consumers")
+            self.stop()
+            with self._lock:
+                # 暂停期间窗口状态不再更新，恢复后重新检测并发送信号
+                self._current_window = None
+                self._snapshot = FocusSnapshot(self._snapshot.version + 1)
+    
+    def start(self, *args):
+        """启动监控线程 - 运行标志在线程启动前设置，紧接着的stop()不会被覆盖"""
+        self._running = True
+        super().start(*args)
     
     def run(self):
         """监控线程主循环"""
-        self._running = True
         performance_logger.info("Active window monitor started")
         
+        if self._event_driven and self._can_use_x_events():
+            try:
+                self._mode = 'events'
+                self._run_x_events()
+            except Exception as e:
+                performance_logger.warning(
+                    f"X event monitoring unavailable, falling back to polling: {e}")
+        
+        if self._running:
+            self._mode = 'polling'
+            self._run_polling()
+        
+        performance_logger.info("Active window monitor stopped")
+    
+    def _run_polling(self):
+        """轮询模式 - 间隔由 AdaptivePollingPolicy 决定，键盘活动时提前醒来"""
+        policy = self._polling
+        policy.reset()
         while self._running:
             try:
                 # 获取当前活动窗口
-                current_window = self.detector.get_active_window()
-                
-                if current_window:
-                    # 检查窗口是否发生变化
-                    window_changed = False
-                    with self._lock:
-                        if (not self._current_window or 
-                            self._current_window.process_name != current_window.process_name or
-                            self._current_window.title != current_window.title):
-                            window_changed = True
-                            self._current_window = current_window
-                            
-                            # 添加到历史记录
-                            self._add_to_history(current_window)
-                    
-                    if window_changed:
-                        self.active_window_changed.emit(current_window)
-                        performance_logger.info(f"Active window changed: {current_window}")
-                    
-                    # 检查是否为目标窗口
-                    is_target = self._is_target_window(current_window)
-                    
-                    with self._lock:
-                        if is_target != self._is_target_active:
-                            self._is_target_active = is_target
-                            if is_target:
-                                self.target_window_activated.emit()
-                                performance_logger.info(f"Target window activated: {current_window.process_name}")
-                            else:
-                                self.target_window_deactivated.emit()
-                                performance_logger.info(f"Target window deactivated, current: {current_window.process_name}")
+                changed = self._process_window(self.detector.get_active_window())
+                policy.record_poll(changed)
                 
                 # 等待下一次检查
-                time.sleep(self._check_interval)
+                policy.wait()
                 
             except Exception as e:
                 performance_logger.error(f"Window monitor error: {e}")
                 time.sleep(1)  # 发生错误时延长等待时间
+    
+    def _can_use_x_events(self) -> bool:
+        """是否可以使用X事件驱动模式"""
+        return (self.detector.platform not in ("darwin", "win32")
+                and getattr(self.detector, '_has_xlib', False)
+                and bool(os.environ.get('DISPLAY')))
+    
+    def _run_x_events(self):
+        """事件驱动模式 - 订阅根窗口和焦点窗口的 PropertyNotify
         
-        performance_logger.info("Active window monitor stopped")
+        使用独立的X连接，空闲时阻塞在select上，不产生任何唤醒；
+        stop() 通过自管道唤醒线程。
+        """
+        import select
+        from Xlib import X, display
+        
+        d = display.Display()
+        wake_r, wake_w = os.pipe()
+        self._wake_fd = wake_w
+        try:
+            root = d.screen().root
+            watched_atoms = {
+                d.intern_atom('_NET_ACTIVE_WINDOW'),
+                d.intern_atom('_NET_WM_NAME'),
+                d.intern_atom('WM_NAME'),
+            }
+            root.change_attributes(event_mask=X.PropertyChangeMask)
+            d.flush()
+            
+            focused = None  # 已订阅属性变化的焦点窗口
+            changed = True  # 启动时先检测一次
+            x_fd = d.fileno()
+            while self._running:
+                while d.pending_events():
+                    event = d.next_event()
+                    if event.type == X.PropertyNotify and event.atom in watched_atoms:
+                        changed = True
+                
+                if changed:
+                    changed = False
+                    window = self.detector.get_active_window()
+                    self._process_window(window)
+                    focused = self._watch_focused_window(d, focused, window)
+                    continue  # 检测期间可能又有新事件
+                
+                readable, _, _ = select.select([x_fd, wake_r], [], [])
+                if wake_r in readable:
+                    break
+        finally:
+            self._wake_fd = None
+            os.close(wake_r)
+            os.close(wake_w)
+            try:
+                d.close()
+            except Exception:
+                pass
     
-    def _is_target_window(self, window: WindowInfo) -> bool:
-        """检查窗口是否为目标窗口"""
-        if not window or not self._target_processes:
+    def _watch_focused_window(self, d, focused, window: Optional[WindowInfo]):
+        """把标题变化的订阅从旧焦点窗口移到新焦点窗口，返回当前订阅的窗口"""
+        from Xlib import X
+        from Xlib.error import XError
+        
+        window_id = window.window_id if window else 0
+        if focused is not None and focused.id == window_id:
+            return focused
+        if focused is not None:
+            try:
+                focused.change_attributes(event_mask=X.NoEventMask)
+            except XError:
+                pass  # 窗口可能已被销毁
+        focused = None
+        if window_id:
+            focused = d.create_resource_object('window', window_id)
+            focused.change_attributes(event_mask=X.PropertyChangeMask)
+        d.flush()
+        return focused
+    
+    def _process_window(self, current_window: Optional[WindowInfo]) -> bool:
+        """处理一次检测结果：更新当前窗口、历史记录和目标窗口状态，返回窗口是否变化"""
+        if not current_window:
             return False
         
-        process_name_lower = window.process_name.lower()
+        # 检查是否为目标窗口
+        is_target = self._is_target_window(current_window)
+        
+        # 检查窗口和目标状态是否发生变化，有变化时发布新快照
+        window_changed = False
+        with self._lock:
+            previous = self._current_window
+            if previous is not current_window and (
+                not previous or
+                previous.process_name != current_window.process_name or
+                previous.title != current_window.title):
+                window_changed = True
+                self._current_window = current_window
+            snapshot = self._snapshot
+            target_changed = is_target != snapshot.is_target
+            if window_changed or target_changed:
+                self._snapshot = FocusSnapshot(snapshot.version + 1, current_window, is_target)
         
-        # 检查完全匹配
-        if process_name_lower in self._target_processes:
-            return True
+        if window_changed:
+            # 添加到历史记录
+            self._add_to_history(current_window)
+            self.active_window_changed.emit(current_window)
+            performance_logger.info(f"Active window changed: {current_window}")
         
-        # 检查部分匹配（去掉扩展名）
-        process_base = process_name_lower.replace('.exe', '').replace('.app', '')
-        for target in self._target_processes:
-            target_base = target.replace('.exe', '').replace('.app', '')
-            if process_base == target_base:
-                return True
+        if target_changed:
+            if is_target:
+                self.target_window_activated.emit()
+                performance_logger.info(f"Target window activated: {current_window.process_name}")
+            else:
+                self.target_window_deactivated.emit()
+                performance_logger.info(
+                    f"Target window deactivated, current: {current_window.process_name}")
         
-        return False
+        return window_changed
+    
+    def _is_target_window(self, window: WindowInfo) -> bool:
+        """检查窗口是否为目标窗口（完全匹配、去扩展名匹配、通配符和正则）"""
+        if not window:
+            return False
+        return self._target_matcher.matches(window.process_name)
     
     def stop(self):
         """停止监控"""
         self._running = False
+        self._polling.wake()
+        wake_fd = self._wake_fd
+        if wake_fd is not None:
+            try:
+                os.write(wake_fd, b'\0')  # 唤醒阻塞在select上的事件循环
+            except OSError:
+                pass
         self.wait(2000)  # 等待最多2秒
+        self.detector.close()
+        if self._verify_detector is not None:
+            self._verify_detector.close()
+        self.save_history()
 
-# 全局窗口监控器实例
-window_monitor = ActiveWindowMonitor() 
\ No newline at end of file
+# 全局窗口监控器实例（历史记录持久化到 ~/.artalekey/window_history.json）
+window_monitor = ActiveWindowMonitor(history_path=HISTORY_PATH) 
\ No newline at end of file
@@ -0,0 +1,133 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Optional, Tuple
+from artalekey.core.logger import performance_logger
+
+# 默认历史记录文件，与日志放在同一目录
+HISTORY_PATH = os.path.expanduser("~/.artalekey/window_history.json")
+
+class WindowHistory:
+    """最近使用窗口的LRU记录 - 按进程名（不区分大小写）去重
+
+    记录的窗口对象需要提供 key（小写进程名）、process_name 和 title。
+    OrderedDict 末尾为最近使用；更新一次为O(1)，读取最近k个为O(k)。
+    设置了 path 时可以把记录保存为JSON，重启后无需重新收集。
+    """
+
+    def __init__(self, max_size: int = 50, path: Optional[str] = None,
+                 window_factory: Optional[Callable[[str, str], object]] = None):
+        # 小写进程名 -> (窗口, 时间戳)
+        self._entries: 'OrderedDict[str, Tuple[object, float]]' = OrderedDict()
+        self._max_size = max(1, max_size)
+        self._path = path
+        self._window_factory = window_factory  # 从文件恢复时根据 (进程名, 标题) 创建窗口对象
+        self._dirty = False
+        self._last_save = 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    def set_max_size(self, max_size: int):
+        """设置最大记录数，超出部分丢弃最早的记录"""
+        self._max_size = max(1, max_size)
+        self._trim()
+
+    def _trim(self):
+        entries = self._entries
+        while len(entries) > self._max_size:
+            entries.popitem(last=False)
+            self._dirty = True
+
+    def touch(self, window, timestamp: Optional[float] = None):
+        """记录窗口被激活 - O(1)"""
+        key = window.key
+        entries = self._entries
+        entries[key] = (window, timestamp if timestamp is not None else time.time())
+        entries.move_to_end(key)
+        self._trim()
+        self._dirty = True
+
+    def remove(self, process_name: str):
+        """移除一个应用的记录"""
+        if self._entries.pop(process_name.lower(), None) is not None:
+            self._dirty = True
+
+    def clear(self):
+        self._entries.clear()
+        self._dirty = True
+
+    def windows(self, limit: Optional[int] = None) -> List[object]:
+        """按最近使用排序的窗口"""
+        result = []
+        for window, _ in reversed(self._entries.values()):
+            result.append(window)
+            if limit is not None and len(result) >= limit:
+                break
+        return result
+
+    def recent(self, limit: int = 10, exclude: Iterable[str] = ()) -> List[str]:
+        """最近使用的应用名称 - O(k)，跳过排除的应用"""
+        result = []
+        if limit <= 0:
+            return result
+        for key, (window, _) in reversed(self._entries.items()):
+            if key in exclude:
+                continue
+            result.append(window.process_name)
+            if len(result) >= limit:
+                break
+        return result
+
+    def entries(self) -> List[Tuple[object, float]]:
+        """(窗口, 时间戳) 列表，最近使用在前"""
+        return list(reversed(self._entries.values()))
+
+    def load(self) -> int:
+        """从文件恢复记录，返回恢复的数量"""
+        if not self._path or self._window_factory is None or not os.path.exists(self._path):
+            return 0
+        try:
+            with open(self._path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            records = data.get('windows', [])
+            for record in records[-self._max_size:]:  # 文件中按从旧到新保存
+                name = record.get('process_name')
+                if not name:
+                    continue
+                window = self._window_factory(name, record.get('title') or name)
+                self.touch(window, float(record.get('last_active', 0.0)))
+            self._dirty = False
+            return len(self._entries)
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            performance_logger.warning(f"Failed to load window history: {e}")
+            return 0
+
+    def save(self, min_interval: float = 0.0) -> bool:
+        """有变化时写入文件；min_interval秒内已保存过则跳过"""
+        if not self._path or not self._dirty:
+            return False
+        now = time.monotonic()
+        if min_interval and now - self._last_save < min_interval:
+            return False
+        records = [
+            {'process_name': window.process_name, 'title': window.title, 'last_active': timestamp}
+            for window, timestamp in self._entries.values()
+        ]
+        try:
+            os.makedirs(os.path.dirname(self._path), exist_ok=True)
+            tmp_path = self._path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'windows': records}, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path)  # 原子替换，避免写到一半的文件
+        except OSError as e:
+            performance_logger.warning(f"Failed to save window history: {e}")
+            return False
+        self._dirty = False
+        self._last_save = now
+        return True
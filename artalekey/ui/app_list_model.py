@@ -0,0 +1,135 @@
+from difflib import SequenceMatcher
+from typing import Iterable, List, Optional
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+def _ordered_opcodes(old: List[str], new: List[str]) -> Optional[list]:
+    """线性时间差异 - 适用于元素唯一且两边相对顺序一致的列表
+
+    排序列表的增删、按条件过滤（结果是同一列表的子序列）都满足这个条件；
+    顺序不一致时返回None，由调用方退回通用的SequenceMatcher。
+    """
+    new_set = set(new)
+    old_set = set(old)
+    if len(new_set) != len(new) or len(old_set) != len(old):
+        return None
+    opcodes = []
+    i = j = 0
+    n, m = len(old), len(new)
+    while i < n or j < m:
+        if i < n and j < m and old[i] == new[j]:
+            start_i, start_j = i, j
+            while i < n and j < m and old[i] == new[j]:
+                i += 1
+                j += 1
+            opcodes.append(('equal', start_i, i, start_j, j))
+        elif i < n and old[i] not in new_set:
+            start = i
+            while i < n and old[i] not in new_set:
+                i += 1
+            opcodes.append(('delete', start, i, j, j))
+        elif j < m and new[j] not in old_set:
+            start = j
+            while j < m and new[j] not in old_set:
+                j += 1
+            opcodes.append(('insert', i, i, start, j))
+        else:
+            return None  # 两边都有的元素顺序不同
+    return opcodes
+
+class AppListModel(QAbstractListModel):
+    """应用名称列表模型 - 更新时只插入/删除变化的行
+
+    替代 QListWidget 的清空再重建，视图只重绘真正变化的部分。
+    suffix 只用于显示（如 " (最近使用)"），NameRole 始终返回原始名称；
+    列表为空时可以显示一行不可选的占位提示。
+    """
+
+    NameRole = Qt.ItemDataRole.UserRole + 1
+    DIFF_LIMIT = 1000  # 顺序不一致时使用通用差异的最大总行数
+
+    def __init__(self, parent=None, suffix: str = "", placeholder: str = "",
+                 placeholder_tooltip: str = ""):
+        super().__init__(parent)
+        self._items: List[str] = []
+        self._suffix = suffix
+        self._placeholder = placeholder
+        self._placeholder_tooltip = placeholder_tooltip
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._items) or (1 if self._placeholder else 0)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if not self._items:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self._placeholder
+            if role == Qt.ItemDataRole.ToolTipRole:
+                return self._placeholder_tooltip or None
+            return None
+
+        name = self._items[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return name + self._suffix
+        if role in (self.NameRole, Qt.ItemDataRole.EditRole):
+            return name
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid() or not self._items:
+            return Qt.ItemFlag.NoItemFlags  # 占位提示不可选
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def items(self) -> List[str]:
+        """当前的应用名称列表（副本）"""
+        return list(self._items)
+
+    def name_at(self, row: int) -> Optional[str]:
+        """指定行的应用名称，占位行返回None"""
+        if 0 <= row < len(self._items):
+            return self._items[row]
+        return None
+
+    def set_items(self, items: Iterable[str]) -> bool:
+        """用最小的插入/删除操作把列表更新为items，返回是否有变化"""
+        new_items = list(items)
+        old_items = self._items
+        if new_items == old_items:
+            return False
+
+        if self._placeholder and (not old_items or not new_items):
+            # 占位行与真实行之间切换，直接重置
+            self.beginResetModel()
+            self._items = new_items
+            self.endResetModel()
+            return True
+
+        opcodes = _ordered_opcodes(old_items, new_items)
+        if opcodes is None:
+            if len(old_items) + len(new_items) > self.DIFF_LIMIT:
+                # 顺序变化且列表很大时，通用差异比重置更慢
+                self.beginResetModel()
+                self._items = new_items
+                self.endResetModel()
+                return True
+            opcodes = SequenceMatcher(None, old_items, new_items, autojunk=False).get_opcodes()
+        root = QModelIndex()
+        # 从后往前应用，前面的行号保持有效
+        for tag, i1, i2, j1, j2 in reversed(opcodes):
+            if tag == 'equal':
+                continue
+            if tag == 'replace' and i2 - i1 == j2 - j1:
+                old_items[i1:i2] = new_items[j1:j2]
+                self.dataChanged.emit(self.index(i1), self.index(i2 - 1))
+                continue
+            if tag in ('delete', 'replace'):
+                self.beginRemoveRows(root, i1, i2 - 1)
+                del old_items[i1:i2]
+                self.endRemoveRows()
+            if tag in ('insert', 'replace'):
+                self.beginInsertRows(root, i1, i1 + j2 - j1 - 1)
+                old_items[i1:i1] = new_items[j1:j2]
+                self.endInsertRows()
+        return True
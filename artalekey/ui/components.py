@@ -13,6 +13,7 @@ class HotkeyCard(QGroupBox):
     def __init__(self, hotkey_id: str, parent=None):
         super().__init__("热键设置", parent)
         self.hotkey_id = hotkey_id
+        self._extra_config = {}  # 卡片不编辑的配置项（如按键序列），保存时原样带回
         self._debounce_timer = QTimer()  # 防抖计时器
         self._debounce_timer.setSingleShot(True)
         self._debounce_timer.timeout.connect(self._emit_config_changed)
@@ -129,6 +130,7 @@ class HotkeyCard(QGroupBox):
     def get_config(self) -> dict:
         """获取当前配置"""
         return {
+            **self._extra_config,
             'trigger_key': self.key_combo.currentText(),
             'hold_time': self.hold_slider.value(),
             'interval': self.interval_slider.value(),
@@ -142,6 +144,11 @@ class HotkeyCard(QGroupBox):
         self.interval_slider.blockSignals(True)
         self.enabled_check.blockSignals(True)
         
+        self._extra_config = {
+            key: value for key, value in config.items()
+            if key not in ('trigger_key', 'hold_time', 'interval', 'enabled')
+        }
+        
         try:
             if 'trigger_key' in config:
                 self.key_combo.setCurrentText(config['trigger_key'])
@@ -8,7 +8,7 @@ from PyQt6.QtGui import QIcon
 from .components import HotkeyCard
 from .target_app_selector import TargetAppSelector
 from .styles import get_main_window_style, get_status_style
-from ..core.hotkey_manager import KeySimulator, HotkeyListener
+from ..core.hotkey_manager import PersistentKeySimulator, HotkeyListener
 from ..core.config import config_manager
 from ..core.logger import performance_logger
 from ..core.window_detector import window_monitor
@@ -24,8 +24,9 @@ class MainWindow(QMainWindow):
         self.setStyleSheet(get_main_window_style())
         
         # 初始化管理器
-        self.key_simulator = KeySimulator()
-        self.hotkey_listener = HotkeyListener(self)
+        self.key_simulator = PersistentKeySimulator()  # 常驻线程，激活时无需创建线程
+        # 队列分发模式：pynput回调只入队，匹配和信号在独立线程完成
+        self.hotkey_listener = HotkeyListener(self, dispatch_mode='queue')
         
         # 状态追踪
         self._is_simulation_running = False
@@ -37,6 +38,7 @@ class MainWindow(QMainWindow):
         self.init_ui()
         self.connect_signals()
         self.hotkey_listener.start()
+        self.key_simulator.start()  # 预先启动常驻工作线程，挂起等待激活
         
         # 记录启动性能
         performance_logger.log_memory_usage("after startup")
@@ -127,6 +129,8 @@ class MainWindow(QMainWindow):
         # 窗口监控信号
         window_monitor.target_window_activated.connect(self.on_target_window_activated)
         window_monitor.target_window_deactivated.connect(self.on_target_window_deactivated)
+        # 键盘活动时让轮询模式的窗口检测立即恢复快速间隔
+        self.hotkey_listener.set_activity_callback(window_monitor.notify_activity)
         
         # 应用保存的配置
         self.apply_saved_config()
@@ -147,15 +151,27 @@ class MainWindow(QMainWindow):
         
         # 更新热键监听器和模拟器设置
         self.hotkey_listener.set_hold_time(hotkey_config['hold_time'])
+        self.hotkey_listener.set_trigger_key(hotkey_config.get('trigger_key', 'w'))
         self.key_simulator.set_interval(hotkey_config['interval'])
+        self.apply_sequence(hotkey_config.get('sequence'))
+        
+    def apply_sequence(self, sequence):
+        """应用配置中的按键序列，无效时回退到默认模式"""
+        try:
+            self.key_simulator.set_sequence(sequence)
+        except ValueError as e:
+            performance_logger.error(f"Invalid key sequence, using default: {e}")
+            self.key_simulator.set_sequence(None)
         
     def on_config_changed(self, hotkey_id: str, config: dict):
         """配置变更处理 - 实时应用设置"""
         if hotkey_id == "default":
             # 更新长按时间
             self.hotkey_listener.set_hold_time(config['hold_time'])
-            # 更新模拟器间隔
+            self.hotkey_listener.set_trigger_key(config['trigger_key'])
+            # 更新模拟器间隔和按键序列
             self.key_simulator.set_interval(config['interval'])
+            self.apply_sequence(config.get('sequence'))
             
             # 更新状态显示
             self.status_label.setText(f"配置已更新 - 长按时间: {config['hold_time']}ms, 间隔: {config['interval']}ms")
@@ -171,8 +187,14 @@ class MainWindow(QMainWindow):
             self._save_timer.stop()
             self._save_timer.start(1000)  # 1秒后保存
         
+    def _update_monitor_demand(self):
+        """窗口过滤启用且全局开关打开时才需要窗口监控，否则让监控线程暂停"""
+        window_monitor.set_demand('window_filter',
+                                  self._window_filter_enabled and self.global_switch.isChecked())
+    
     def on_global_switch_changed(self, state):
         """全局开关状态改变"""
+        self._update_monitor_demand()
         if state:
             self.statusBar().showMessage("快速向上功能已启用")
             self.status_label.setText("功能已启用 - 等待热键触发")
@@ -195,12 +217,12 @@ class MainWindow(QMainWindow):
         
         # 检查窗口过滤状态
         if self._window_filter_enabled:
-            # 如果启用了窗口过滤，只有目标窗口激活时才启动
-            if window_monitor.is_target_window_active():
-                self.key_simulator.start()
+            # 如果启用了窗口过滤，只有目标窗口激活时才启动（触发前同步复查活动窗口）
+            if window_monitor.verify_target_active():
+                self.key_simulator.activate()
         else:
             # 如果没有启用窗口过滤，直接启动
-            self.key_simulator.start()
+            self.key_simulator.activate()
             
     def on_hotkey_released(self):
         """热键组合释放"""
@@ -240,10 +262,7 @@ class MainWindow(QMainWindow):
         self._window_filter_enabled = enabled
         performance_logger.info(f"Window filter enabled: {enabled}")
         
-        if enabled:
-            # 启动窗口监控
-            if not window_monitor.isRunning():
-                window_monitor.start()
+        self._update_monitor_demand()
         
         # 更新状态显示
         if self._is_simulation_running and enabled and not window_monitor.is_target_window_active():
@@ -279,15 +298,12 @@ class MainWindow(QMainWindow):
             self.save_config()
             
             # 安全停止所有组件
-            if self._is_simulation_running:
-                self.key_simulator.stop()
-                self.key_simulator.wait(1000)  # 等待最多1秒
+            self.key_simulator.shutdown()  # 等待最多1秒
                 
             self.hotkey_listener.stop()
             
             # 停止窗口监控器
-            if window_monitor.isRunning():
-                window_monitor.stop()
+            window_monitor.shutdown()  # 清空使用方，退出过程中的隐藏事件不会重新启动
             
             # 记录关闭性能
             performance_logger.log_memory_usage("before shutdown")
@@ -8,7 +8,7 @@ from PyQt6.QtGui import QResizeEvent
 from artalekey.ui.components import HotkeyCard
 from artalekey.ui.simple_target_selector import SimpleTargetSelector
 from artalekey.ui.simple_styles import get_adaptive_style, get_native_style
-from artalekey.core.hotkey_manager import KeySimulator, HotkeyListener
+from artalekey.core.hotkey_manager import PersistentKeySimulator, HotkeyListener
 from artalekey.core.config import config_manager
 from artalekey.core.logger import performance_logger
 from artalekey.core.window_detector import window_monitor
@@ -22,8 +22,9 @@ class SimpleMainWindow(QMainWindow):
         self.setMinimumSize(QSize(400, 300))
         
         # 初始化管理器
-        self.key_simulator = KeySimulator()
-        self.hotkey_listener = HotkeyListener(self)
+        self.key_simulator = PersistentKeySimulator()  # 常驻线程，激活时无需创建线程
+        # 队列分发模式：pynput回调只入队，匹配和信号在独立线程完成
+        self.hotkey_listener = HotkeyListener(self, dispatch_mode='queue')
         
         # 状态追踪
         self._is_simulation_running = False
@@ -38,6 +39,7 @@ class SimpleMainWindow(QMainWindow):
         self.init_ui()
         self.connect_signals()
         self.hotkey_listener.start()
+        self.key_simulator.start()  # 预先启动常驻工作线程，挂起等待激活
         
         # 记录启动性能
         performance_logger.log_memory_usage("after startup")
@@ -147,6 +149,8 @@ class SimpleMainWindow(QMainWindow):
         # 窗口监控信号
         window_monitor.target_window_activated.connect(self.on_target_window_activated)
         window_monitor.target_window_deactivated.connect(self.on_target_window_deactivated)
+        # 键盘活动时让轮询模式的窗口检测立即恢复快速间隔
+        self.hotkey_listener.set_activity_callback(window_monitor.notify_activity)
         
         # 应用保存的配置
         self.apply_saved_config()
@@ -169,15 +173,27 @@ class SimpleMainWindow(QMainWindow):
         
         # 更新热键监听器和模拟器设置
         self.hotkey_listener.set_hold_time(hotkey_config['hold_time'])
+        self.hotkey_listener.set_trigger_key(hotkey_config.get('trigger_key', 'w'))
         self.key_simulator.set_interval(hotkey_config['interval'])
+        self.apply_sequence(hotkey_config.get('sequence'))
+        
+    def apply_sequence(self, sequence):
+        """应用配置中的按键序列，无效时回退到默认模式"""
+        try:
+            self.key_simulator.set_sequence(sequence)
+        except ValueError as e:
+            performance_logger.error(f"Invalid key sequence, using default: {e}")
+            self.key_simulator.set_sequence(None)
         
     def on_config_changed(self, hotkey_id: str, config: dict):
         """配置变更处理"""
         if hotkey_id == "default":
             # 更新长按时间
             self.hotkey_listener.set_hold_time(config['hold_time'])
-            # 更新模拟器间隔
+            self.hotkey_listener.set_trigger_key(config['trigger_key'])
+            # 更新模拟器间隔和按键序列
             self.key_simulator.set_interval(config['interval'])
+            self.apply_sequence(config.get('sequence'))
             
             # 更新状态显示
             self.status_label.setText(f"配置已更新 - 长按: {config['hold_time']}ms, 间隔: {config['interval']}ms")
@@ -194,8 +210,14 @@ class SimpleMainWindow(QMainWindow):
             self._save_timer.stop()
             self._save_timer.start(1000)
         
+    def _update_monitor_demand(self):
+        """窗口过滤启用且全局开关打开时才需要窗口监控，否则让监控线程暂停"""
+        window_monitor.set_demand('window_filter',
+                                  self._window_filter_enabled and self.global_switch.isChecked())
+    
     def on_global_switch_changed(self, state):
         """全局开关状态改变"""
+        self._update_monitor_demand()
         if state:
             self.statusBar().showMessage("快速向上功能已启用")
             self.status_label.setText("✅ 功能已启用 - 等待热键触发")
@@ -217,10 +239,10 @@ class SimpleMainWindow(QMainWindow):
         
         # 检查窗口过滤状态
         if self._window_filter_enabled:
-            if window_monitor.is_target_window_active():
-                self.key_simulator.start()
+            if window_monitor.verify_target_active():
+                self.key_simulator.activate()
         else:
-            self.key_simulator.start()
+            self.key_simulator.activate()
             
     def on_hotkey_released(self):
         """热键组合释放"""
@@ -249,9 +271,7 @@ class SimpleMainWindow(QMainWindow):
         self._window_filter_enabled = enabled
         performance_logger.info(f"Window filter enabled: {enabled}")
         
-        if enabled:
-            if not window_monitor.isRunning():
-                window_monitor.start()
+        self._update_monitor_demand()
         
         # 更新状态显示
         if self._is_simulation_running and enabled and not window_monitor.is_target_window_active():
@@ -287,14 +307,11 @@ class SimpleMainWindow(QMainWindow):
             self.save_config()
             
             # 停止所有组件
-            if self._is_simulation_running:
-                self.key_simulator.stop()
-                self.key_simulator.wait(1000)
+            self.key_simulator.shutdown()
                 
             self.hotkey_listener.stop()
             
-            if window_monitor.isRunning():
-                window_monitor.stop()
+            window_monitor.shutdown()  # 清空使用方，退出过程中的隐藏事件不会重新启动
             
             performance_logger.log_memory_usage("before shutdown")
             performance_logger.info("Application shutdown completed")
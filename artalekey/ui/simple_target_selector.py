@@ -22,11 +22,7 @@ class SimpleTargetSelector(QGroupBox):
         self.init_ui()
         self.connect_signals()
         
-        # 启动窗口监控器
-        if not window_monitor.isRunning():
-            window_monitor.start()
-        
-        # 排除当前应用
+        # 排除当前应用（窗口监控由主窗口按需启动）
         window_monitor.add_to_excluded_apps('python')
         window_monitor.add_to_excluded_apps('artalekey')
         
@@ -124,6 +120,16 @@ class SimpleTargetSelector(QGroupBox):
         self.target_combo.setCurrentText(self.default_target_app)
         performance_logger.info(f"Set target app to default: {self.default_target_app}")
     
+    def showEvent(self, event):
+        """选择器可见时需要窗口监控，“使用当前应用”才能取得当前窗口"""
+        super().showEvent(event)
+        window_monitor.set_demand('simple_selector', True)
+    
+    def hideEvent(self, event):
+        """选择器隐藏（包括窗口最小化）时释放窗口监控"""
+        super().hideEvent(event)
+        window_monitor.set_demand('simple_selector', False)
+    
     def set_current_app(self):
         """设置当前检测到的应用"""
         current_window = window_monitor.get_current_window()
@@ -1,15 +1,58 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-    QListWidget, QListWidgetItem, QLineEdit, QCheckBox,
+    QListWidget, QListView, QLineEdit, QCheckBox,
     QFrame, QMessageBox, QComboBox, QGroupBox, QScrollArea
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QTimer
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer, QObject, QRunnable, QThreadPool
 from PyQt6.QtGui import QFont, QIcon
+from .app_list_model import AppListModel
 from .styles import get_selector_style, get_status_style
 from ..core.window_detector import window_monitor, WindowDetector
 from ..core.logger import performance_logger
+from ..core.search_index import AppSearchIndex
 import threading
 
+# 名称中包含这些关键字的进程视为系统进程
+SYSTEM_PROCESS_KEYWORDS = ('kernel', 'system', 'service', 'daemon', 'helper')
+
+def filter_app_names(apps, target_apps) -> list:
+    """过滤掉系统进程、太短的名称和已添加的目标应用"""
+    targets = set(target_apps)
+    filtered_apps = []
+    for app in apps:
+        if app and len(app) > 1 and app not in targets:  # 过滤掉太短的名称
+            app_lower = app.lower()
+            if not any(sys_name in app_lower for sys_name in SYSTEM_PROCESS_KEYWORDS):
+                filtered_apps.append(app)
+    return filtered_apps
+
+class _AppListSignals(QObject):
+    """后台刷新任务的信号载体（QRunnable本身不能发送信号）"""
+    finished = pyqtSignal(int, list)  # 刷新代数, 应用列表
+
+class _AppListTask(QRunnable):
+    """在线程池中枚举并过滤运行中的应用"""
+    
+    def __init__(self, selector: 'TargetAppSelector', generation: int, target_apps: list):
+        super().__init__()
+        self._detector = selector.detector
+        self._signals = selector._refresh_signals
+        self._is_current = selector._is_current_refresh
+        self._generation = generation
+        self._target_apps = target_apps
+    
+    def run(self):
+        # 开始前和扫描后各检查一次，已有更新的刷新时直接放弃
+        if not self._is_current(self._generation):
+            return
+        try:
+            apps = self._detector.get_running_applications()
+            if not self._is_current(self._generation):
+                return
+            self._signals.finished.emit(self._generation, filter_app_names(apps, self._target_apps))
+        except Exception as e:
+            performance_logger.error(f"Failed to refresh applications: {e}")
+
 class TargetAppSelector(QFrame):
     """目标应用选择器组件"""
     
@@ -21,16 +64,21 @@ class TargetAppSelector(QFrame):
         super().__init__(parent)
         self.detector = WindowDetector()
         self._current_apps = []
+        self._search_index = AppSearchIndex()  # 随应用列表增量更新
+        
+        # 应用列表在单线程池中后台刷新，结果通过信号回到GUI线程
+        self._refresh_pool = QThreadPool(self)
+        self._refresh_pool.setMaxThreadCount(1)
+        self._refresh_generation = 0
+        self._refresh_signals = _AppListSignals(self)
+        self._refresh_signals.finished.connect(self._on_apps_refreshed)
+        
         self._refresh_timer = QTimer()
         self._refresh_timer.timeout.connect(self._refresh_running_apps)
         self.init_ui()
         self.connect_signals()
         
-        # 启动窗口监控器以收集历史记录
-        if not window_monitor.isRunning():
-            window_monitor.start()
-        
-        # 排除当前应用
+        # 排除当前应用（最近使用面板可见时才需要窗口监控，见 showEvent/hideEvent）
         window_monitor.add_to_excluded_apps('python')
         window_monitor.add_to_excluded_apps('artalekey')
         
@@ -69,7 +117,14 @@ class TargetAppSelector(QFrame):
         recent_apps_label.setFont(QFont("", 14, QFont.Weight.Bold))
         
         # 最近应用列表
-        self.recent_apps_list = QListWidget()
+        self.recent_apps_model = AppListModel(
+            self,
+            suffix=" (最近使用)",
+            placeholder="使用其他应用程序后，这里会显示最近使用的应用...",
+            placeholder_tooltip="切换到其他应用程序，然后回到这里查看最近使用的应用列表",
+        )
+        self.recent_apps_list = QListView()
+        self.recent_apps_list.setModel(self.recent_apps_model)
         self.recent_apps_list.setMaximumHeight(120)
         self.recent_apps_list.setToolTip("双击应用名称快速添加到目标列表")
         
@@ -94,7 +149,11 @@ class TargetAppSelector(QFrame):
         refresh_layout.addWidget(self.refresh_btn)
         refresh_layout.addWidget(self.search_edit)
         
-        self.available_list = QListWidget()
+        # 搜索和刷新都只把差异应用到模型，不重建整个列表
+        self.available_model = AppListModel(self)
+        self.available_list = QListView()
+        self.available_list.setModel(self.available_model)
+        self.available_list.setUniformItemSizes(True)
         self.available_list.setMaximumHeight(180)
         
         left_panel.addWidget(available_label)
@@ -158,9 +217,9 @@ class TargetAppSelector(QFrame):
         self.manual_edit.returnPressed.connect(self.add_manual_app)
         
         # 列表信号
-        self.available_list.itemDoubleClicked.connect(self.add_selected_app)
+        self.available_list.doubleClicked.connect(self.add_selected_app)
         self.target_list.itemDoubleClicked.connect(self.remove_selected_app)
-        self.recent_apps_list.itemDoubleClicked.connect(self.add_recent_app)
+        self.recent_apps_list.doubleClicked.connect(self.add_recent_app)
         
         # 窗口监控信号
         window_monitor.window_history_updated.connect(self.on_window_history_updated)
@@ -195,9 +254,6 @@ class TargetAppSelector(QFrame):
             if target_count > 0:
                 self.status_label.setText(f"窗口过滤已启用 - {target_count}个目标应用")
                 self.status_label.setStyleSheet(get_status_style('success'))
-                # 启动窗口监控
-                if not window_monitor.isRunning():
-                    window_monitor.start()
                 window_monitor.set_target_processes(self.get_target_apps())
             else:
                 self.status_label.setText("窗口过滤已启用 - 请添加目标应用")
@@ -210,35 +266,31 @@ class TargetAppSelector(QFrame):
         self.window_filter_enabled.emit(enabled)
     
     def refresh_available_apps(self):
-        """刷新可用应用列表"""
-        try:
-            # 在后台线程中获取应用列表
-            def get_apps():
-                apps = self.detector.get_running_applications()
-                # 过滤掉系统应用和已添加的应用
-                target_apps = self.get_target_apps()
-                filtered_apps = []
-                
-                for app in apps:
-                    if app and len(app) > 1:  # 过滤掉太短的名称
-                        app_lower = app.lower()
-                        # 过滤系统进程
-                        if not any(sys_name in app_lower for sys_name in 
-                                 ['kernel', 'system', 'service', 'daemon', 'helper']):
-                            if app not in target_apps:
-                                filtered_apps.append(app)
-                
-                return filtered_apps
-            
-            # 使用线程池或直接调用
-            apps = get_apps()
-            self._current_apps = apps
-            self.filter_available_apps()
-            
-            performance_logger.info(f"Refreshed {len(apps)} available applications")
-            
-        except Exception as e:
-            performance_logger.error(f"Failed to refresh applications: {e}")
+        """刷新可用应用列表 - 提交到后台线程池，不阻塞GUI线程"""
+        self._refresh_generation += 1
+        self._refresh_pool.clear()  # 丢弃尚未开始的旧刷新
+        self._refresh_pool.start(
+            _AppListTask(self, self._refresh_generation, self.get_target_apps())
+        )
+    
+    def _is_current_refresh(self, generation: int) -> bool:
+        """刷新任务是否仍是最新的一次"""
+        return generation == self._refresh_generation
+    
+    def _on_apps_refreshed(self, generation: int, apps: list):
+        """后台刷新完成（GUI线程）"""
+        if generation != self._refresh_generation:
+            return  # 过期结果
+        if apps == self._current_apps:
+            return  # 列表没有变化，不触碰UI
+        self._current_apps = apps
+        self._search_index.set_names(apps)
+        self.filter_available_apps()
+        performance_logger.info(f"Refreshed {len(apps)} available applications")
+    
+    def wait_for_refresh(self, msecs: int = -1) -> bool:
+        """等待后台刷新完成"""
+        return self._refresh_pool.waitForDone(msecs)
     
     def _refresh_running_apps(self):
         """定时刷新运行中的应用"""
@@ -246,20 +298,20 @@ class TargetAppSelector(QFrame):
             self.refresh_available_apps()
     
     def filter_available_apps(self):
-        """根据搜索框过滤可用应用"""
-        search_text = self.search_edit.text().lower()
-        self.available_list.clear()
-        
-        for app in self._current_apps:
-            if search_text in app.lower():
-                self.available_list.addItem(app)
+        """根据搜索框过滤可用应用 - 索引给出排序后的匹配，模型只插入/删除变化的行"""
+        search_text = self.search_edit.text()
+        if search_text.strip():
+            self.available_model.set_items(self._search_index.search(search_text))
+        else:
+            self.available_model.set_items(self._current_apps)
     
     def add_selected_app(self):
         """添加选中的应用"""
-        current_item = self.available_list.currentItem()
-        if current_item:
-            app_name = current_item.text()
-            self.add_target_app(app_name)
+        index = self.available_list.currentIndex()
+        if index.isValid():
+            app_name = index.data(AppListModel.NameRole)
+            if app_name:
+                self.add_target_app(app_name)
     
     def remove_selected_app(self):
         """移除选中的应用"""
@@ -331,6 +383,17 @@ class TargetAppSelector(QFrame):
         # 发送信号
         self.target_apps_changed.emit(target_apps)
     
+    def showEvent(self, event):
+        """最近使用面板可见时才需要窗口监控收集历史记录"""
+        super().showEvent(event)
+        window_monitor.set_demand('recent_apps', True)
+        self.update_recent_apps()
+    
+    def hideEvent(self, event):
+        """面板隐藏（包括窗口最小化）时释放窗口监控"""
+        super().hideEvent(event)
+        window_monitor.set_demand('recent_apps', False)
+    
     def on_window_history_updated(self, recent_apps):
         """窗口历史更新处理"""
         self.update_recent_apps(recent_apps)
@@ -340,33 +403,18 @@ class TargetAppSelector(QFrame):
         if recent_apps is None:
             recent_apps = window_monitor.get_recent_apps(10)
         
-        self.recent_apps_list.clear()
-        target_apps = self.get_target_apps()
-        
-        # 添加最近使用的应用（排除已添加的）
-        for app in recent_apps:
-            if app not in target_apps:  # 只显示还未添加的应用
-                item_text = f"{app} (最近使用)"
-                self.recent_apps_list.addItem(item_text)
-        
-        # 如果列表为空，显示提示信息
-        if self.recent_apps_list.count() == 0:
-            hint_item = QListWidgetItem("使用其他应用程序后，这里会显示最近使用的应用...")
-            hint_item.setFlags(hint_item.flags() & ~Qt.ItemFlag.ItemIsEnabled)  # 禁用选择
-            hint_item.setToolTip("切换到其他应用程序，然后回到这里查看最近使用的应用列表")
-            self.recent_apps_list.addItem(hint_item)
+        # 只显示还未添加的应用，列表为空时模型显示提示信息
+        target_apps = set(self.get_target_apps())
+        self.recent_apps_model.set_items(app for app in recent_apps if app not in target_apps)
     
     def add_recent_app(self):
         """从最近应用列表添加选中的应用"""
-        current_item = self.recent_apps_list.currentItem()
-        if current_item and current_item.flags() & Qt.ItemFlag.ItemIsEnabled:
-            # 提取应用名称（移除 " (最近使用)" 后缀）
-            item_text = current_item.text()
-            if item_text.endswith(" (最近使用)"):
-                app_name = item_text[:-7]  # 移除 " (最近使用)"
-                self.add_target_app(app_name)
-                # 刷新最近应用列表
-                self.update_recent_apps()
+        index = self.recent_apps_list.currentIndex()
+        app_name = index.data(AppListModel.NameRole) if index.isValid() else None
+        if app_name:  # 占位提示没有名称
+            self.add_target_app(app_name)
+            # 刷新最近应用列表
+            self.update_recent_apps()
     
     def on_target_window_activated(self):
         """目标窗口激活"""
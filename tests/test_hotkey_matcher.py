@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+热键匹配状态机测试脚本
+"""
+
+from artalekey.core.hotkey_matcher import Binding, HotkeyMatcher
+
+def _press_all(matcher: HotkeyMatcher, keys: str, step_ms: int = 10):
+    """依次按下并释放按键（以空格分隔），相邻按键间隔 step_ms 毫秒"""
+    now = 0
+    for key in keys.split():
+        now += step_ms * 1_000_000
+        matcher.key_down(key, now)
+        matcher.key_up(key, now)
+
+def test_sequence_overlap():
+    """测试序列失配时回退到仍然匹配的前缀（重复按键开头的序列）"""
+    print("\n🔁 测试序列绑定重叠匹配...")
+
+    cases = [
+        ('a a b', 'a a a b', 1),
+        ('a a b', 'a a a a b', 1),
+        ('a b a c', 'a b a b a c', 1),
+        ('a b a b c', 'a b a b a b c', 1),
+        ('a a b', 'a a b a a b', 2),
+        ('a a b', 'a b a b', 0),
+        ('a b', 'b b a', 0),
+    ]
+    for keys, presses, expected in cases:
+        fired = []
+        matcher = HotkeyMatcher(fired.append)
+        matcher.set_bindings([Binding('seq', keys.split(), kind=Binding.SEQUENCE)])
+        _press_all(matcher, presses)
+        assert len(fired) == expected, (keys, presses, fired)
+    print(f"   ✓ {len(cases)}个输入序列匹配正确")
+
+def test_sequence_timeout():
+    """测试相邻按键超时后重新开始匹配"""
+    print("\n⏲️  测试序列绑定超时...")
+
+    fired = []
+    matcher = HotkeyMatcher(fired.append)
+    matcher.set_bindings([Binding('seq', ['a', 'a', 'b'], kind=Binding.SEQUENCE, timeout_ms=50)])
+    _press_all(matcher, 'a a b', step_ms=100)
+    assert fired == []
+    _press_all(matcher, 'a a a b', step_ms=10)
+    assert fired == ['seq']
+    print("   ✓ 超时后不触发，重新按下后触发")
+
+if __name__ == "__main__":
+    print("🚀 开始热键匹配测试\n" + "="*50)
+
+    test_sequence_overlap()
+    test_sequence_timeout()
+
+    print("\n" + "="*50)
+    print("✅ 测试完成")
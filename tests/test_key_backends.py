@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+按键输出后端测试脚本
+"""
+
+import os
+import sys
+import tempfile
+from artalekey.core import key_backends
+from artalekey.core.key_backends import (
+    BACKEND_ENV_VAR, FALLBACK_BACKEND, RecordingBackend, UInputBackend, XTestBackend,
+    create_backend, register_backend
+)
+
+def test_default_backend():
+    """测试未显式选择时使用pynput后端（使用模拟的pynput后端，无需显示环境）"""
+    print("\n⌨️  测试默认后端...")
+
+    class FakePynputBackend(RecordingBackend):
+        name = FALLBACK_BACKEND
+
+    saved_cls = key_backends._BACKENDS[FALLBACK_BACKEND]
+    register_backend(FALLBACK_BACKEND, FakePynputBackend)
+    saved = os.environ.pop(BACKEND_ENV_VAR, None)
+    try:
+        assert key_backends.DEFAULT_BACKEND == FALLBACK_BACKEND
+        backend = create_backend()
+        assert isinstance(backend, FakePynputBackend), backend
+        # 未知后端回退到pynput
+        assert isinstance(create_backend("no-such-backend"), FakePynputBackend)
+    finally:
+        register_backend(FALLBACK_BACKEND, saved_cls)
+        if saved is not None:
+            os.environ[BACKEND_ENV_VAR] = saved
+    print(f"   ✓ 默认后端: {backend.name}")
+
+def test_xtest_backend():
+    """测试XTest后端的按键码缓存和批量flush（使用模拟的X连接）"""
+    print("\n🖥️  测试XTest后端...")
+
+    if sys.platform in ("darwin", "win32"):
+        print("   跳过：仅适用于Linux")
+        return
+    try:
+        from Xlib import X, display as xdisplay
+        from Xlib.ext import xtest
+    except ImportError:
+        print("   跳过：未安装Xlib")
+        return
+
+    stats = {'lookups': 0, 'flushes': 0, 'events': []}
+
+    class FakeDisplay:
+        def __init__(self, name=None):
+            self.closed = False
+
+        def has_extension(self, name):
+            return name == 'XTEST'
+
+        def keysym_to_keycode(self, keysym):
+            stats['lookups'] += 1
+            return keysym & 0xff or 1
+
+        def flush(self):
+            stats['flushes'] += 1
+
+        def close(self):
+            self.closed = True
+
+    def fake_input(d, event_type, keycode):
+        stats['events'].append((event_type, keycode))
+
+    original_display, original_fake_input = xdisplay.Display, xtest.fake_input
+    xdisplay.Display, xtest.fake_input = FakeDisplay, fake_input
+    saved = os.environ.get(BACKEND_ENV_VAR)
+    try:
+        backend = XTestBackend()
+        backend.prepare(['up', 'w'])
+        lookups = stats['lookups']
+        for _ in range(10):
+            backend.press('up')
+            backend.release('up')
+        assert stats['lookups'] == lookups  # 按键码只解析一次
+        assert stats['flushes'] == 20
+
+        stats['events'].clear()
+        backend.send([(True, 'w'), (False, 'w'), (True, 'up'), (False, 'up')])
+        assert stats['flushes'] == 21  # 批量发送只flush一次
+        event_types = [e[0] for e in stats['events']]
+        assert event_types == [X.KeyPress, X.KeyRelease, X.KeyPress, X.KeyRelease]
+        try:
+            backend.press('no-such-key')
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("unknown key should raise")
+        backend.close()
+
+        # 通过环境变量显式选择
+        os.environ[BACKEND_ENV_VAR] = 'xtest'
+        assert isinstance(create_backend(), XTestBackend)
+    finally:
+        xdisplay.Display, xtest.fake_input = original_display, original_fake_input
+        if saved is None:
+            os.environ.pop(BACKEND_ENV_VAR, None)
+        else:
+            os.environ[BACKEND_ENV_VAR] = saved
+    print(f"   ✓ 解析按键码 {lookups}次, 批量事件 {len(stats['events'])}个")
+
+def test_uinput_backend():
+    """测试uinput后端的设备初始化和事件打包（使用普通文件代替 /dev/uinput）"""
+    print("\n🐧 测试uinput后端...")
+
+    try:
+        import fcntl
+    except ImportError:
+        print("   跳过：仅适用于Linux")
+        return
+
+    ioctls = []
+    original_ioctl = fcntl.ioctl
+    fcntl.ioctl = lambda fd, request, *args: ioctls.append(request)
+    path = os.path.join(tempfile.mkdtemp(), "uinput")
+    open(path, 'wb').close()
+    try:
+        backend = UInputBackend(path)
+        assert ioctls[0] == key_backends._UI_SET_EVBIT
+        assert ioctls[-2:] == [key_backends._UI_DEV_SETUP, key_backends._UI_DEV_CREATE]
+
+        backend.press('up')
+        backend.release('up')
+        backend.send([(True, 'w'), (False, 'w')])
+        backend.close()
+        assert ioctls[-1] == key_backends._UI_DEV_DESTROY
+    finally:
+        fcntl.ioctl = original_ioctl
+
+    event = key_backends._INPUT_EVENT
+    with open(path, 'rb') as f:
+        data = f.read()
+    events = [event.unpack_from(data, offset)[2:] for offset in range(0, len(data), event.size)]
+    key, syn = key_backends._EV_KEY, (key_backends._EV_SYN, key_backends._SYN_REPORT, 0)
+    assert events == [
+        (key, 103, 1), syn, (key, 103, 0), syn,
+        (key, 17, 1), syn, (key, 17, 0), syn,
+    ], events
+    print(f"   ✓ 写出事件 {len(events)}个")
+
+if __name__ == "__main__":
+    print("🚀 开始按键后端测试\n" + "="*50)
+
+    test_default_backend()
+    test_xtest_backend()
+    test_uinput_backend()
+
+    print("\n" + "="*50)
+    print("✅ 测试完成")
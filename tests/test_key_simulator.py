@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+按键模拟器测试脚本
+"""
+
+from artalekey.core.key_backends import RecordingBackend
+
+def test_stop_during_send():
+    """测试停止信号与正在发送的按键交错时，所有按键最终都被释放"""
+    print("\n🛑 测试发送按键时停止...")
+
+    try:
+        from artalekey.core.hotkey_manager import KeySimulator, PersistentKeySimulator
+    except ImportError as e:
+        print(f"   跳过：pynput不可用 ({e})")
+        return
+
+    class StopDuringSend(RecordingBackend):
+        """第三帧发送前调用stop()，模拟工作线程在等待返回与发送之间被停止"""
+        def __init__(self):
+            super().__init__()
+            self.simulator = None
+            self.sends = 0
+
+        def send(self, events):
+            self.sends += 1
+            if self.sends == 3:
+                self.simulator.stop()
+            super().send(events)
+
+    for simulator_class in (KeySimulator, PersistentKeySimulator):
+        backend = StopDuringSend()
+        simulator = simulator_class(backend=backend)
+        backend.simulator = simulator
+        simulator.set_interval(10)
+        simulator._armed = True  # 常驻模拟器的激活标志，直接在当前线程执行会话
+        simulator._run_session()
+
+        held = {}
+        for _, is_press, key in backend.events:
+            held[key] = is_press
+        assert backend.sends >= 3, backend.sends
+        assert not any(held.values()), held
+        assert not simulator.is_simulating()
+        simulator.deleteLater()
+    print(f"   ✓ 停止后无按住的按键: {sorted(map(str, held))}")
+
+if __name__ == "__main__":
+    print("🚀 开始按键模拟器测试\n" + "="*50)
+
+    test_stop_during_send()
+
+    print("\n" + "="*50)
+    print("✅ 测试完成")
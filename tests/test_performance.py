@@ -8,7 +8,25 @@ import time
 import threading
 import psutil
 import gc
-from artalekey.core.hotkey_manager import KeyboardManager, KeySimulator, HotkeyListener
+from pynput.keyboard import KeyCode
+from artalekey.core.async_detector import AsyncWindowDetector
+from artalekey.core.event_queue import KeyEventRing
+from artalekey.core.helper_process import HelperProcess
+from artalekey.core.hotkey_manager import (
+    KeyboardManager, KeySimulator, PersistentKeySimulator, HotkeyListener
+)
+from artalekey.core.hotkey_matcher import Binding, HotkeyMatcher
+from artalekey.core.key_backends import RecordingBackend
+from artalekey.core.key_sequence import DEFAULT_SEQUENCE, compile_sequence
+from artalekey.core.timer_wheel import TimerWheel
+from artalekey.core.timing import (
+    AdaptivePollingPolicy, CatchUpPolicy, DeadlineScheduler, SleepWaiter, HybridWaiter
+)
+from artalekey.core.process_index import ProcessIndex
+from artalekey.core.search_index import AppSearchIndex
+from artalekey.core.target_matcher import TargetMatcher
+from artalekey.core.window_detector import ActiveWindowMonitor, WindowDetector, WindowInfo
+from artalekey.core.window_history import WindowHistory
 from artalekey.core.config import config_manager
 from artalekey.core.logger import performance_logger
 
@@ -78,6 +96,907 @@ class PerformanceTest:
         
         simulator.deleteLater()
     
+    def test_deadline_scheduler(self):
+        """测试绝对时间线调度在负载下的节拍精度"""
+        print("⏱️  测试deadline调度精度...")
+        
+        # 后台忙碌线程模拟繁忙的机器
+        busy = threading.Event()
+        def burn():
+            while not busy.is_set():
+                sum(range(1000))
+        burner = threading.Thread(target=burn, daemon=True)
+        burner.start()
+        
+        period_ns = 40 * 1_000_000
+        cycles = 25
+        stop_event = threading.Event()
+        waiter = SleepWaiter(stop_event)
+        
+        # 相对计时：每轮从当前时刻重新计时，延迟会累积
+        start_time = time.perf_counter_ns()
+        for _ in range(cycles):
+            waiter.wait_until(time.perf_counter_ns() + period_ns)
+        relative_ms = (time.perf_counter_ns() - start_time) / 1e6
+        
+        # 绝对时间线：每轮对齐固定截止时间
+        scheduler = DeadlineScheduler(period_ns, CatchUpPolicy.SKIP)
+        scheduler.reset()
+        start_time = scheduler.cycle_start_ns
+        for _ in range(cycles):
+            scheduler.next_cycle()
+            deadline = scheduler.deadline(0)
+            waiter.wait_until(deadline)
+            scheduler.record_lateness(time.perf_counter_ns() - deadline)
+        deadline_ms = (time.perf_counter_ns() - start_time) / 1e6
+        busy.set()
+        
+        expected_ms = cycles * period_ns / 1e6
+        stats = scheduler.get_stats()
+        print(f"   ✓ 期望耗时: {expected_ms:.1f}ms")
+        print(f"   ✓ 相对计时耗时: {relative_ms:.1f}ms (漂移 {relative_ms - expected_ms:+.1f}ms)")
+        print(f"   ✓ deadline耗时: {deadline_ms:.1f}ms (漂移 {deadline_ms - expected_ms:+.1f}ms)")
+        print(f"   ✓ 平均延迟: {stats['mean_lateness_ms']:.3f}ms, "
+              f"最大延迟: {stats['max_lateness_ms']:.3f}ms")
+        
+        # 落后1.5个周期时: SKIP对齐到下一个节拍，CATCH_UP从错过的周期开始补发
+        for policy, expected_start in ((CatchUpPolicy.SKIP, 3 * period_ns),
+                                       (CatchUpPolicy.CATCH_UP, period_ns)):
+            late = DeadlineScheduler(period_ns, policy)
+            late.reset(0)
+            late.next_cycle(now_ns=2 * period_ns + period_ns // 2)
+            assert late.cycle_start_ns == expected_start, (policy, late.cycle_start_ns)
+        for now_ns, expected_start in ((2 * period_ns, 2 * period_ns),  # 恰好在节拍上
+                                       (period_ns + period_ns // 10, period_ns)):  # 容差内
+            late = DeadlineScheduler(period_ns, CatchUpPolicy.SKIP)
+            late.reset(0)
+            late.next_cycle(now_ns=now_ns)
+            assert late.cycle_start_ns == expected_start, (now_ns, late.cycle_start_ns)
+        print("   ✓ SKIP策略落后时对齐到下一个节拍")
+        
+        # 按键模拟器的deadline模式
+        simulator = KeySimulator()
+        simulator.set_scheduler_mode('deadline')
+        simulator.set_interval(40)
+        simulator.start()
+        time.sleep(0.5)
+        simulator.stop()
+        simulator.wait(1000)
+        sim_stats = simulator.get_timing_stats()
+        if sim_stats:
+            print(f"   ✓ 模拟器周期数: {sim_stats['cycles']}, 跳过: {sim_stats['skipped_cycles']}, "
+                  f"最大延迟: {sim_stats['max_lateness_ms']:.3f}ms")
+        simulator.deleteLater()
+    
+    def test_hybrid_waiter(self):
+        """测试混合睡眠+忙等待在短间隔下的精度和CPU占用"""
+        print("🎯 测试高精度计时引擎...")
+        
+        stop_event = threading.Event()
+        interval_ns = 5 * 1_000_000  # 5ms间隔
+        samples = 100
+        
+        for name, waiter in (("Event.wait", SleepWaiter(stop_event)),
+                             ("睡眠+忙等待", HybridWaiter(stop_event))):
+            errors = []
+            self.process.cpu_percent()
+            deadline = time.perf_counter_ns()
+            for _ in range(samples):
+                deadline += interval_ns
+                waiter.wait_until(deadline)
+                errors.append((time.perf_counter_ns() - deadline) / 1e6)
+            cpu = self.process.cpu_percent()
+            avg_error = sum(errors) / len(errors)
+            print(f"   ✓ {name}: 平均误差 {avg_error:.3f}ms, 最大误差 {max(errors):.3f}ms, "
+                  f"CPU {cpu:.1f}%")
+            if isinstance(waiter, HybridWaiter):
+                stats = waiter.get_stats()
+                print(f"   ✓ 忙等待占比: {stats['spin_ratio'] * 100:.1f}%, "
+                      f"受预算限制次数: {stats['budget_limited']}, "
+                      f"睡过截止时间次数: {stats['overslept']}")
+    
+    def test_recording_backend(self):
+        """使用内存记录后端无头测量模拟器吞吐量和抖动"""
+        print("📼 测试模拟器吞吐量与抖动（记录后端）...")
+        
+        interval_ms = 20
+        for mode in ('relative', 'deadline'):
+            backend = RecordingBackend()
+            simulator = KeySimulator(backend=backend)
+            simulator.set_scheduler_mode(mode)
+            simulator.set_interval(interval_ms)
+            
+            simulator.start()
+            time.sleep(1.0)
+            simulator.stop()
+            simulator.wait(1000)
+            
+            intervals = backend.get_press_intervals()[1:]  # 跳过起始空格键
+            if not intervals:
+                print(f"   ⚠️  {mode}: 没有记录到按键事件")
+                continue
+            mean = sum(intervals) / len(intervals)
+            jitter = (sum((i - mean) ** 2 for i in intervals) / len(intervals)) ** 0.5
+            print(f"   ✓ {mode}: {len(backend.events)}个事件, 平均按下间隔 {mean:.3f}ms "
+                  f"(目标 {interval_ms}ms), 抖动 {jitter:.3f}ms")
+            simulator.deleteLater()
+    
+    def test_sequence_engine(self):
+        """测试按键序列编译和循环分发开销"""
+        print("🧩 测试按键序列引擎...")
+        
+        # 编译耗时
+        start_time = time.perf_counter()
+        for i in range(1000):
+            compile_sequence(DEFAULT_SEQUENCE, 10 + i % 100)
+        duration = (time.perf_counter() - start_time) * 1000
+        print(f"   ✓ 1000次序列编译耗时: {duration:.2f}ms")
+        
+        # 循环分发开销：编译后的帧 vs 硬编码分支
+        compiled = compile_sequence(DEFAULT_SEQUENCE, 40)
+        backend = RecordingBackend()
+        cycles = 20000
+        
+        start_time = time.perf_counter()
+        send = backend.send
+        for _ in range(cycles):
+            for _offset_ns, events in compiled.frames:
+                send(events)
+        compiled_us = (time.perf_counter() - start_time) * 1e6 / cycles
+        backend.clear()
+        
+        steps = ((0, True, 'left'), (1, False, 'left'), (1, True, 'right'), (2, False, 'right'))
+        keys_pressed = set()
+        start_time = time.perf_counter()
+        for _ in range(cycles):
+            for _offset, is_press, key in steps:
+                if is_press:
+                    backend.press(key)
+                    keys_pressed.add(key)
+                else:
+                    backend.release(key)
+                    keys_pressed.discard(key)
+        hardcoded_us = (time.perf_counter() - start_time) * 1e6 / cycles
+        backend.clear()
+        
+        print(f"   ✓ 每周期分发开销: 编译序列 {compiled_us:.2f}us, 硬编码循环 {hardcoded_us:.2f}us")
+        
+        # 自定义移动模式
+        backend = RecordingBackend()
+        simulator = KeySimulator(backend=backend)
+        simulator.set_interval(20)
+        simulator.set_sequence("hold space; repeat { press left; wait 2; release left; wait }")
+        simulator.start()
+        time.sleep(0.3)
+        simulator.stop()
+        simulator.wait(1000)
+        print(f"   ✓ 自定义序列记录到 {len(backend.events)} 个事件")
+        simulator.deleteLater()
+    
+    def test_activation_latency(self):
+        """测试激活到第一次按键的延迟：每次新建线程 vs 常驻工作线程"""
+        print("⚡ 测试激活延迟...")
+        
+        def measure(simulator, backend, rounds=30):
+            latencies = []
+            for _ in range(rounds):
+                backend.clear()
+                start_ns = time.perf_counter_ns()
+                simulator.activate()
+                deadline = time.perf_counter() + 1.0
+                while not backend.events and time.perf_counter() < deadline:
+                    time.sleep(0)
+                if backend.events:
+                    latencies.append((backend.events[0][0] - start_ns) / 1e3)
+                simulator.stop()
+                # 等待本次会话结束
+                if isinstance(simulator, PersistentKeySimulator):
+                    while simulator.is_simulating():
+                        time.sleep(0.001)
+                else:
+                    simulator.wait(1000)
+                time.sleep(0.01)  # 让线程回到空闲状态再测下一轮
+            return latencies
+        
+        backend = RecordingBackend()
+        simulator = KeySimulator(backend=backend)
+        before = measure(simulator, backend)
+        simulator.deleteLater()
+        
+        backend = RecordingBackend()
+        simulator = PersistentKeySimulator(backend=backend)
+        simulator.start()
+        time.sleep(0.05)  # 等待工作线程进入挂起状态
+        after = measure(simulator, backend)
+        simulator.shutdown()
+        simulator.deleteLater()
+        
+        for name, latencies in (("每次新建线程", before), ("常驻工作线程", after)):
+            if latencies:
+                latencies.sort()
+                print(f"   ✓ {name}: 中位数 {latencies[len(latencies) // 2]:.1f}us, "
+                      f"最大 {latencies[-1]:.1f}us")
+    
+    def test_timer_wheel(self):
+        """测试快速连按时长按定时器的线程开销：threading.Timer vs 时间轮"""
+        print("🕰️  测试长按定时器...")
+        
+        taps = 500
+        
+        # 旧方案：每次按下新建一个Timer线程，释放时取消
+        threads_before = threading.active_count()
+        peak_threads = 0
+        start_time = time.perf_counter()
+        for _ in range(taps):
+            timer = threading.Timer(0.5, lambda: None)
+            timer.start()
+            peak_threads = max(peak_threads, threading.active_count())
+            timer.cancel()
+        timer_ms = (time.perf_counter() - start_time) * 1000
+        time.sleep(0.05)
+        
+        # 新方案：单个调度线程的时间轮
+        wheel = TimerWheel()
+        fired = []
+        start_time = time.perf_counter()
+        for _ in range(taps):
+            handle = wheel.schedule(0.5, lambda: None)
+            handle.cancel()
+        wheel_ms = (time.perf_counter() - start_time) * 1000
+        
+        # 验证定时精度
+        start_ns = time.perf_counter_ns()
+        wheel.schedule(0.1, lambda: fired.append(time.perf_counter_ns()))
+        time.sleep(0.2)
+        stats = wheel.get_stats()
+        
+        print(f"   ✓ threading.Timer: {taps}次按下/取消耗时 {timer_ms:.2f}ms, 创建线程 {taps}个, "
+              f"峰值线程数 {peak_threads} (基线 {threads_before})")
+        print(f"   ✓ 时间轮: {taps}次按下/取消耗时 {wheel_ms:.2f}ms, "
+              f"创建线程 {stats['threads_started']}个")
+        if fired:
+            print(f"   ✓ 100ms定时器实际触发: {(fired[0] - start_ns) / 1e6:.2f}ms")
+    
+    def test_hotkey_matcher(self):
+        """测试热键匹配在大量绑定下的单事件开销"""
+        print("🎹 测试热键匹配器...")
+        
+        events = 20000
+        for binding_count in (1, 100, 1000):
+            matcher = HotkeyMatcher(lambda binding_id: None)
+            bindings = [Binding('default', ('w', 'up'), kind=Binding.HOLD, hold_ms=500)]
+            for i in range(binding_count - 1):
+                bindings.append(Binding(f'chord{i}', (f'f{i % 24}', f'vk{i}')))
+            matcher.set_bindings(bindings)
+            
+            start_time = time.perf_counter()
+            for _ in range(events // 2):
+                matcher.key_down('a')
+                matcher.key_up('a')
+            idle_us = (time.perf_counter() - start_time) * 1e6 / events
+            
+            start_time = time.perf_counter()
+            for _ in range(events // 2):
+                matcher.key_down('w')
+                matcher.key_up('w')
+            bound_us = (time.perf_counter() - start_time) * 1e6 / events
+            
+            print(f"   ✓ {binding_count}个绑定: 无关按键 {idle_us:.2f}us/事件, "
+                  f"绑定按键 {bound_us:.2f}us/事件")
+    
+    def test_dispatch_queue(self):
+        """测试回调入队开销、消费吞吐和队列满时的丢弃计数"""
+        print("📬 测试按键分发队列...")
+        
+        events = 100000
+        ring = KeyEventRing(1024)
+        consumed = []
+        
+        def consume():
+            while not ring.closed:
+                ring.wait()
+                ring.drain(consumed.append)
+                
+        consumer = threading.Thread(target=consume, daemon=True)
+        consumer.start()
+        
+        start_time = time.perf_counter()
+        for i in range(events):
+            ring.push((i, 'w', True))
+        push_us = (time.perf_counter() - start_time) * 1e6 / events
+        ring.close()
+        consumer.join(5)
+        ring.drain(consumed.append)
+        stats = ring.get_stats()
+        in_order = all(consumed[i][0] < consumed[i + 1][0] for i in range(len(consumed) - 1))
+        print(f"   ✓ 入队: {push_us:.3f}us/事件, 消费 {stats['consumed']}个, "
+              f"丢弃 {stats['dropped']}个, 最大深度 {stats['max_depth']}, 顺序保持: {in_order}")
+        
+        # 消费者停滞时，生产者不阻塞，只丢弃并计数
+        stalled = KeyEventRing(64)
+        start_time = time.perf_counter()
+        for i in range(1000):
+            stalled.push((i, 'w', True))
+        stalled_us = (time.perf_counter() - start_time) * 1e6 / 1000
+        stats = stalled.get_stats()
+        print(f"   ✓ 消费停滞: {stalled_us:.3f}us/事件, 缓冲 {stats['depth']}个, "
+              f"丢弃 {stats['dropped']}个")
+        
+        # 回调只做归一化和入队，对比直接匹配的耗时
+        listener = HotkeyListener(dispatch_mode='queue')
+        direct = HotkeyListener()
+        for name, target in (('直接匹配', direct), ('队列分发', listener)):
+            start_time = time.perf_counter()
+            for _ in range(events // 2):
+                target._on_press(KeyCode.from_char('w'))
+                target._on_release(KeyCode.from_char('w'))
+            callback_us = (time.perf_counter() - start_time) * 1e6 / events
+            print(f"   ✓ {name}: 回调 {callback_us:.2f}us/事件")
+        print(f"   ✓ 队列统计: {listener.get_dispatch_stats()}")
+        
+        # queue模式下活动回调不在pynput回调线程上执行，由消费线程调用
+        activity_threads = []
+        listener = HotkeyListener(dispatch_mode='queue')
+        listener.set_activity_callback(lambda: activity_threads.append(threading.get_ident()))
+        listener._on_press(KeyCode.from_char('q'))  # 未绑定的按键也算作活动
+        assert activity_threads == []
+        consumer = threading.Thread(
+            target=listener._event_ring.drain, args=(listener._handle_queued_event,))
+        consumer.start()
+        consumer.join(5)
+        assert activity_threads == [consumer.ident], activity_threads
+        print("   ✓ 活动回调在消费线程上执行")
+        
+    def test_listener_idle_wakeups(self):
+        """测试热键监听线程空闲时的上下文切换次数和停止耗时"""
+        print("😴 测试监听线程空闲唤醒...")
+        
+        idle_sec = 1.0
+        
+        def total_switches():
+            # Linux上进程级计数只反映主线程，逐线程累加
+            total = 0
+            for thread in self.process.threads():
+                try:
+                    total += psutil.Process(thread.id).num_ctx_switches().voluntary
+                except psutil.Error:
+                    pass
+            return total or self.process.num_ctx_switches().voluntary
+        
+        def count_switches(duration):
+            before = total_switches()
+            time.sleep(duration)
+            return total_switches() - before
+        
+        baseline = count_switches(idle_sec)
+        
+        # 旧实现：每50ms醒来检查一次运行标志
+        polling = threading.Event()
+        
+        def poll_loop():
+            while not polling.is_set():
+                time.sleep(0.05)
+                
+        poller = threading.Thread(target=poll_loop, daemon=True)
+        poller.start()
+        polling_switches = count_switches(idle_sec)
+        start_time = time.perf_counter()
+        polling.set()
+        poller.join()
+        polling_stop_ms = (time.perf_counter() - start_time) * 1000
+        
+        listener = HotkeyListener(dispatch_mode='queue')
+        listener.start()
+        time.sleep(0.1)  # 等待监听器启动
+        listener_switches = count_switches(idle_sec)
+        start_time = time.perf_counter()
+        listener.stop()
+        listener_stop_ms = (time.perf_counter() - start_time) * 1000
+        
+        print(f"   ✓ 基线: {baseline}次上下文切换/{idle_sec:.0f}s")
+        print(f"   ✓ 50ms轮询: {polling_switches - baseline:+d}次/{idle_sec:.0f}s, "
+              f"停止耗时 {polling_stop_ms:.2f}ms")
+        print(f"   ✓ 事件驱动监听: {listener_switches - baseline:+d}次/{idle_sec:.0f}s, "
+              f"停止耗时 {listener_stop_ms:.2f}ms, 已退出: {listener.isFinished()}")
+        
+    def test_process_name_cache(self):
+        """测试进程名缓存相对每次读取进程信息的开销"""
+        print("🗂️  测试进程名缓存...")
+        
+        lookups = 5000
+        pid = self.process.pid
+        detector = WindowDetector()
+        performance_logger.reset_counters("process_name_cache.")
+        
+        start_time = time.perf_counter()
+        for _ in range(lookups):
+            psutil.Process(pid).name()
+        uncached_us = (time.perf_counter() - start_time) * 1e6 / lookups
+        
+        start_time = time.perf_counter()
+        for _ in range(lookups):
+            detector.get_process_name(pid)
+        lru_us = (time.perf_counter() - start_time) * 1e6 / lookups
+        
+        start_time = time.perf_counter()
+        for _ in range(lookups):
+            detector.get_process_name(pid, window_id=42)
+        fast_us = (time.perf_counter() - start_time) * 1e6 / lookups
+        
+        print(f"   ✓ 每次读取: {uncached_us:.2f}us/次")
+        print(f"   ✓ (pid, 启动时间)缓存: {lru_us:.2f}us/次")
+        print(f"   ✓ 同窗口快速路径: {fast_us:.2f}us/次")
+        print(f"   ✓ 计数器: {performance_logger.get_counters('process_name_cache.')}")
+        
+    def test_process_index(self):
+        """测试大进程表下增量进程索引与全量扫描的耗时"""
+        print("📇 测试增量进程枚举...")
+        
+        process_count = 6000
+        table = {pid: f"app{pid % 800}" for pid in range(1000, 1000 + process_count)}
+        reads = [0]
+        
+        def read_name(pid):
+            reads[0] += 1
+            return table.get(pid)
+        
+        # 原实现：每次读取全部进程名，并在列表上去重
+        start_time = time.perf_counter()
+        processes = []
+        for pid in list(table):
+            name = read_name(pid)
+            if name and name not in processes:
+                processes.append(name)
+        full = sorted(processes)
+        full_ms = (time.perf_counter() - start_time) * 1000
+        
+        index = ProcessIndex(list_pids=lambda: table.keys(), read_name=read_name,
+                             read_identity=table.get)
+        start_time = time.perf_counter()
+        index.refresh()
+        initial_ms = (time.perf_counter() - start_time) * 1000
+        assert list(index.snapshot()) == full
+        
+        # 每轮约1%的进程退出、新进程启动
+        rounds = 20
+        next_pid = 1000 + process_count
+        reads[0] = 0
+        start_time = time.perf_counter()
+        for round_index in range(rounds):
+            for pid in list(table)[:process_count // 100]:
+                del table[pid]
+            for _ in range(process_count // 100):
+                table[next_pid] = f"new{round_index}-{next_pid % 7}"
+                next_pid += 1
+            index.refresh()
+        incremental_ms = (time.perf_counter() - start_time) * 1000 / rounds
+        assert list(index.snapshot()) == sorted(set(table.values()))
+        
+        start_time = time.perf_counter()
+        changed = index.refresh()
+        unchanged_ms = (time.perf_counter() - start_time) * 1000
+        
+        print(f"   ✓ {process_count}个进程全量扫描+列表去重: {full_ms:.2f}ms")
+        print(f"   ✓ 增量索引首次扫描: {initial_ms:.2f}ms")
+        print(f"   ✓ 1%进程变化时刷新: {incremental_ms:.2f}ms/次, "
+              f"平均读取 {reads[0] / rounds:.0f}个进程名")
+        print(f"   ✓ 无变化时刷新: {unchanged_ms:.2f}ms, 名称变化: {changed}")
+        print(f"   ✓ 索引统计: {index.get_stats()}")
+        
+    def test_app_list_refresh(self):
+        """测试应用列表刷新在GUI线程上的阻塞时间"""
+        print("🔄 测试后台应用列表刷新...")
+        
+        from PyQt6.QtWidgets import QApplication
+        app = QApplication.instance()
+        if app is None:
+            print("   跳过：需要QApplication")
+            return
+        from artalekey.ui.target_app_selector import TargetAppSelector
+        
+        selector = TargetAppSelector()
+        selector.wait_for_refresh()
+        app.processEvents()
+        
+        start_time = time.perf_counter()
+        apps = selector.detector.get_running_applications()
+        sync_ms = (time.perf_counter() - start_time) * 1000
+        
+        # 连续触发多次刷新，只有最后一次的结果会被采用
+        rounds = 10
+        start_time = time.perf_counter()
+        for _ in range(rounds):
+            selector.refresh_available_apps()
+        gui_ms = (time.perf_counter() - start_time) * 1000 / rounds
+        selector.wait_for_refresh()
+        app.processEvents()
+        
+        print(f"   ✓ 同步枚举: {sync_ms:.2f}ms ({len(apps)}个应用)")
+        print(f"   ✓ 后台刷新GUI线程耗时: {gui_ms:.3f}ms/次")
+        print(f"   ✓ 可用列表: {selector.available_model.rowCount()}项")
+        selector.deleteLater()
+        
+    def test_app_list_model(self):
+        """测试数千个进程时搜索过滤和刷新的UI开销"""
+        print("📋 测试应用列表模型...")
+        
+        from PyQt6.QtWidgets import QApplication, QListView, QListWidget
+        if QApplication.instance() is None:
+            print("   跳过：需要QApplication")
+            return
+        from artalekey.ui.app_list_model import AppListModel
+        
+        apps = sorted(f"Application {i:05d}" for i in range(5000))
+        queries = ["a", "ap", "app", "appl", "appli", "applic",
+                   "application 0", "application 01", ""]
+        
+        # 原实现：每次按键清空并重新添加所有匹配项
+        widget = QListWidget()
+        start_time = time.perf_counter()
+        for query in queries:
+            widget.clear()
+            for app in apps:
+                if query in app.lower():
+                    widget.addItem(app)
+        widget_ms = (time.perf_counter() - start_time) * 1000 / len(queries)
+        
+        model = AppListModel()
+        view = QListView()
+        view.setModel(model)
+        view.setUniformItemSizes(True)
+        model.set_items(apps)
+        index = AppSearchIndex(apps)
+        start_time = time.perf_counter()
+        for query in queries:
+            model.set_items(index.search(query))
+        model_ms = (time.perf_counter() - start_time) * 1000 / len(queries)
+        
+        # 刷新时1%的进程变化
+        changed = sorted(apps[50:] + [f"New App {i}" for i in range(50)])
+        start_time = time.perf_counter()
+        model.set_items(changed)
+        diff_ms = (time.perf_counter() - start_time) * 1000
+        assert model.items() == changed
+        
+        print(f"   ✓ QListWidget清空重建: {widget_ms:.2f}ms/次按键")
+        print(f"   ✓ 模型差异更新: {model_ms:.2f}ms/次按键")
+        print(f"   ✓ 1%变化差异更新: {diff_ms:.2f}ms")
+        
+    def test_search_index(self):
+        """测试搜索索引的逐键响应时间和增量更新开销"""
+        print("🔎 测试应用搜索索引...")
+        
+        prefixes = ['com.apple.', 'org.kde.', '', 'gnome-', 'python-', 'kworker/']
+        words = ['Safari', 'Chrome', 'Code', 'Maple', 'Story',
+                 'Term', 'Finder', 'Mail', 'Music', 'Notes']
+        apps = [f"{prefixes[i % len(prefixes)]}{words[i % len(words)]}{i}" for i in range(6000)]
+        typing = ["m", "ma", "map", "mapl", "maple", "maple1", "maple12",
+                  "c", "ch", "chr", "chro", "chrom", "chrome", "s", "st", "sto"]
+        rounds = 5
+        
+        start_time = time.perf_counter()
+        index = AppSearchIndex(apps)
+        build_ms = (time.perf_counter() - start_time) * 1000
+        
+        # 原实现：每次按键对全部名称小写化后做子串判断
+        start_time = time.perf_counter()
+        for _ in range(rounds):
+            for query in typing:
+                [app for app in apps if query in app.lower()]
+        linear_ms = (time.perf_counter() - start_time) * 1000 / (rounds * len(typing))
+        
+        timings = []
+        for _ in range(rounds):
+            for query in typing:
+                start_time = time.perf_counter()
+                results = index.search(query)
+                timings.append((time.perf_counter() - start_time) * 1000)
+                # 有子串匹配时不混入模糊结果
+                assert set(results) == {app for app in apps if query in app.lower()}
+        index_ms = sum(timings) / len(timings)
+        
+        # 没有子串匹配时的模糊匹配，取多次中最快的一次排除调度抖动
+        fuzzy_timings = []
+        for _ in range(rounds):
+            index.search("x")
+            start_time = time.perf_counter()
+            fuzzy = index.search('mpl')
+            fuzzy_timings.append((time.perf_counter() - start_time) * 1000)
+        fuzzy_ms = min(fuzzy_timings)
+        
+        # 1%名称变化时增量更新
+        changed = apps[60:] + [f"NewApp{i}" for i in range(60)]
+        start_time = time.perf_counter()
+        index.set_names(changed)
+        update_ms = (time.perf_counter() - start_time) * 1000
+        
+        print(f"   ✓ 建立索引: {len(apps)}个名称 {build_ms:.2f}ms, "
+              f"1%变化增量更新 {update_ms:.2f}ms")
+        print(f"   ✓ 线性过滤: {linear_ms:.3f}ms/次按键")
+        print(f"   ✓ 索引搜索: 平均 {index_ms:.3f}ms/次按键, 最慢 {max(timings):.3f}ms")
+        print(f"   ✓ 排名示例 'maple1': {index.search('maple1', limit=3)}")
+        print(f"   ✓ 无子串匹配时模糊匹配 'mpl': {len(fuzzy)}个结果 {fuzzy_ms:.3f}ms, {fuzzy[:3]}")
+        assert index_ms < linear_ms, (index_ms, linear_ms)
+        assert len(fuzzy) == AppSearchIndex.FUZZY_LIMIT and fuzzy_ms < 1.0, fuzzy_ms
+        
+    def test_target_matcher(self):
+        """测试每次轮询判断目标窗口的开销"""
+        print("🎯 测试目标进程匹配...")
+        
+        polls = 20000
+        targets = [f"Game{i}.exe" for i in range(50)] + ["MapleStory Worlds"]
+        process_names = ["Google Chrome", "MapleStory Worlds.app", "Terminal"]
+        
+        # 原实现：每次轮询遍历所有目标并重复去扩展名
+        target_set = {name.lower() for name in targets}
+        
+        def legacy_match(process_name):
+            process_name_lower = process_name.lower()
+            if process_name_lower in target_set:
+                return True
+            process_base = process_name_lower.replace('.exe', '').replace('.app', '')
+            for target in target_set:
+                if process_base == target.replace('.exe', '').replace('.app', ''):
+                    return True
+            return False
+        
+        start_time = time.perf_counter()
+        for i in range(polls):
+            legacy_match(process_names[i % 3])
+        legacy_us = (time.perf_counter() - start_time) * 1e6 / polls
+        
+        matcher = TargetMatcher(targets + ["re:^steam", "Epic*"])
+        start_time = time.perf_counter()
+        for i in range(polls):
+            matcher.matches(process_names[i % 3])
+        matcher_us = (time.perf_counter() - start_time) * 1e6 / polls
+        
+        print(f"   ✓ 逐个比较{len(targets)}个目标: {legacy_us:.2f}us/次")
+        print(f"   ✓ 预编译匹配器(含通配符和正则): {matcher_us:.2f}us/次")
+        
+    def test_window_history(self):
+        """测试窗口切换时更新历史记录并读取最近应用的开销"""
+        print("🕘 测试窗口历史记录...")
+        
+        from collections import deque
+        switches = 5000
+        size = 200
+        windows = [WindowInfo(i, f"title{i}", f"app{i % 300}", i) for i in range(1000)]
+        
+        # 原实现：deque.remove + 每次按时间排序整个历史
+        history, lookup = deque(maxlen=size), {}
+        start_time = time.perf_counter()
+        for i in range(switches):
+            window = windows[i % len(windows)]
+            entry = [window, i]  # (窗口, 最后活跃时间)
+            key = window.process_name.lower()
+            if key in lookup:
+                try:
+                    history.remove(lookup[key])
+                except ValueError:
+                    pass
+            lookup[key] = entry
+            history.append(entry)
+            by_time = sorted(history, key=lambda e: e[1], reverse=True)
+            legacy_recent = [e[0].process_name for e in by_time][:10]
+        legacy_us = (time.perf_counter() - start_time) * 1e6 / switches
+        
+        lru = WindowHistory(max_size=size)
+        start_time = time.perf_counter()
+        for i in range(switches):
+            lru.touch(windows[i % len(windows)], i)
+            lru_recent = lru.recent(10)
+        lru_us = (time.perf_counter() - start_time) * 1e6 / switches
+        assert lru_recent == legacy_recent, (lru_recent, legacy_recent)
+        
+        print(f"   ✓ deque+排序 ({size}条): {legacy_us:.2f}us/次切换")
+        print(f"   ✓ LRU ({size}条): {lru_us:.2f}us/次切换")
+        
+    def test_window_info_reuse(self):
+        """测试窗口未变化时监控循环的对象分配"""
+        print("🧱 测试窗口信息复用...")
+        
+        import sys
+        polls = 10000
+        detector = WindowDetector()
+        monitor = ActiveWindowMonitor()
+        monitor.set_target_processes(["MapleStory Worlds"])
+        title = "MapleStory Worlds - Artale"
+        
+        def poll_loop(make_window):
+            windows = []
+            start_time = time.perf_counter()
+            for _ in range(polls):
+                window = make_window(1234, title, "MapleStory Worlds", 42)
+                monitor._process_window(window)
+                windows.append(window)
+            elapsed_us = (time.perf_counter() - start_time) * 1e6 / polls
+            return len({id(window) for window in windows}), elapsed_us
+        
+        legacy_objects, legacy_us = poll_loop(WindowInfo)
+        reused_objects, reused_us = poll_loop(detector._window_info)
+        window = WindowInfo(1234, title, "MapleStory Worlds", 42)
+        
+        print(f"   ✓ WindowInfo实例大小: {sys.getsizeof(window)}字节 (无__dict__)")
+        print(f"   ✓ 每次轮询新建实例: {legacy_objects}个对象/{polls}次, {legacy_us:.2f}us/次")
+        print(f"   ✓ 复用上次实例: {reused_objects}个对象/{polls}次, {reused_us:.2f}us/次")
+        
+    def test_adaptive_polling(self):
+        """测试自适应轮询的唤醒次数和键盘活动后的恢复延迟"""
+        print("📉 测试自适应轮询...")
+        
+        # 模拟5分钟内窗口不变的稳定期（虚拟时钟）
+        duration = 300.0
+        fixed_wakeups = int(duration / 0.5)
+        policy = AdaptivePollingPolicy(min_interval=0.1, max_interval=2.0)
+        now = 0.0
+        policy.reset(now)
+        while now < duration:
+            policy.record_poll(now == 0.0, now)
+            now += policy.interval
+        stats = policy.get_stats(now)
+        print(f"   ✓ 固定0.5秒轮询: {fixed_wakeups}次唤醒/5分钟, 120.0次/分钟")
+        print(f"   ✓ 自适应轮询: {stats['polls']}次唤醒/5分钟, "
+              f"稳定后{stats['wakeups_per_minute']:.1f}次/分钟")
+        
+        # 稳定期间焦点变化的检测延迟上限
+        policy.record_poll(True, now)
+        print(f"   ✓ 稳定期焦点变化检测延迟上限: {policy.get_stats(now)['max_latency_ms']:.0f}ms")
+        
+        # 退避到最长间隔后，键盘活动立即唤醒等待
+        policy = AdaptivePollingPolicy(min_interval=0.1, max_interval=2.0, fast_polls=0)
+        for _ in range(20):
+            policy.record_poll(False)
+        latencies = []
+        for _ in range(5):
+            woke_at = []
+            waiter = threading.Thread(
+                target=lambda woke_at=woke_at: (policy.wait(),
+                                                woke_at.append(time.perf_counter())))
+            waiter.start()
+            time.sleep(0.05)
+            notified_at = time.perf_counter()
+            policy.notify_activity()
+            waiter.join(3.0)
+            latencies.append((woke_at[0] - notified_at) * 1000)
+            for _ in range(20):
+                policy.record_poll(False)
+        print(f"   ✓ 退避间隔: {policy.interval * 1000:.0f}ms, "
+              f"键盘活动唤醒延迟: 平均{sum(latencies) / len(latencies):.2f}ms, "
+              f"最大{max(latencies):.2f}ms")
+        
+    def test_focus_snapshot(self):
+        """测试热键触发时读取焦点状态的开销"""
+        print("📸 测试焦点快照...")
+        
+        iterations = 100000
+        monitor = ActiveWindowMonitor()
+        monitor.set_target_processes(["MapleStory Worlds"])
+        window = WindowInfo(1234, "MapleStory Worlds - Artale", "MapleStory Worlds", 42)
+        monitor._process_window(window)
+        
+        # 原实现：持有监控器的RLock读取目标状态
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            with monitor._lock:
+                active = monitor._snapshot.is_target
+        assert active
+        locked_ns = (time.perf_counter() - start_time) * 1e9 / iterations
+        
+        start_time = time.perf_counter()
+        for _ in range(iterations):
+            monitor.is_target_window_active()
+        snapshot_ns = (time.perf_counter() - start_time) * 1e9 / iterations
+        print(f"   ✓ 加锁读取: {locked_ns:.0f}ns/次, 无锁快照读取: {snapshot_ns:.0f}ns/次")
+        
+        # 触发前同步复查：平台不支持快速查询时用返回固定窗口的检测器测量自身开销
+        detector = WindowDetector()
+        if detector.supports_fast_query():
+            label = "实际检测"
+        else:
+            label = "模拟检测，当前平台不支持快速查询"
+            detector.supports_fast_query = lambda: True
+            detector.get_active_window = lambda: window
+        monitor._verify_detector = detector
+        samples = []
+        for _ in range(1000):
+            start_time = time.perf_counter()
+            monitor.verify_target_active()
+            samples.append((time.perf_counter() - start_time) * 1e6)
+        samples.sort()
+        print(f"   ✓ 同步复查（{label}）: 中位数{samples[len(samples) // 2]:.1f}us, "
+              f"P99 {samples[int(len(samples) * 0.99)]:.1f}us")
+        detector.close()
+        
+    def test_async_detector(self):
+        """测试慢速检测（如macOS备用方案启动osascript）对事件循环的阻塞"""
+        print("⚡ 测试异步检测器...")
+        
+        import asyncio
+        delay = 0.05  # 模拟一次50ms的阻塞检测
+        window = WindowInfo(1, "MapleStory Worlds", "MapleStory Worlds", 42)
+        
+        class SlowDetector:
+            calls = 0
+            def get_active_window(self):
+                SlowDetector.calls += 1
+                time.sleep(delay)
+                return window
+            def close(self):
+                pass
+        
+        async def measure_lag(detect, requests):
+            """在检测期间运行1ms节拍，返回最大的节拍延迟（毫秒）"""
+            lags = []
+            done = asyncio.Event()
+            async def ticker():
+                while not done.is_set():
+                    start = time.perf_counter()
+                    await asyncio.sleep(0.001)
+                    lags.append((time.perf_counter() - start) * 1000 - 1)
+            task = asyncio.ensure_future(ticker())
+            await asyncio.sleep(0.005)
+            start_time = time.perf_counter()
+            await detect(requests)
+            elapsed = (time.perf_counter() - start_time) * 1000
+            done.set()
+            await task
+            return max(lags), elapsed
+        
+        async def blocking(requests):
+            stub = SlowDetector()
+            for _ in range(requests):
+                stub.get_active_window()  # 直接在事件循环线程调用
+        
+        async def scenario():
+            sync_lag, sync_ms = await measure_lag(blocking, 5)
+            SlowDetector.calls = 0
+            async with AsyncWindowDetector(SlowDetector()) as detector:
+                async def concurrent(requests):
+                    await asyncio.gather(*(detector.get_active_window() for _ in range(requests)))
+                async_lag, async_ms = await measure_lag(concurrent, 5)
+                return sync_lag, sync_ms, async_lag, async_ms, detector.get_stats()
+        
+        sync_lag, sync_ms, async_lag, async_ms, stats = asyncio.run(scenario())
+        print(f"   ✓ 同步调用5次: 耗时{sync_ms:.0f}ms, 事件循环最大停顿{sync_lag:.1f}ms")
+        print(f"   ✓ 异步并发5次: 耗时{async_ms:.0f}ms, 事件循环最大停顿{async_lag:.1f}ms, "
+              f"实际检测{SlowDetector.calls}次（合并{stats['coalesced']}次）")
+        
+    def test_helper_process(self):
+        """测试常驻辅助进程与每次启动子进程的查询开销"""
+        print("🔁 测试常驻辅助进程...")
+        
+        import subprocess
+        import sys
+        requests = 20
+        # 模拟osascript：一次性模式每次启动解释器，常驻模式按行应答
+        oneshot_script = "print('MapleStory Worlds')"
+        helper_script = ("import sys\n"
+                         "for line in sys.stdin:\n"
+                         "    print('MapleStory Worlds', flush=True)")
+        
+        start_time = time.perf_counter()
+        for _ in range(requests):
+            subprocess.run([sys.executable, '-c', oneshot_script],
+                           capture_output=True, text=True, timeout=5, check=True)
+        oneshot_ms = (time.perf_counter() - start_time) * 1000 / requests
+        
+        helper = HelperProcess([sys.executable, '-u', '-c', helper_script], timeout=5.0)
+        try:
+            start_time = time.perf_counter()
+            response = helper.request('frontmost')  # 包含启动时间
+            startup_ms = (time.perf_counter() - start_time) * 1000
+            assert response == 'MapleStory Worlds', response
+            start_time = time.perf_counter()
+            responses = [helper.request('frontmost') for _ in range(requests)]
+            helper_ms = (time.perf_counter() - start_time) * 1000 / requests
+            assert responses == ['MapleStory Worlds'] * requests, responses
+        finally:
+            helper.close()
+        
+        print(f"   ✓ 每次启动子进程: {oneshot_ms:.2f}ms/次")
+        print(f"   ✓ 常驻辅助进程: 首次{startup_ms:.2f}ms, 之后{helper_ms:.3f}ms/次")
+        
     def test_config_performance(self):
         """测试配置管理性能"""
         print("⚙️  测试配置管理性能...")
@@ -193,6 +1112,69 @@ class PerformanceTest:
             self.test_key_simulator_performance()
             print()
             
+            self.test_deadline_scheduler()
+            print()
+            
+            self.test_hybrid_waiter()
+            print()
+            
+            self.test_recording_backend()
+            print()
+            
+            self.test_sequence_engine()
+            print()
+            
+            self.test_activation_latency()
+            print()
+            
+            self.test_timer_wheel()
+            print()
+            
+            self.test_hotkey_matcher()
+            print()
+            
+            self.test_dispatch_queue()
+            print()
+            
+            self.test_listener_idle_wakeups()
+            print()
+            
+            self.test_process_name_cache()
+            print()
+            
+            self.test_process_index()
+            print()
+            
+            self.test_app_list_refresh()
+            print()
+            
+            self.test_app_list_model()
+            print()
+            
+            self.test_search_index()
+            print()
+            
+            self.test_target_matcher()
+            print()
+            
+            self.test_window_history()
+            print()
+            
+            self.test_window_info_reuse()
+            print()
+            
+            self.test_adaptive_polling()
+            print()
+            
+            self.test_focus_snapshot()
+            print()
+            
+            self.test_async_detector()
+            print()
+            
+            self.test_helper_process()
+            print()
+            
             self.test_config_performance()
             print()
             
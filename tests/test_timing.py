@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+高精度计时测试脚本
+"""
+
+import threading
+import time
+from artalekey.core.timing import HybridWaiter, SleepWaiter
+
+def _wait_errors(waiter, interval_ms: float, samples: int):
+    """按固定间隔连续等待，返回每次醒来相对截止时间的误差（毫秒）"""
+    interval_ns = int(interval_ms * 1_000_000)
+    errors = []
+    deadline = time.perf_counter_ns()
+    for _ in range(samples):
+        deadline += interval_ns
+        waiter.wait_until(deadline)
+        errors.append((time.perf_counter_ns() - deadline) / 1e6)
+    return errors
+
+def test_hybrid_waiter_error_bound():
+    """测试默认预算下5ms连续等待仍以忙等待结束，误差不超过普通睡眠"""
+    print("\n🎯 测试混合等待器误差...")
+
+    stop_event = threading.Event()
+    samples = 200
+    baseline = sorted(_wait_errors(SleepWaiter(stop_event), 5, samples))
+    waiter = HybridWaiter(stop_event)
+    errors = sorted(_wait_errors(waiter, 5, samples))
+    stats = waiter.get_stats()
+
+    # 每次等待都留有完整的保护窗口，绝大多数等待在截止时间前醒来并以忙等待结束
+    assert stats['spins'] >= samples * 0.9, stats
+    median, p90 = errors[samples // 2], errors[samples * 9 // 10]
+    assert median < 0.2 and median <= baseline[samples // 2], (errors, baseline)
+    assert p90 < 1.0, errors  # 超出保护窗口的误差只来自线程被抢占
+    # 忙等待时间不超过每次等待时长的预算比例
+    assert stats['spin_ratio'] <= 0.4 + 0.05, stats
+    print(f"   ✓ 中位误差 {median:.3f}ms (Event.wait {baseline[samples // 2]:.3f}ms), "
+          f"忙等待占比 {stats['spin_ratio'] * 100:.1f}%")
+
+def test_hybrid_waiter_budget():
+    """测试CPU预算按每次等待计算，长时间运行后短等待不会退化为普通睡眠"""
+    print("\n⏱️  测试忙等待预算...")
+
+    stop_event = threading.Event()
+    waiter = HybridWaiter(stop_event, guard_ms=2.0, cpu_budget=0.1)
+    _wait_errors(waiter, 5, 100)
+    stats = waiter.get_stats()
+    # 5ms等待的预算窗口为0.5ms，小于保护窗口
+    assert stats['budget_limited'] >= 90, stats
+    assert stats['spins'] >= 80, stats
+    assert stats['spin_ratio'] <= 0.1 + 0.05, stats
+
+    # 停止信号打断粗睡眠和忙等待
+    stop_event.set()
+    assert waiter.wait_until(time.perf_counter_ns() + 50_000_000)
+    assert waiter.wait_until(time.perf_counter_ns() + 100_000)
+    print(f"   ✓ 忙等待 {stats['spins']}次, 占比 {stats['spin_ratio'] * 100:.1f}%")
+
+if __name__ == "__main__":
+    print("🚀 开始计时测试\n" + "="*50)
+
+    test_hybrid_waiter_error_bound()
+    test_hybrid_waiter_budget()
+
+    print("\n" + "="*50)
+    print("✅ 测试完成")
@@ -3,8 +3,17 @@
 窗口检测功能测试脚本
 """
 
+import asyncio
+import os
+import sys
+import threading
 import time
-from artalekey.core.window_detector import WindowDetector, ActiveWindowMonitor
+from artalekey.core.async_detector import AsyncWindowDetector
+from artalekey.core.helper_process import HelperProcess
+from artalekey.core.process_index import ProcessIndex
+from artalekey.core.target_matcher import TargetMatcher
+from artalekey.core.window_detector import WindowDetector, ActiveWindowMonitor, WindowInfo
+from artalekey.core.window_history import WindowHistory
 
 def test_window_detection():
     """测试窗口检测功能"""
@@ -30,6 +39,471 @@ def test_window_detection():
     
     print(f"\n总共检测到 {len(apps)} 个应用程序")
 
+def test_linux_display_reuse():
+    """测试Linux下X连接复用、原子缓存和断线重连（使用模拟的X连接）"""
+    print("\n🔌 测试X连接复用...")
+    
+    if sys.platform in ("darwin", "win32"):
+        print("   跳过：仅适用于Linux")
+        return
+    try:
+        from Xlib import display as xdisplay
+    except ImportError:
+        print("   跳过：未安装Xlib")
+        return
+    
+    stats = {'connects': 0, 'interns': 0, 'fail_next': False}
+    
+    class FakeProperty:
+        def __init__(self, value):
+            self.value = value
+    
+    class FakeWindow:
+        def __init__(self, props):
+            self._props = props
+        
+        def get_full_property(self, atom, property_type):
+            if stats['fail_next']:
+                stats['fail_next'] = False
+                raise ConnectionResetError("connection lost")
+            return self._props.get(atom)
+    
+    class FakeDisplay:
+        def __init__(self):
+            stats['connects'] += 1
+            self._atoms = {}
+        
+        def intern_atom(self, name):
+            stats['interns'] += 1
+            return self._atoms.setdefault(name, len(self._atoms) + 1)
+        
+        def screen(self):
+            root = FakeWindow({self._atoms['_NET_ACTIVE_WINDOW']: FakeProperty([42])})
+            return type('Screen', (), {'root': root})()
+        
+        def create_resource_object(self, kind, window_id):
+            return FakeWindow({
+                self._atoms['_NET_WM_NAME']: FakeProperty('测试窗口'.encode('utf-8')),
+                self._atoms['_NET_WM_PID']: FakeProperty([os.getpid()]),
+            })
+        
+        def close(self):
+            pass
+    
+    original = xdisplay.Display
+    xdisplay.Display = FakeDisplay
+    try:
+        detector = WindowDetector()
+        for _ in range(100):
+            window = detector.get_active_window()
+        assert window is not None and window.window_id == 42 and window.title == '测试窗口'
+        assert detector.get_active_window() is window  # 未变化时复用同一实例
+        try:
+            window.title = "x"
+        except AttributeError:
+            pass
+        else:
+            raise AssertionError("WindowInfo should be immutable")
+        assert stats['connects'] == 1, stats
+        assert stats['interns'] == 3, stats
+        print(f"   ✓ 100次检测: 建立连接 {stats['connects']}次, 获取原子 {stats['interns']}次")
+        
+        # 连接断开后自动重连
+        stats['fail_next'] = True
+        window = detector.get_active_window()
+        assert window is not None and stats['connects'] == 2, stats
+        print(f"   ✓ 断线后重连成功: {window}")
+        detector.close()
+    finally:
+        xdisplay.Display = original
+
+def test_window_info_str_subclass():
+    """测试进程名为str子类时（如AppKit返回的pyobjc_unicode）也能创建窗口信息"""
+    print("\n🔤 测试str子类进程名...")
+    
+    class S(str):
+        pass
+    
+    window = WindowInfo(1, S("Game"), S("MapleStory Worlds"), 100)
+    assert type(window.process_name) is str and type(window.key) is str
+    assert window.process_name == "MapleStory Worlds" and window.key == "maplestory worlds"
+    assert window == WindowInfo(2, "Other", "maplestory worlds", 200)
+    print(f"   ✓ {window!r}")
+
+def test_monitor_process_window():
+    """测试监控器对检测结果的处理（轮询和事件驱动模式共用）"""
+    print("\n🎯 测试检测结果处理...")
+    
+    monitor = ActiveWindowMonitor()
+    monitor.set_target_processes(["MapleStory Worlds"])
+    events = []
+    monitor.active_window_changed.connect(
+        lambda window: events.append(('changed', window.process_name)))
+    monitor.target_window_activated.connect(lambda: events.append(('activated',)))
+    monitor.target_window_deactivated.connect(lambda: events.append(('deactivated',)))
+    
+    monitor._process_window(WindowInfo(1, "Editor", "gedit", 100))
+    monitor._process_window(WindowInfo(2, "Game", "MapleStory Worlds", 200))
+    monitor._process_window(WindowInfo(2, "Game", "MapleStory Worlds", 200))  # 重复事件不再发送信号
+    monitor._process_window(None)
+    monitor._process_window(WindowInfo(1, "Editor", "gedit", 100))
+    
+    assert events == [
+        ('changed', 'gedit'),
+        ('changed', 'MapleStory Worlds'), ('activated',),
+        ('changed', 'gedit'), ('deactivated',),
+    ], events
+    assert monitor.get_recent_apps() == ['gedit', 'MapleStory Worlds']
+    print(f"   ✓ 信号序列: {events}")
+
+def test_focus_snapshot():
+    """测试焦点快照版本和触发前的同步复查"""
+    print("\n📸 测试焦点快照...")
+    
+    class StubDetector:
+        def __init__(self, window):
+            self.window = window
+            self.calls = 0
+        
+        def supports_fast_query(self):
+            return True
+        
+        def get_active_window(self):
+            self.calls += 1
+            return self.window
+        
+        def close(self):
+            pass
+    
+    game = WindowInfo(2, "Game", "MapleStory Worlds", 200)
+    editor = WindowInfo(1, "Editor", "gedit", 100)
+    monitor = ActiveWindowMonitor()
+    monitor.set_target_processes(["MapleStory Worlds"])
+    
+    initial = monitor.focus_snapshot()
+    monitor._process_window(game)
+    snapshot = monitor.focus_snapshot()
+    assert snapshot.version == initial.version + 1
+    assert snapshot.is_target and snapshot.window is game
+    monitor._process_window(game)
+    assert monitor.focus_snapshot() is snapshot  # 没有变化时不发布新快照
+    try:
+        snapshot.is_target = False
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("FocusSnapshot should be immutable")
+    
+    # 快照尚未更新时焦点已切走，复查得到最新结果
+    stub = StubDetector(editor)
+    monitor._verify_detector = stub
+    assert monitor.is_target_window_active()
+    assert not monitor.verify_target_active()
+    stub.window = game
+    assert monitor.verify_target_active()
+    
+    # 检测失败或关闭复查时使用快照
+    stub.window = None
+    assert monitor.verify_target_active()
+    monitor.set_verify_on_trigger(False)
+    stub.window = editor
+    assert monitor.verify_target_active() and stub.calls == 3
+    print(f"   ✓ 快照版本: {snapshot.version}, 复查次数: {stub.calls}")
+
+def test_async_detector():
+    """测试asyncio检测器的请求合并、超时和焦点变化迭代"""
+    print("\n⚡ 测试异步检测器...")
+    
+    class SlowDetector:
+        def __init__(self):
+            self.calls = 0
+            self.delay = 0.05
+            self.windows = [WindowInfo(1, "Editor", "gedit", 100)]
+        
+        def get_active_window(self):
+            self.calls += 1
+            time.sleep(self.delay)
+            return self.windows[min(self.calls, len(self.windows)) - 1]
+        
+        def get_running_applications(self):
+            time.sleep(self.delay)
+            return ["gedit", "MapleStory Worlds"]
+        
+        def close(self):
+            pass
+    
+    async def scenario():
+        stub = SlowDetector()
+        async with AsyncWindowDetector(stub, timeout=1.0) as detector:
+            # 并发的相同请求只执行一次
+            results = await asyncio.gather(*(detector.get_active_window() for _ in range(5)))
+            assert stub.calls == 1 and all(r is results[0] for r in results), stub.calls
+            assert await detector.get_running_applications() == ["gedit", "MapleStory Worlds"]
+            
+            # 超时返回None，事件循环不被阻塞
+            stub.delay = 0.3
+            ticks = []
+            async def ticker():
+                for _ in range(5):
+                    ticks.append(time.perf_counter())
+                    await asyncio.sleep(0.01)
+            window, _ = await asyncio.gather(detector.get_active_window(timeout=0.05), ticker())
+            assert window is None and len(ticks) == 5
+            assert detector.get_stats()['timeouts'] == 1
+            await asyncio.sleep(0.3)  # 等待卡住的调用结束
+            
+            # 焦点变化迭代只产出变化
+            stub.delay = 0.0
+            stub.calls = 0
+            editor = WindowInfo(1, "Editor", "gedit", 100)
+            game = WindowInfo(2, "Game", "MapleStory Worlds", 200)
+            stub.windows = [editor, editor, game, game, editor]
+            changes = []
+            async for window in detector.iter_focus_changes(min_interval=0.01, max_interval=0.01):
+                changes.append(window.process_name)
+                if len(changes) == 3:
+                    break
+            assert changes == ["gedit", "MapleStory Worlds", "gedit"], changes
+            return detector.get_stats()
+    
+    stats = asyncio.run(scenario())
+    
+    class StuckDetector:
+        """检测调用卡住时持有锁，close() 需要同一把锁（与X连接的 _x_lock 相同）"""
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.release = threading.Event()
+        
+        def get_active_window(self):
+            with self.lock:
+                self.release.wait(5)
+        
+        def close(self):
+            with self.lock:
+                pass
+    
+    async def close_while_stuck():
+        stub = StuckDetector()
+        detector = AsyncWindowDetector(stub, timeout=0.05)
+        assert await detector.get_active_window() is None  # 调用超时但仍持有锁
+        start = time.perf_counter()
+        await detector.aclose(timeout=0.1)
+        elapsed = time.perf_counter() - start
+        stub.release.set()
+        return elapsed
+    
+    elapsed = asyncio.run(close_while_stuck())
+    assert elapsed < 0.5, elapsed
+    print(f"   ✓ 调用统计: {stats}, 卡住时关闭耗时 {elapsed * 1000:.0f}ms")
+
+# 模拟macOS常驻osascript的辅助脚本：frontmost 回复 "进程名\t进程ID"，hang 不回复，exit 直接退出
+STUB_HELPER_SCRIPT = """
+import os, sys, time
+for line in sys.stdin:
+    command = line.strip()
+    if command == 'frontmost':
+        print('MapleStory Worlds\\t%d' % os.getpid(), flush=True)
+    elif command == 'hang':
+        time.sleep(60)
+    elif command == 'exit':
+        sys.exit(0)
+    else:
+        print('', flush=True)
+"""
+
+def test_helper_process():
+    """测试常驻辅助进程的请求、看门狗和自动重启（使用模拟的辅助脚本）"""
+    print("\n🔁 测试常驻辅助进程...")
+    
+    helper = HelperProcess([sys.executable, '-u', '-c', STUB_HELPER_SCRIPT],
+                           timeout=2.0, max_restarts=3)
+    try:
+        pids = {helper.request('frontmost').split('\t')[1] for _ in range(20)}
+        assert len(pids) == 1, pids  # 所有请求由同一个进程回答
+        
+        # 卡住的进程被看门狗结束，下次请求时重启
+        assert helper.request('hang', timeout=0.2) is None
+        assert helper.request('frontmost').split('\t')[1] not in pids
+        
+        # 进程退出后自动重启
+        assert helper.request('exit', timeout=0.5) is None
+        assert helper.request('frontmost') is not None
+        stats = helper.get_stats()
+        assert stats['timeouts'] == 1 and stats['failures'] == 1 and stats['restarts'] == 2, stats
+        
+        # 超过重启次数后暂停，调用方可以退回一次性调用
+        helper.request('exit', timeout=0.5)
+        helper.request('frontmost')
+        helper.request('exit', timeout=0.5)
+        assert not helper.available and helper.request('frontmost') is None
+    finally:
+        helper.close()
+    
+    # 检测器的macOS备用方案通过辅助进程查询前台应用
+    detector = WindowDetector()
+    detector._macos_helper = HelperProcess([sys.executable, '-u', '-c', STUB_HELPER_SCRIPT])
+    try:
+        window = detector._get_active_window_macos_fallback()
+        assert window is not None and window.process_name == 'MapleStory Worlds'
+        assert window.process_id > 0
+        assert detector._get_active_window_macos_fallback() is window
+    finally:
+        detector.close()
+    assert detector._macos_helper is None
+    print(f"   ✓ 统计: {stats}, 备用方案检测: {window}")
+
+def test_process_index():
+    """测试进程exec和PID复用后进程名称重新读取"""
+    print("\n📇 测试进程索引...")
+    
+    # (启动时间, 名称)，启动时间变化表示PID被复用
+    table = {100: (1, "bash"), 200: (1, "app"), 300: (1, "app")}
+    index = ProcessIndex(list_pids=lambda: table.keys(),
+                         read_name=lambda pid: table[pid][1] if pid in table else None,
+                         read_identity=table.get)
+    assert index.refresh()
+    assert index.snapshot() == ("app", "bash")
+    assert not index.refresh()
+    
+    table[100] = (1, "game")   # exec 后名称改变
+    table[200] = (2, "steam")  # 两次扫描之间PID被释放后复用
+    assert index.refresh()
+    assert index.snapshot() == ("app", "game", "steam"), index.snapshot()
+    assert index.get_stats()['replaced'] == 2
+    
+    # 真实进程exec（仅Linux）
+    if sys.platform.startswith('linux') and os.path.isdir('/proc'):
+        import subprocess
+        process = subprocess.Popen(['sh', '-c', 'read line; exec sleep 30'],
+                                   stdin=subprocess.PIPE)
+        try:
+            index = ProcessIndex()
+            index.refresh()
+            assert index.get_names()[process.pid] == 'sh'
+            process.stdin.write(b'\n')
+            process.stdin.flush()
+            deadline = time.time() + 5
+            while index.get_names().get(process.pid) != 'sleep' and time.time() < deadline:
+                time.sleep(0.01)
+                index.refresh()
+            assert index.get_names()[process.pid] == 'sleep'
+        finally:
+            process.kill()
+            process.wait()
+    print(f"   ✓ 名称已更新: {index.get_stats()}")
+
+def test_target_matcher():
+    """测试目标进程匹配规则"""
+    print("\n🎯 测试目标进程匹配...")
+    
+    matcher = TargetMatcher(
+        ["MapleStory Worlds.exe", "Safari.app", "Google*", r"re:^code(-insiders)?$"])
+    cases = {
+        "maplestory worlds": True,
+        "MapleStory Worlds.exe": True,
+        "Safari": True,
+        "Google Chrome": True,
+        "Chrome": False,
+        "code": True,
+        "Code-Insiders": True,
+        "vscode": False,
+        "": False,
+    }
+    for name, expected in cases.items():
+        assert matcher.matches(name) == expected, name
+        assert matcher.matches(name) == expected, name  # 缓存结果一致
+    assert not TargetMatcher([])
+    assert TargetMatcher(["re:("]).matches("anything") is False  # 无效正则被忽略
+    
+    # 开头带内联标志的正则可以与其他目标合并，无效的只忽略自己
+    matcher = TargetMatcher([r"re:(?i)maple", r"re:(?s)^steam", "re:(", r"re:\d+game"])
+    assert matcher.matches("MapleStory Worlds") and matcher.matches("steamwebhelper")
+    assert matcher.matches("2048game") and not matcher.matches("chrome")
+    # 单独有效但无法合并的正则逐个匹配
+    matcher = TargetMatcher([r"re:(?P<n>maple)", r"re:(?P<n>steam)"])
+    assert matcher.matches("maplestory") and matcher.matches("steam")
+    assert not matcher.matches("code")
+    
+    monitor = ActiveWindowMonitor()
+    monitor.set_target_processes(["Game.exe"])
+    assert monitor._is_target_window(WindowInfo(1, "", "game", 1))
+    monitor.add_target_process("re:^steam")
+    assert monitor._is_target_window(WindowInfo(1, "", "steamwebhelper", 1))
+    monitor.remove_target_process("re:^steam")
+    assert not monitor._is_target_window(WindowInfo(1, "", "steamwebhelper", 1))
+    print(f"   ✓ {len(cases)}个用例通过")
+
+def test_window_history():
+    """测试LRU窗口历史记录及其持久化"""
+    print("\n🕘 测试窗口历史记录...")
+    
+    import tempfile
+    path = os.path.join(tempfile.mkdtemp(), "window_history.json")
+    
+    def factory(name, title):
+        return WindowInfo(0, title, name, 0)
+    
+    history = WindowHistory(max_size=3, path=path, window_factory=factory)
+    for name in ["Safari", "Chrome", "Code", "safari", "Game"]:
+        history.touch(WindowInfo(1, name, name, 1))
+    assert history.recent(10) == ["Game", "safari", "Code"], history.recent(10)
+    assert history.recent(10, exclude={"safari"}) == ["Game", "Code"]
+    assert history.recent(1) == ["Game"]
+    assert history.save()
+    
+    restored = WindowHistory(max_size=3, path=path, window_factory=factory)
+    assert restored.load() == 3
+    assert restored.recent(10) == ["Game", "safari", "Code"]
+    
+    monitor = ActiveWindowMonitor(history_size=2)
+    for i in range(5):
+        monitor._add_to_history(WindowInfo(i, "", f"app{i}", i))
+    assert monitor.get_recent_apps() == ["app4", "app3"]
+    print(f"   ✓ 恢复记录: {restored.recent(10)}")
+
+def test_monitor_demand():
+    """测试按需启动/暂停窗口监控"""
+    print("\n⏸️  测试按需监控...")
+    
+    monitor = ActiveWindowMonitor()
+    monitor.set_event_driven(False)
+    monitor.detector.get_active_window = lambda: WindowInfo(1, "Game", "MapleStory Worlds", 100)
+    monitor.set_target_processes(["MapleStory Worlds"])
+    try:
+        assert not monitor.isRunning()
+        monitor.acquire('window_filter')
+        monitor.set_demand('recent_apps', True)
+        monitor.set_demand('recent_apps', True)  # 重复设置不增加计数
+        assert monitor.isRunning()
+        assert monitor.get_demand() == {'window_filter': 1, 'recent_apps': 1}
+        
+        deadline = time.time() + 2
+        while not monitor.is_target_window_active() and time.time() < deadline:
+            time.sleep(0.01)
+        assert monitor.is_target_window_active()
+        
+        monitor.release('window_filter')
+        assert monitor.isRunning()  # 最近使用面板仍需要监控
+        monitor.set_demand('recent_apps', False)
+        assert not monitor.isRunning()
+        assert not monitor.is_target_window_active()  # 暂停后不保留过期状态
+        
+        monitor.acquire('window_filter')  # 暂停后可以重新启动
+        assert monitor.isRunning()
+        monitor.release('window_filter')
+        assert not monitor.isRunning() and monitor.get_demand() == {}
+        
+        # 退出时仍有使用方登记，之后的释放/登记不会重新启动线程
+        monitor.acquire('window_filter')
+        monitor.shutdown()
+        assert not monitor.isRunning() and monitor.get_demand() == {}
+        monitor.set_demand('recent_apps', False)
+        monitor.set_demand('recent_apps', True)
+        assert not monitor.isRunning()
+    finally:
+        monitor.stop()
+    print("   ✓ 最后一个使用方释放后监控线程停止")
+
 def test_window_monitor():
     """测试窗口监控器"""
     print("\n🔍 测试窗口监控器...")
@@ -74,8 +548,6 @@ def test_window_monitor():
         print("监控已停止")
 
 if __name__ == "__main__":
-    import sys
-    
     try:
         from PyQt6.QtWidgets import QApplication
         app = QApplication(sys.argv)
@@ -85,6 +557,36 @@ if __name__ == "__main__":
         # 基本检测测试
         test_window_detection()
         
+        # X连接复用测试
+        test_linux_display_reuse()
+        
+        # str子类进程名测试
+        test_window_info_str_subclass()
+        
+        # 检测结果处理测试
+        test_monitor_process_window()
+        
+        # 焦点快照测试
+        test_focus_snapshot()
+        
+        # 异步检测器测试
+        test_async_detector()
+        
+        # 常驻辅助进程测试
+        test_helper_process()
+        
+        # 进程索引测试
+        test_process_index()
+        
+        # 目标匹配测试
+        test_target_matcher()
+        
+        # 历史记录测试
+        test_window_history()
+        
+        # 按需监控测试
+        test_monitor_demand()
+        
         # 监控测试
         test_window_monitor()
         